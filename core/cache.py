@@ -1,8 +1,11 @@
 import time
 import os
+import re
 import asyncio
 import aiofiles
-from core.logger import log_info, log_error
+from collections import OrderedDict
+from typing import Optional
+from core.logger import log_info, log_error, log_debug
 
 try:
     import orjson as json_backend
@@ -11,11 +14,33 @@ except ImportError:
     import json as json_backend
     _USE_ORJSON = False
 
-CACHE_FILE = "data/cache.json"
-_DATA_CACHE = {}
-_DIRTY = False
-_SAVE_INTERVAL_SECONDS = 60
-MAX_CACHE_SIZE = 50
+JOURNAL_FILE = "data/cache.journal"
+LEGACY_CACHE_FILE = "data/cache.json"
+_FLUSH_INTERVAL_SECONDS = 10
+COMPACT_MIN_BYTES = 1024 * 1024
+COMPACT_RATIO = 2.0
+
+_PENDING: dict = {}
+_DISK_INDEX: dict = {}
+_JOURNAL_SIZE = 0
+_INDEX_LOADED = False
+_COMPACTING = False
+_JOURNAL_LOCK = asyncio.Lock()
+
+MB = 1024 * 1024
+
+# name: (max_bytes, default_ttl, stale_grace)
+NAMESPACE_LIMITS = {
+    "uuid": (1 * MB, 60, 86400),
+    "profile": (96 * MB, 60, 300),
+    "soopy_player": (16 * MB, 60, 300),
+    "skycrypt": (8 * MB, 120, 0),
+    "fonts": (4 * MB, 86400, 604800),
+    "default": (4 * MB, 60, 0),
+}
+
+_NAME_PATTERN = re.compile(r"^[a-z0-9_]{1,16}$")
+_UUID_PATTERN = re.compile(r"^[0-9a-fA-F]{32}$")
 
 
 def _serialize(data) -> bytes:
@@ -30,95 +55,396 @@ def _deserialize(content: bytes) -> dict:
     return json_backend.loads(content.decode("utf-8"))
 
 
-async def initialize():
-    await _load_cache()
-    asyncio.get_event_loop().create_task(_periodic_save_loop())
+def _estimate_size(key: str, data) -> int:
+    try:
+        return len(key) + len(_serialize(data))
+    except Exception:
+        return len(key) + len(repr(data))
 
 
-async def _load_cache():
-    global _DATA_CACHE
-    if not os.path.exists(CACHE_FILE):
-        return
+class CacheNamespace:
+    def __init__(self, name: str, max_bytes: int, default_ttl: int, stale_grace: int = 0):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.stale_grace = stale_grace
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale_hits = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: str):
+        return key in self._entries
+
+    def get(self, key: str, now: float):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if now > entry[0]:
+            if now > entry[0] + self.stale_grace:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def get_stale(self, key: str, now: float):
+        entry = self._entries.get(key)
+        if entry is None or now <= entry[0] or now > entry[0] + self.stale_grace:
+            return None
+        self._entries.move_to_end(key)
+        self.stale_hits += 1
+        return entry[1]
+
+    def peek(self, key: str) -> Optional[tuple]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return entry[0], entry[1]
+
+    def set(self, key: str, data, expiry: float, size: int) -> bool:
+        if key in self._entries:
+            self._remove(key)
+        if size > self.max_bytes:
+            log_debug(f"Cache entry {key} ({size} bytes) exceeds '{self.name}' budget, not cached.")
+            return False
+        self._evict_until(self.max_bytes - size)
+        self._entries[key] = (expiry, data, size)
+        self.bytes_used += size
+        return True
+
+    def delete(self, key: str) -> bool:
+        if key not in self._entries:
+            return False
+        self._remove(key)
+        return True
+
+    def sweep(self, now: float) -> int:
+        expired = [k for k, entry in self._entries.items() if now > entry[0] + self.stale_grace]
+        for k in expired:
+            self._remove(k)
+        return len(expired)
+
+    def items(self):
+        for key, (expiry, data, _) in self._entries.items():
+            yield key, expiry, data
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes_used,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "stale_hits": self.stale_hits,
+        }
+
+    def _evict_until(self, limit: int):
+        while self._entries and self.bytes_used > limit:
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self.bytes_used -= size
+            self.evictions += 1
+
+    def _remove(self, key: str):
+        _, _, size = self._entries.pop(key)
+        self.bytes_used -= size
+
+
+_NAMESPACES = {
+    name: CacheNamespace(name, max_bytes, ttl, grace)
+    for name, (max_bytes, ttl, grace) in NAMESPACE_LIMITS.items()
+}
+_REVALIDATING: dict = {}
+
+
+def configure_namespace(name: str, max_bytes: Optional[int] = None, default_ttl: Optional[int] = None,
+                        stale_grace: Optional[int] = None):
+    ns = _NAMESPACES.get(name)
+    if ns is None:
+        ns = _NAMESPACES[name] = CacheNamespace(name, max_bytes or 4 * MB, default_ttl or 60, stale_grace or 0)
+        return ns
+    if default_ttl is not None:
+        ns.default_ttl = default_ttl
+    if stale_grace is not None:
+        ns.stale_grace = stale_grace
+    if max_bytes is not None:
+        ns.max_bytes = max_bytes
+        ns._evict_until(max_bytes)
+    return ns
+
+
+def _resolve_namespace(key: str) -> CacheNamespace:
+    prefix, sep, _ = key.partition(":")
+    if sep and prefix in _NAMESPACES:
+        return _NAMESPACES[prefix]
+    if key.startswith("skycrypt_"):
+        return _NAMESPACES["skycrypt"]
+    if key.startswith("google_fonts"):
+        return _NAMESPACES["fonts"]
+    if _UUID_PATTERN.match(key):
+        return _NAMESPACES["profile"]
+    if _NAME_PATTERN.match(key):
+        return _NAMESPACES["uuid"]
+    return _NAMESPACES["default"]
+
+
+def _store(key: str, data, expiry: float) -> bool:
+    return _resolve_namespace(key).set(key, data, expiry, _estimate_size(key, data))
+
+
+def _retained_until(key: str, expiry: float) -> float:
+    return expiry + _resolve_namespace(key).stale_grace
+
+
+def _scan_journal(content: bytes, now: float) -> tuple:
+    index = {}
+    pos = 0
+    while pos < len(content):
+        end = content.find(b"\n", pos)
+        if end == -1:
+            break
+        first = content.find(b"\t", pos, end)
+        second = content.find(b"\t", first + 1, end) if first != -1 else -1
+        if second != -1:
+            key = content[pos:first].decode("utf-8")
+            expiry = float(content[first + 1:second])
+            if _retained_until(key, expiry) > now:
+                index[key] = (pos, end + 1 - pos, expiry)
+            else:
+                index.pop(key, None)
+        pos = end + 1
+    return index, pos
+
+
+def _encode_record(key: str, expiry: float, data) -> bytes:
+    return key.encode("utf-8") + b"\t" + repr(expiry).encode("ascii") + b"\t" + _serialize(data) + b"\n"
+
+
+def _decode_record(record: bytes):
+    _, expiry, payload = record.rstrip(b"\n").split(b"\t", 2)
+    return float(expiry), _deserialize(payload)
+
+
+async def _import_legacy_cache():
     try:
-        async with aiofiles.open(CACHE_FILE, "rb") as f:
+        async with aiofiles.open(LEGACY_CACHE_FILE, "rb") as f:
             content = await f.read()
-            if not content:
-                return
-            data = _deserialize(content)
-            if isinstance(data, dict):
-                now = time.time()
-                _DATA_CACHE = {k: v for k, v in data.items() if v[0] > now}
-                pruned = len(data) - len(_DATA_CACHE)
-                log_info(f"Loaded {len(_DATA_CACHE)} cache entries ({pruned} expired entries pruned).")
+        data = _deserialize(content) if content else {}
+        now = time.time()
+        imported = 0
+        if isinstance(data, dict):
+            for key, (expiry, value) in data.items():
+                if _retained_until(key, expiry) > now and _store(key, value, expiry):
+                    _PENDING[key] = (expiry, value)
+                    imported += 1
+        os.remove(LEGACY_CACHE_FILE)
+        log_info(f"Migrated {imported} entries from {LEGACY_CACHE_FILE} into the cache journal.")
     except Exception as e:
-        log_error(f"Failed to load cache: {e}")
+        log_error(f"Failed to migrate legacy cache file: {e}")
 
 
-async def _save_cache():
+async def _ensure_index():
+    global _DISK_INDEX, _JOURNAL_SIZE, _INDEX_LOADED
+    if _INDEX_LOADED:
+        return
+    async with _JOURNAL_LOCK:
+        if _INDEX_LOADED:
+            return
+        if os.path.exists(JOURNAL_FILE):
+            try:
+                async with aiofiles.open(JOURNAL_FILE, "rb") as f:
+                    content = await f.read()
+                _DISK_INDEX, valid_size = _scan_journal(content, time.time())
+                if valid_size < len(content):
+                    log_error(f"Cache journal has a truncated tail, discarding {len(content) - valid_size} bytes.")
+                    os.truncate(JOURNAL_FILE, valid_size)
+                _JOURNAL_SIZE = valid_size
+                log_info(f"Indexed {len(_DISK_INDEX)} cache entries from journal ({valid_size} bytes).")
+            except Exception as e:
+                log_error(f"Failed to index cache journal: {e}")
+                _DISK_INDEX, _JOURNAL_SIZE = {}, 0
+        elif os.path.exists(LEGACY_CACHE_FILE):
+            await _import_legacy_cache()
+        _INDEX_LOADED = True
+
+
+async def _load_from_disk(key: str, ns: CacheNamespace, now: float):
+    pending = _PENDING.get(key)
+    if pending is not None:
+        if _retained_until(key, pending[0]) > now:
+            ns.set(key, pending[1], pending[0], _estimate_size(key, pending[1]))
+        return
+    await _ensure_index()
+    if key not in _DISK_INDEX:
+        return
+    async with _JOURNAL_LOCK:
+        record = _DISK_INDEX.get(key)
+        if record is None or now > _retained_until(key, record[2]):
+            return
+        offset, length, _ = record
+        try:
+            async with aiofiles.open(JOURNAL_FILE, "rb") as f:
+                await f.seek(offset)
+                expiry, data = _decode_record(await f.read(length))
+        except Exception as e:
+            log_error(f"Failed to read cache entry {key} from journal: {e}")
+            return
+    if key not in ns:
+        ns.set(key, data, expiry, _estimate_size(key, data))
+
+
+async def _flush_journal():
+    global _PENDING, _JOURNAL_SIZE
+    if not _PENDING:
+        return
+    await _ensure_index()
+    async with _JOURNAL_LOCK:
+        batch, _PENDING = _PENDING, {}
+        now = time.time()
+        chunks = []
+        offset = _JOURNAL_SIZE
+        new_index = {}
+        for key, (expiry, data) in batch.items():
+            if _retained_until(key, expiry) <= now or "\t" in key or "\n" in key:
+                continue
+            try:
+                record = _encode_record(key, expiry, data)
+            except Exception as e:
+                log_error(f"Failed to serialize cache entry {key}: {e}")
+                continue
+            new_index[key] = (offset, len(record), expiry)
+            chunks.append(record)
+            offset += len(record)
+        if not chunks:
+            return
+        try:
+            os.makedirs(os.path.dirname(JOURNAL_FILE), exist_ok=True)
+            async with aiofiles.open(JOURNAL_FILE, "ab") as f:
+                await f.write(b"".join(chunks))
+        except Exception as e:
+            log_error(f"Failed to append to cache journal: {e}")
+            for key, entry in batch.items():
+                _PENDING.setdefault(key, entry)
+            return
+        _DISK_INDEX.update(new_index)
+        _JOURNAL_SIZE = offset
+
+
+def _needs_compaction(now: float) -> bool:
+    if _JOURNAL_SIZE < COMPACT_MIN_BYTES:
+        return False
+    live = sum(length for key, (_, length, expiry) in _DISK_INDEX.items() if _retained_until(key, expiry) > now)
+    return _JOURNAL_SIZE > live * COMPACT_RATIO
+
+
+async def _compact_journal():
+    global _DISK_INDEX, _JOURNAL_SIZE, _COMPACTING
+    _COMPACTING = True
     try:
-        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
-        temp_path = CACHE_FILE + ".tmp"
-        async with aiofiles.open(temp_path, "wb") as f:
-            await f.write(_serialize(_DATA_CACHE))
-        os.replace(temp_path, CACHE_FILE)
+        async with _JOURNAL_LOCK:
+            async with aiofiles.open(JOURNAL_FILE, "rb") as f:
+                content = await f.read()
+            now = time.time()
+            chunks = []
+            new_index = {}
+            offset = 0
+            for key, (old_offset, length, expiry) in _DISK_INDEX.items():
+                if _retained_until(key, expiry) <= now:
+                    continue
+                chunks.append(content[old_offset:old_offset + length])
+                new_index[key] = (offset, length, expiry)
+                offset += length
+            temp_path = JOURNAL_FILE + ".tmp"
+            async with aiofiles.open(temp_path, "wb") as f:
+                await f.write(b"".join(chunks))
+            os.replace(temp_path, JOURNAL_FILE)
+            log_info(f"Compacted cache journal from {_JOURNAL_SIZE} to {offset} bytes.")
+            _DISK_INDEX = new_index
+            _JOURNAL_SIZE = offset
     except Exception as e:
-        log_error(f"Failed to save cache: {e}")
+        log_error(f"Failed to compact cache journal: {e}")
+    finally:
+        _COMPACTING = False
 
 
-async def _periodic_save_loop():
-    global _DIRTY
+async def initialize():
+    asyncio.get_event_loop().create_task(_periodic_flush_loop())
+
+
+async def _periodic_flush_loop():
     while True:
-        await asyncio.sleep(_SAVE_INTERVAL_SECONDS)
-        if _DIRTY:
-            await _save_cache()
-            _DIRTY = False
+        await asyncio.sleep(_FLUSH_INTERVAL_SECONDS)
+        now = time.time()
+        for ns in _NAMESPACES.values():
+            ns.sweep(now)
+        await _flush_journal()
+        if _INDEX_LOADED and not _COMPACTING and _needs_compaction(now):
+            asyncio.get_event_loop().create_task(_compact_journal())
 
 
 async def shutdown():
-    if _DIRTY:
-        await _save_cache()
+    await _flush_journal()
 
 
 async def cache_get(key: str):
-    entry = _DATA_CACHE.get(key)
-    if not entry:
-        return None
-    expiry, data = entry[0], entry[1]
-    if time.time() > expiry:
-        global _DIRTY
-        del _DATA_CACHE[key]
-        _DIRTY = True
-        return None
-    return data
+    ns = _resolve_namespace(key)
+    now = time.time()
+    if key not in ns:
+        await _load_from_disk(key, ns, now)
+    return ns.get(key, now)
 
 
-async def _cleanup_cache():
-    import heapq
-    global _DIRTY
+async def cache_get_stale(key: str):
+    ns = _resolve_namespace(key)
     now = time.time()
-    expired_keys = [k for k, v in _DATA_CACHE.items() if now > v[0]]
-    for k in expired_keys:
-        del _DATA_CACHE[k]
-    if len(_DATA_CACHE) >= MAX_CACHE_SIZE:
-        overcount = len(_DATA_CACHE) - MAX_CACHE_SIZE + (MAX_CACHE_SIZE // 10)
-        oldest = heapq.nsmallest(overcount, _DATA_CACHE.items(), key=lambda item: item[1][0])
-        for k, _ in oldest:
-            del _DATA_CACHE[k]
-    _DIRTY = True
-
-
-async def cache_set(key: str, data, ttl: int = 60):
-    global _DIRTY
-    if len(_DATA_CACHE) >= MAX_CACHE_SIZE:
-        await _cleanup_cache()
+    if key not in ns:
+        await _load_from_disk(key, ns, now)
+    return ns.get_stale(key, now)
+
+
+def revalidate(key: str, refresh):
+    if key in _REVALIDATING:
+        return
+    log_debug(f"Revalidating stale cache entry {key} in the background")
+    task = asyncio.ensure_future(refresh())
+    _REVALIDATING[key] = task
+
+    def _done(done):
+        _REVALIDATING.pop(key, None)
+        if not done.cancelled() and done.exception() is not None:
+            log_error(f"Background revalidation of {key} failed: {done.exception()}")
+
+    task.add_done_callback(_done)
+
+
+async def cache_set(key: str, data, ttl: Optional[int] = None):
+    ns = _resolve_namespace(key)
+    if ttl is None:
+        ttl = ns.default_ttl
     expiry = time.time() + ttl
-    _DATA_CACHE[key] = (expiry, data)
-    _DIRTY = True
+    ns.set(key, data, expiry, _estimate_size(key, data))
+    _PENDING[key] = (expiry, data)
+
+
+def get_cache_entry(key: str) -> Optional[tuple]:
+    return _resolve_namespace(key).peek(key)
 
 
 def get_cache_expiry(key: str):
-    entry = _DATA_CACHE.get(key)
+    entry = get_cache_entry(key)
     if not entry:
         return None
     expiry, _ = entry
     return expiry
+
+
+def get_cache_stats() -> dict:
+    return {name: ns.stats() for name, ns in _NAMESPACES.items()}
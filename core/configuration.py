@@ -12,8 +12,24 @@ class BotConfig:
         self.debug_mode: bool = True
         self.profile_cache_ttl: int = 60
         self.prices_cache_ttl: int = 259200
+        self.profile_stale_grace: int = 300
+        self.prices_stale_grace: int = 86400
+        self.http_pools: Dict[str, dict] = {}
+        self.update_concurrency: int = 8
+        self.provider_rates: Dict[str, float] = {}
+        self.daily_refresh_mode: str = "full"
+        self.refresh_slice_size: int = 250
+        self.worker_processes: int = 2
+        self.worker_queue_depth: int = 16
+        self.graph_renderer: str = "pillow"
+        self.rate_limits: Dict[str, dict] = {}
+        self.request_log_mode: str = "tiered"
+        self.request_log_sampling: Dict[str, float] = {}
         self.irc_channel_id: int = 0
         self.api_priority: List[str] = ["soterm", "adjectils", "soopy", "skycrypt", "plain_dawn", "hypixel"]
+        self.profile_fetch_mode: str = "sequential"
+        self.hedge_delay_ms: int = 2000
+        self.hedge_quantile: float = 0.95
         self.owner_ids: List[int] = [377351386637271041, 679725029109399574, 827252037380997170]
         self.require_identity_check: bool = True
         self.congrats_gifs: List[str] = [
@@ -96,8 +112,24 @@ class BotConfig:
             "debug_mode": self.debug_mode,
             "profile_cache_ttl": self.profile_cache_ttl,
             "prices_cache_ttl": self.prices_cache_ttl,
+            "profile_stale_grace": self.profile_stale_grace,
+            "prices_stale_grace": self.prices_stale_grace,
+            "http_pools": self.http_pools,
+            "update_concurrency": self.update_concurrency,
+            "provider_rates": self.provider_rates,
+            "daily_refresh_mode": self.daily_refresh_mode,
+            "refresh_slice_size": self.refresh_slice_size,
+            "worker_processes": self.worker_processes,
+            "worker_queue_depth": self.worker_queue_depth,
+            "graph_renderer": self.graph_renderer,
+            "rate_limits": self.rate_limits,
+            "request_log_mode": self.request_log_mode,
+            "request_log_sampling": self.request_log_sampling,
             "irc_channel_id": self.irc_channel_id,
             "api_priority": self.api_priority,
+            "profile_fetch_mode": self.profile_fetch_mode,
+            "hedge_delay_ms": self.hedge_delay_ms,
+            "hedge_quantile": self.hedge_quantile,
             "owner_ids": self.owner_ids,
             "congrats_gifs": self.congrats_gifs,
             "require_identity_check": self.require_identity_check
@@ -117,8 +149,24 @@ class BotConfig:
         self.debug_mode = data.get("debug_mode", self.debug_mode)
         self.profile_cache_ttl = data.get("profile_cache_ttl", self.profile_cache_ttl)
         self.prices_cache_ttl = data.get("prices_cache_ttl", self.prices_cache_ttl)
+        self.profile_stale_grace = data.get("profile_stale_grace", self.profile_stale_grace)
+        self.prices_stale_grace = data.get("prices_stale_grace", self.prices_stale_grace)
+        self.http_pools = data.get("http_pools", self.http_pools)
+        self.update_concurrency = data.get("update_concurrency", self.update_concurrency)
+        self.provider_rates = data.get("provider_rates", self.provider_rates)
+        self.daily_refresh_mode = data.get("daily_refresh_mode", self.daily_refresh_mode)
+        self.refresh_slice_size = data.get("refresh_slice_size", self.refresh_slice_size)
+        self.worker_processes = data.get("worker_processes", self.worker_processes)
+        self.worker_queue_depth = data.get("worker_queue_depth", self.worker_queue_depth)
+        self.graph_renderer = data.get("graph_renderer", self.graph_renderer)
+        self.rate_limits = data.get("rate_limits", self.rate_limits)
+        self.request_log_mode = data.get("request_log_mode", self.request_log_mode)
+        self.request_log_sampling = data.get("request_log_sampling", self.request_log_sampling)
         self.irc_channel_id = data.get("irc_channel_id", self.irc_channel_id)
         self.require_identity_check = data.get("require_identity_check", self.require_identity_check)
+        self.profile_fetch_mode = data.get("profile_fetch_mode", self.profile_fetch_mode)
+        self.hedge_delay_ms = data.get("hedge_delay_ms", self.hedge_delay_ms)
+        self.hedge_quantile = data.get("hedge_quantile", self.hedge_quantile)
         if "api_priority" in data:
             self.api_priority = data["api_priority"]
         elif "primary_api" in data:
@@ -0,0 +1,32 @@
+"""
+Secrets configuration file template for RTCA Discord Bot
+Copy this file to secrets.py and fill in your actual token
+"""
+
+# Discord Bot Token
+# Get your token from: https://discord.com/developers/applications
+TOKEN = "your_discord_bot_token_here"
+
+# Encryption Secret (MUST MATCH CLIENT)
+SECRET_KEY = "your_secret_key_here"
+
+# Developer Key (Admin Access)
+DEVELOPER_KEY = "your_dev_key_here"
+
+# IRC Channel IDs (Discord Channels for IRC Relay)
+IRC_CHANNEL_ID = 0
+ANNOUNCEMENTS_CHANNEL_ID = 0
+ADMIN_CHANNEL_ID = 0
+SOLO_CLEAR_CHANNEL_ID = 0
+
+# IRC Webhook URLs (Discord Webhooks for IRC Relay)
+IRC_WEBHOOK_URL = ""
+ADMIN_WEBHOOK_URL = ""
+SOLO_CLEAR_WEBHOOK_URL = ""
+
+# Google Fonts API Key
+GOOGLE_FONTS_API_KEY = "your_google_fonts_api_key_here"
+
+# Hypixel API Key
+HYPIXEL_API_KEY = "your_hypixel_api_key_here"
+
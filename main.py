@@ -1,6 +1,6 @@
 from discord.ext import commands, tasks
 from discord.errors import DiscordServerError
-from core.config import TOKEN, INTENTS, validate_config
+from core.config import TOKEN, INTENTS, validate_config, config
 from core.logger import log_info, log_error
 from services.daily_manager import DailyManager
 from services.rng_manager import RngManager
@@ -12,6 +12,8 @@ from services.irc_handler import init_irc_handler
 from services.name_manager import name_manager
 from services.ban_manager import ban_manager
 from services.github_manager import GithubManager
+from services.worker_pool import worker_pool
+from services.request_log import request_log
 from core.cache import initialize as init_cache, shutdown as shutdown_cache
 import asyncio
 import os
@@ -55,7 +57,10 @@ async def track_daily_stats():
         if not users:
             return
 
-        updated, errors, total = await bot.daily_manager.force_update_all()
+        if config.daily_refresh_mode == "incremental":
+            updated, errors, total = await bot.daily_manager.refresh_incremental()
+        else:
+            updated, errors, total = await bot.daily_manager.force_update_all()
 
         if updated > 0:
             log_info(f"Daily stats update completed: {updated}/{total} updated, {errors} errors.")
@@ -112,6 +117,7 @@ async def load_extensions():
             log_error(f"Failed to load extension {ext}: {e}")
 
 async def start_services():
+    await worker_pool.start()
     await init_session()
     await init_cache()
     await bot.link_manager.initialize()
@@ -152,7 +158,10 @@ async def main():
         await start_services()
         await discord_connect_loop()
     finally:
+        await bot.daily_manager.close()
+        await request_log.close()
         await shutdown_cache()
+        await worker_pool.shutdown()
         await bot.irc_handler.close()
         await close_session()
         if not bot.is_closed():
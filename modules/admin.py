@@ -5,15 +5,20 @@ from discord.ui import View, Select, Modal, TextInput, Button
 from core.config import config
 from core.logger import log_info, log_error, get_latest_log_file
 from core.ui import AuthorView
-from services.api import get_uuid
-from services.ban_manager import ban_manager
+from services.api import get_uuid, get_pool_stats, get_provider_health, get_provider_latency_stats
+from services.ban_manager import ban_manager, parse_duration
 from services.request_log import request_log
+from services.simulation_logic import get_simulation_memo_stats
+from core.cache import get_cache_stats
+from services.rate_limiter import get_backend as get_rate_limit_backend
+from services.worker_pool import worker_pool
 from modules.dungeons import DefaultSelectView
 import os
 import sys
 import json
 import asyncio
 import platform
+import time
 import psutil
 from datetime import datetime, timezone
 
@@ -367,6 +372,28 @@ class SystemSelect(Select):
              mem_usage = f"{mem.used / (1024**3):.2f}/{mem.total / (1024**3):.2f} GB ({mem.percent}%)"
              
              cpu = psutil.cpu_percent(interval=None)
+
+             memo = get_simulation_memo_stats()
+             memo_usage = f"{memo['hits']} hits / {memo['misses']} misses ({memo['entries']}/{memo['max_entries']})"
+             workers = worker_pool.stats()
+             limiter = get_rate_limit_backend().stats()
+             pools = "\n".join(
+                 f"{name}: {p['acquired']}/{p.get('limit', '?')} busy, {p['waiting']} waiting, {p['reused']}/{p['requests']} reused"
+                 for name, p in sorted(get_pool_stats().items()) if p["requests"]
+             ) or "No requests yet"
+             health = "\n".join(
+                 f"{name}: {h['state']}, {h['in_flight']}/{h['concurrency_limit']:g} in flight, {h['consecutive_failures']} fails"
+                 for name, h in sorted(get_provider_health().items())
+             ) or "No provider calls yet"
+             latency = "\n".join(
+                 f"{name}: p50 {l['p50'] or 0:.2f}s, p95 {l['p95'] or 0:.2f}s, hedge {l['hedge_delay']:.2f}s ({l['samples']} samples)"
+                 for name, l in sorted(get_provider_latency_stats().items())
+             ) or "No samples yet"
+             caches = "\n".join(
+                 f"{name}: {c['entries']} entries, {c['bytes'] / 1024:.0f}/{c['max_bytes'] / 1024:.0f} KiB, "
+                 f"{c['hits']}/{c['hits'] + c['misses']} hits, {c['evictions']} evicted"
+                 for name, c in sorted(get_cache_stats().items())
+             ) or "Empty"
              
              embed = discord.Embed(title="ℹ️ Host System Info", color=0x3498db)
              embed.add_field(name="📂 Bot Location", value=f"`{path}`", inline=False)
@@ -374,6 +401,13 @@ class SystemSelect(Select):
              embed.add_field(name="🐍 Python", value=f"`{py_ver}`", inline=True)
              embed.add_field(name="🧠 Memory", value=f"`{mem_usage}`", inline=True)
              embed.add_field(name="⚙️ CPU Load", value=f"`{cpu}%`", inline=True)
+             embed.add_field(name="🧮 RTCA Memo", value=f"`{memo_usage}`", inline=True)
+             embed.add_field(name="🧵 Workers", value=f"`{workers['mode']} x{workers['workers']}, {workers['pending']}/{workers['max_pending']} pending`", inline=True)
+             embed.add_field(name="🚦 Rate Limiter", value=f"`{limiter.get('backend', 'custom')}: {limiter.get('keys', '?')} keys tracked`", inline=True)
+             embed.add_field(name="🩺 Providers", value=f"```{health}```", inline=False)
+             embed.add_field(name="⏱️ Provider Latency", value=f"```{latency}```", inline=False)
+             embed.add_field(name="🗄️ Cache", value=f"```{caches}```", inline=False)
+             embed.add_field(name="🌐 HTTP Pools", value=f"```{pools}```", inline=False)
              
              await interaction.followup.send(embed=embed)
 
@@ -549,7 +583,7 @@ def _build_run_detail_embed(run: dict, floor: str, uuid: str):
     return emb
 
 
-def _render_run_map_file(run: dict):
+async def _render_run_map_file(run: dict):
     evidence = run.get("evidence") or {}
     map_data = evidence.get("map_data")
     if not map_data:
@@ -557,7 +591,7 @@ def _render_run_map_file(run: dict):
     try:
         from services.map_renderer import render_map
         import io as _io
-        png = render_map(map_data)
+        png = await worker_pool.run("map_render", render_map, map_data)
         if not png:
             return None
         return discord.File(_io.BytesIO(png), filename="minimap.png")
@@ -640,7 +674,7 @@ class SoloRunDetailView(AuthorView):
         if not interaction.response.is_done():
             await interaction.response.defer()
         embed = _build_run_detail_embed(self.run, self.floor, self.uuid)
-        map_file = _render_run_map_file(self.run)
+        map_file = await _render_run_map_file(self.run)
         self._build_buttons()
         kwargs = {"content": None, "embed": embed, "view": self, "attachments": []}
         if map_file is not None:
@@ -756,7 +790,7 @@ class SoloDeleteConfirmView(AuthorView):
         await interaction.response.defer()
         view = SoloRunDetailView(self.bot, self.floor, self.uuid, self.run, self.all_runs, author_id=self.author_id)
         embed = _build_run_detail_embed(self.run, self.floor, self.uuid)
-        map_file = _render_run_map_file(self.run)
+        map_file = await _render_run_map_file(self.run)
         kwargs = {"content": None, "embed": embed, "view": view, "attachments": []}
         if map_file is not None:
             kwargs["attachments"] = [map_file]
@@ -798,7 +832,7 @@ class SoloRunPickerSelect(discord.ui.Select):
             await interaction.response.defer()
             view = SoloRunDetailView(self.bot, self.floor, uuid, run, self.runs, author_id=self.author_id)
             embed = _build_run_detail_embed(run, self.floor, uuid)
-            map_file = _render_run_map_file(run)
+            map_file = await _render_run_map_file(run)
             kwargs = {"embed": embed, "view": view, "content": None, "attachments": []}
             if map_file is not None:
                 kwargs["attachments"] = [map_file]
@@ -971,8 +1005,8 @@ class IpBanModal(Modal):
     def __init__(self):
         super().__init__(title="Ban IP from API")
         self.ip_input = TextInput(
-            label="IP Address",
-            placeholder="e.g. 1.2.3.4",
+            label="IP Address or CIDR",
+            placeholder="e.g. 1.2.3.4, 1.2.3.0/24 or 2001:db8::/64",
             required=True,
             max_length=64,
         )
@@ -983,24 +1017,40 @@ class IpBanModal(Modal):
             style=discord.TextStyle.paragraph,
             max_length=500,
         )
+        self.duration_input = TextInput(
+            label="Duration (optional)",
+            placeholder="e.g. 30m, 12h, 7d. Leave empty for a permanent ban",
+            required=False,
+            max_length=16,
+        )
         self.add_item(self.ip_input)
         self.add_item(self.reason_input)
+        self.add_item(self.duration_input)
 
     async def on_submit(self, interaction: discord.Interaction):
         ip = self.ip_input.value.strip()
         reason = self.reason_input.value.strip()
+        duration_text = (self.duration_input.value or "").strip()
 
         if not ip:
             await interaction.response.send_message("❌ IP cannot be empty.", ephemeral=True)
             return
 
-        ok = await ban_manager.ban(ip, reason, interaction.user.id)
+        duration = None
+        if duration_text:
+            duration = parse_duration(duration_text)
+            if not duration:
+                await interaction.response.send_message("❌ Invalid duration. Use e.g. `30m`, `12h` or `7d`.", ephemeral=True)
+                return
+
+        ok = await ban_manager.ban(ip, reason, interaction.user.id, duration=duration)
         if not ok:
-            await interaction.response.send_message("❌ Failed to ban IP.", ephemeral=True)
+            await interaction.response.send_message("❌ Failed to ban IP. Use a valid address or CIDR range.", ephemeral=True)
             return
 
+        expires = f"\n**Expires:** <t:{int(time.time()) + duration}:R>" if duration else ""
         await interaction.response.send_message(
-            f"🚫 Banned `{ip}`\n**Reason:** {reason}",
+            f"🚫 Banned `{ip}`\n**Reason:** {reason}{expires}",
             ephemeral=True,
         )
 
@@ -1051,7 +1101,9 @@ class IpBansView(AuthorView):
             banned_by = entry.get("banned_by", "?")
             ts = entry.get("banned_at", 0)
             when = f"<t:{ts}:R>" if ts else "unknown"
-            lines.append(f"`{ip}` — {reason}\n └ by <@{banned_by}> {when}")
+            expires_at = entry.get("expires_at")
+            expiry = f", expires <t:{expires_at}:R>" if expires_at else ""
+            lines.append(f"`{ip}` — {reason}\n └ by <@{banned_by}> {when}{expiry}")
 
         chunks = [lines[i:i+10] for i in range(0, len(lines), 10)]
         embeds = []
@@ -2,9 +2,18 @@ from aiohttp import web
 from discord.ext import commands
 from core.logger import log_info, log_error
 from services.rate_limiter import rate_limiter, solo_clear_limiter, solo_clear_uuid_limiter, get_client_ip
+from services.http_cache import make_etag, etag_matches, not_modified, cache_headers, hashed_json
 import os
 import time as _time
 
+MAX_BULK_UUID_NAMES = 50
+LEADERBOARD_MAX_AGE = 30
+SOLO_LEADERBOARD_MAX_AGE = 60
+NAMES_MAX_AGE = 300
+PARTY_LIST_MAX_AGE = 5
+RNG_MAX_AGE = 30
+FONTS_MAX_AGE = 3600
+
 class API(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -22,6 +31,7 @@ class API(commands.Cog):
         self.app.router.add_post('/v1/party/unqueue', self.handle_party_unqueue)
         self.app.router.add_post('/v1/party/update', self.handle_party_update)
         self.app.router.add_get('/v1/names', self.handle_names)
+        self.app.router.add_post('/v1/uuids', self.handle_uuids)
         self.app.router.add_get('/v1/fonts', self.handle_fonts)
         self.app.router.add_get('/v1/irc', self.handle_irc)
         self.app.router.add_post('/v1/solo_clear', self.handle_solo_clear)
@@ -252,7 +262,7 @@ class API(commands.Cog):
             prices = await get_all_prices()
             run_counts = await get_dungeon_runs(uuid)
             
-            return web.json_response({
+            return hashed_json(request, {
                 'status': 'success',
                 'player': player,
                 'data': {
@@ -265,7 +275,7 @@ class API(commands.Cog):
                     'chest_costs': CHEST_COSTS,
                     'global_drops': GLOBAL_DROPS
                 }
-            })
+            }, RNG_MAX_AGE, scope="private")
 
         except Exception as e:
             log_error(f"[API] Error processing RNG GET request: {e}")
@@ -371,6 +381,7 @@ class API(commands.Cog):
             log_info(f"[API] Received RTCA simulation request for: {player} ({floor_name})")
             
             from services.api import get_uuid, get_profile_data
+            from services.profile_projection import snapshot_for
             from core.game_data import FLOOR_XP_MAP
             from core.config import config
             from modules.dungeons import default_bonuses
@@ -400,16 +411,10 @@ class API(commands.Cog):
             if not best_profile:
                 best_profile = next((p for p in profiles if p.get("selected")), profiles[0])
             member = best_profile.get("members", {}).get(uuid, {})
-            dungeons = member.get("dungeons", {})
-            player_classes = dungeons.get("player_classes", {})
-
-            dungeon_classes = {
-                cls: data.get("experience", 0)
-                for cls, data in player_classes.items()
-                if cls in ["archer", "berserk", "healer", "mage", "tank"]
-            }
+            snapshot = snapshot_for(best_profile, uuid)
+            dungeon_classes = dict(snapshot.class_xp) if snapshot else {}
 
-            if not dungeon_classes:
+            if not any(dungeon_classes.values()):
                  return web.json_response({'error': 'No dungeon classes found'}, status=404)
 
             player_data = member.get("player_data", {})
@@ -474,24 +479,20 @@ class API(commands.Cog):
             
             log_info(f"[API] Received leaderboard request: period={period}, metric={metric}, limit={limit}, page={page}")
             
-            data = self.bot.daily_manager.get_leaderboard(period, metric)
-            
-            if data is None:
-                 return web.json_response({'error': 'Failed to fetch leaderboard'}, status=500)
-            
-            total_entries = len(data)
+            daily_manager = self.bot.daily_manager
+            etag = make_etag(
+                "leaderboard", daily_manager.version, daily_manager.get_last_updated(), sorted(request.query.items())
+            )
+            if etag_matches(request, etag):
+                return not_modified(etag, LEADERBOARD_MAX_AGE)
+
+            total_entries = daily_manager.get_leaderboard_size(period, metric)
             total_pages = (total_entries + limit - 1) // limit
 
             find_player = request.query.get('find_player')
             if find_player:
-                find_player = find_player.lower()
-                found_index = -1
-                for i, entry in enumerate(data):
-                    if entry['ign'].lower() == find_player:
-                        found_index = i
-                        break
-                
-                if found_index != -1:
+                found_index = daily_manager.find_leaderboard_rank(period, metric, find_player)
+                if found_index is not None:
                     page = (found_index // limit) + 1
                 else:
                     return web.json_response({'error': 'Player not found on leaderboard'}, status=404)
@@ -502,7 +503,7 @@ class API(commands.Cog):
             start = (page - 1) * limit
             end = start + limit
             
-            limited_data = data[start:end]
+            limited_data = daily_manager.get_leaderboard_page(period, metric, start, end)
             
             last_updated = self.bot.daily_manager.get_last_updated()
             
@@ -514,7 +515,7 @@ class API(commands.Cog):
                 'total_pages': total_pages,
                 'last_updated': last_updated,
                 'data': limited_data
-            })
+            }, headers=cache_headers(etag, LEADERBOARD_MAX_AGE))
 
         except Exception as e:
             log_error(f"[API] Error processing leaderboard request: {e}")
@@ -524,8 +525,14 @@ class API(commands.Cog):
         try:
             floor = request.query.get('floor')
             from services.party_manager import party_manager
+            party_manager.cleanup()
+            etag = make_etag("party_list", party_manager.version, (floor or "").upper())
+            if etag_matches(request, etag):
+                return not_modified(etag, PARTY_LIST_MAX_AGE)
             parties = party_manager.get_parties(floor)
-            return web.json_response({'status': 'success', 'parties': parties})
+            return web.json_response(
+                {'status': 'success', 'parties': parties}, headers=cache_headers(etag, PARTY_LIST_MAX_AGE)
+            )
         except Exception as e:
             log_error(f"[API] Error in party list: {e}")
             return web.json_response({'error': str(e)}, status=500)
@@ -589,10 +596,29 @@ class API(commands.Cog):
 
     async def handle_names(self, request):
         from services.name_manager import name_manager
+        etag = make_etag("names", name_manager.version)
+        if etag_matches(request, etag):
+            return not_modified(etag, NAMES_MAX_AGE)
         return web.json_response({
             'status': 'success',
             'names': name_manager.get_names()
-        })
+        }, headers=cache_headers(etag, NAMES_MAX_AGE))
+
+    async def handle_uuids(self, request):
+        try:
+            data = await request.json()
+            names = data.get('names') if isinstance(data, dict) else None
+            if not isinstance(names, list) or not all(isinstance(n, str) for n in names):
+                return web.json_response({'error': 'names must be a list of strings'}, status=400)
+            if len(names) > MAX_BULK_UUID_NAMES:
+                return web.json_response({'error': f'At most {MAX_BULK_UUID_NAMES} names per request'}, status=400)
+
+            from services.api import get_uuids
+            uuids = await get_uuids(names)
+            return web.json_response({'status': 'success', 'uuids': uuids})
+        except Exception as e:
+            log_error(f"[API] Error in uuids: {e}")
+            return web.json_response({'error': str(e)}, status=500)
 
     async def handle_fonts(self, request):
         try:
@@ -604,10 +630,11 @@ class API(commands.Cog):
                 return web.json_response({'error': 'Failed to fetch fonts'}, status=500)
             
             server_hash = fonts_data.get('hash')
-            if client_hash and client_hash == server_hash:
-                return web.Response(status=304)
+            etag = make_etag("fonts", server_hash)
+            if (client_hash and client_hash == server_hash) or etag_matches(request, etag):
+                return not_modified(etag, FONTS_MAX_AGE)
             
-            return web.json_response(fonts_data)
+            return web.json_response(fonts_data, headers=cache_headers(etag, FONTS_MAX_AGE))
         except Exception as e:
             log_error(f"[API] Error handling fonts request: {e}")
             return web.json_response({'error': str(e)}, status=500)
@@ -641,7 +668,7 @@ class API(commands.Cog):
         try:
             ip = get_client_ip(request)
             if ip != "127.0.0.1":
-                allowed, retry_after = solo_clear_limiter.check(ip)
+                allowed, retry_after = await solo_clear_limiter.check(ip)
                 if not allowed:
                     log_error(f"[API] solo_clear rate limit exceeded for IP: {ip} (retry in {retry_after}s)")
                     return web.json_response(
@@ -684,7 +711,7 @@ class API(commands.Cog):
                 return web.json_response({'error': 'Player not found'}, status=404)
 
             if ip != "127.0.0.1":
-                allowed, retry_after = solo_clear_uuid_limiter.check(str(uuid))
+                allowed, retry_after = await solo_clear_uuid_limiter.check(str(uuid))
                 if not allowed:
                     log_error(f"[API] solo_clear rate limit exceeded for UUID: {uuid} ({player}, retry in {retry_after}s)")
                     return web.json_response(
@@ -845,8 +872,9 @@ class API(commands.Cog):
                     if evidence.map_data:
                         try:
                             from services.map_renderer import render_map
+                            from services.worker_pool import worker_pool
                             import io as _io
-                            png = render_map(evidence.map_data)
+                            png = await worker_pool.run("map_render", render_map, evidence.map_data)
                             if png:
                                 map_file = discord.File(_io.BytesIO(png), filename="minimap.png")
                                 embed.set_image(url="attachment://minimap.png")
@@ -874,6 +902,9 @@ class API(commands.Cog):
     async def handle_solo_leaderboard(self, request):
         try:
             floor = request.rel_url.query.get('floor', 'F7').upper()
+            etag = make_etag("solo_leaderboard", self.bot.solo_manager.version, floor)
+            if etag_matches(request, etag):
+                return not_modified(etag, SOLO_LEADERBOARD_MAX_AGE)
             runs = self.bot.solo_manager.get_leaderboard(floor, 'verified')
             from modules.solo_clears import format_time
             result = []
@@ -890,7 +921,7 @@ class API(commands.Cog):
                     'date_achieved': run.get('date_achieved', 0),
                     'map_data': run.get('evidence', {}).get('map_data') if 'evidence' in run else None,
                 })
-            return web.json_response({'floor': floor, 'runs': result})
+            return web.json_response({'floor': floor, 'runs': result}, headers=cache_headers(etag, SOLO_LEADERBOARD_MAX_AGE))
         except Exception as e:
             log_error(f"[API] Error processing GET /v1/solo_leaderboard: {e}")
             return web.json_response({'error': str(e)}, status=500)
@@ -8,7 +8,7 @@ from core.config import config
 from core.game_data import FLOOR_XP_MAP, CLASS_ICONS
 from core.logger import log_info, log_debug, log_error
 from core.ui import AuthorView
-from services.api import get_uuid, get_profile_data, get_dungeon_stats, _select_member
+from services.api import get_uuid, get_profile_data, get_dungeon_stats, _select_member, _select_snapshot
 from services.simulation_logic import simulate_async
 from services.xp_calculations import calculate_dungeon_xp_per_run, get_dungeon_level
 from services.visualization import generate_dungeon_graph, generate_rtca_graph
@@ -72,22 +72,10 @@ class ProfileSelect(Select):
             await interaction.followup.send("\u274c Could not switch to that profile.", ephemeral=True)
             return
 
-        dungeons = member.get("dungeons", {})
-        if "class_levels" in dungeons:
-            class_levels = dungeons.get("class_levels", {})
-            new_classes = {
-                cls: float((class_levels.get(cls) or {}).get("xp", 0) or 0)
-                for cls in ["archer", "berserk", "healer", "mage", "tank"]
-            }
-        else:
-            player_classes = dungeons.get("player_classes", {})
-            new_classes = {
-                cls: data["experience"]
-                for cls, data in player_classes.items()
-                if cls in ["archer", "berserk", "healer", "mage", "tank"]
-            }
-
-        if not new_classes:
+        snapshot = _select_snapshot(self.parent_view.profile_data, self.parent_view.uuid, profile_name)
+        new_classes = dict(snapshot.class_xp) if snapshot else {}
+
+        if not any(new_classes.values()):
             await interaction.followup.send("\u274c This profile has no dungeon data.", ephemeral=True)
             return
 
@@ -100,10 +88,7 @@ class ProfileSelect(Select):
             "mage": perks.get("cold_efficiency", 0) * 0.02,
             "tank": perks.get("diamond_in_the_rough", 0) * 0.02,
         }
-        if "catacombs_xp" in dungeons:
-            new_cata_xp = float(dungeons.get("catacombs_xp", 0) or 0)
-        else:
-            new_cata_xp = float(dungeons.get("dungeon_types", {}).get("catacombs", {}).get("experience", 0))
+        new_cata_xp = snapshot.catacombs_xp
 
         for p in self.parent_view.profiles_list:
             p["selected"] = (p["cute_name"] == profile_name)
@@ -620,29 +605,15 @@ class Dungeons(commands.Cog):
             if p.get("cute_name")
         ]
 
-        from services.api import _select_member
         member = _select_member(profile_data, uuid, forced_profile)
         if not member:
             await interaction.followup.send("\u274c Failed to select a SkyBlock profile.")
             return
 
-        dungeons = member.get("dungeons", {})
+        snapshot = _select_snapshot(profile_data, uuid, forced_profile)
+        dungeon_classes = dict(snapshot.class_xp) if snapshot else {}
 
-        if "class_levels" in dungeons:
-            class_levels = dungeons.get("class_levels", {})
-            dungeon_classes = {
-                cls: float((class_levels.get(cls) or {}).get("xp", 0) or 0)
-                for cls in ["archer", "berserk", "healer", "mage", "tank"]
-            }
-        else:
-            player_classes = dungeons.get("player_classes", {})
-            dungeon_classes = {
-                cls: data["experience"]
-                for cls, data in player_classes.items()
-                if cls in ["archer", "berserk", "healer", "mage", "tank"]
-            }
-
-        if not dungeon_classes:
+        if not any(dungeon_classes.values()):
             embed = discord.Embed(
                 description=f"\u274c **{ign}** has no dungeon data on this profile.",
                 color=0xFF4444
@@ -725,10 +696,7 @@ class Dungeons(commands.Cog):
         
         log_debug(f"Dungeon XP per run: {dungeon_xp:,.0f}")
         
-        if "catacombs_xp" in dungeons:
-            current_cata_xp = float(dungeons.get("catacombs_xp", 0) or 0)
-        else:
-            current_cata_xp = float(dungeons.get("dungeon_types", {}).get("catacombs", {}).get("experience", 0))
+        current_cata_xp = snapshot.catacombs_xp
         
         runs_total, results = await simulate_async(dungeon_classes, base_floor, bonuses)
         view = BonusSelectView(
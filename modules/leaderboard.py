@@ -60,15 +60,9 @@ class SearchModal(Modal):
                  
             period = "daily" if "daily" in self.view.mode or self.view.mode == "leaderboard" else "monthly"
             
-            data = self.view.bot.daily_manager.get_leaderboard(period, metric)
+            found_index = self.view.bot.daily_manager.find_leaderboard_rank(period, metric, ign_val_lower)
             
-            found_index = -1
-            for i, entry in enumerate(data):
-                if entry["ign"].lower() == ign_val_lower:
-                    found_index = i
-                    break
-            
-            if found_index != -1:
+            if found_index is not None:
                 self.view.page = (found_index // 10) + 1
                 await self.view.update_message(interaction)
                 return
@@ -152,7 +146,7 @@ class DailyView(AuthorView):
             title_p = "Daily" if period == "daily" else "Monthly"
             title = f"🏆 {title_p} Catacombs XP Leaderboard"
         
-        data = self.bot.daily_manager.get_leaderboard(period, metric)
+        total_entries = self.bot.daily_manager.get_leaderboard_size(period, metric)
         
         embed = discord.Embed(title=title, color=0xffd700)
         
@@ -162,18 +156,18 @@ class DailyView(AuthorView):
         update_str = f"<t:{next_update_ts}:R>" if next_update_ts else "Soon"
         last_update_str = f"<t:{last_update_ts}:R>" if last_update_ts else "Never"
         
-        if not data:
+        if not total_entries:
             embed.description = "No data recorded yet."
             embed.set_footer(text=f"Updates every 2 hours • Your IGN: {self.ign}")
             return embed
 
-        self.total_pages = math.ceil(len(data) / 10)
+        self.total_pages = math.ceil(total_entries / 10)
         if self.page > self.total_pages: self.page = self.total_pages
         if self.page < 1: self.page = 1
         
         start_idx = (self.page - 1) * 10
         end_idx = start_idx + 10
-        current_data = data[start_idx:end_idx]
+        current_data = self.bot.daily_manager.get_leaderboard_page(period, metric, start_idx, end_idx)
             
         desc = []
         for i, entry in enumerate(current_data, start_idx + 1):
@@ -401,15 +395,9 @@ class DailyView(AuthorView):
         
         period = "daily" if "daily" in self.mode or self.mode == "leaderboard" else "monthly"
         
-        data = interaction.client.daily_manager.get_leaderboard(period, metric)
-        
-        found_index = -1
-        for i, entry in enumerate(data):
-            if entry["ign"].lower() == self.ign.lower():
-                found_index = i
-                break
+        found_index = interaction.client.daily_manager.find_leaderboard_rank(period, metric, self.ign)
         
-        if found_index != -1:
+        if found_index is not None:
             self.page = (found_index // 10) + 1
             await self.update_message(interaction)
         else:
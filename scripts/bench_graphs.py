@@ -0,0 +1,57 @@
+import io
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+from services.visualization import (
+    _create_combined_graph,
+    _create_rtca_graph,
+    _pillow_combined_graph,
+    _pillow_rtca_graph,
+)
+
+NUMBER = 5
+REPEAT = 5
+
+CLASS_DATA = {"Archer": 42.5, "Berserk": 38.1, "Healer": 45.9, "Mage": 50.0, "Tank": 33.3}
+FLOORS_DATA = {f: {"runs": runs} for f, runs in [
+    ("Entrance", 12), ("F1", 20), ("F3", 45), ("F5", 120), ("F7", 850),
+    ("M1", 30), ("M3", 64), ("M5", 210), ("M6", 400), ("M7", 1500),
+]}
+XP_DATA = {"healer": 120_000_000, "mage": 569_809_640, "berserk": 40_000_000, "archer": 90_000_000, "tank": 8_000_000}
+SIM_RESULTS = {"healer": {"runs_done": 1200}, "mage": {"runs_done": 0}, "berserk": {"runs_done": 2500},
+               "archer": {"runs_done": 1600}, "tank": {"runs_done": 3100}}
+
+
+def best(fn) -> float:
+    return min(timeit.repeat(fn, number=NUMBER, repeat=REPEAT)) / NUMBER
+
+
+def report(name: str, before: float, after: float):
+    print(f"{name:<16} matplotlib {before * 1000:8.2f} ms -> pillow {after * 1000:8.2f} ms  ({before / after:5.1f}x)")
+
+
+def main():
+    cases = [
+        ("dungeon_graph",
+         lambda: _create_combined_graph(CLASS_DATA, FLOORS_DATA, 47.2),
+         lambda: _pillow_combined_graph(CLASS_DATA, FLOORS_DATA, 47.2)),
+        ("rtca_graph",
+         lambda: _create_rtca_graph(XP_DATA, SIM_RESULTS, "Player", 50),
+         lambda: _pillow_rtca_graph(XP_DATA, SIM_RESULTS, "Player", 50)),
+    ]
+
+    print(f"best of {REPEAT} x {NUMBER} renders")
+    for name, slow, fast in cases:
+        sizes = [Image.open(io.BytesIO(fn())).size for fn in (slow, fast)]
+        slow_time, fast_time = best(slow), best(fast)
+        report(name, slow_time, fast_time)
+        print(f"{'':<16} sizes {sizes[0]} vs {sizes[1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.logger import logger
+from services import simulation_logic
+from services.simulation_logic import simulate_to_level_all50
+from services.xp_calculations import get_total_xp_for_level
+
+REPEAT = 7
+NUMBER = 5
+CLASSES = ["archer", "berserk", "healer", "mage", "tank"]
+M7_XP = 300000
+F7_XP = 28000
+
+
+def loop_runs_done(dungeon_classes: dict, floor_xp: float, bonuses: dict, target_level: int = 50,
+                   max_runs: int = 200000):
+    class_boosts = bonuses.get("class_boosts", {})
+    per_class_base = {
+        c: floor_xp * (1.0 + (bonuses.get("hecatomb", 0.02) * 2) + class_boosts.get(c, 0.0)
+                       + bonuses.get("scarf_accessory", 0.06) + bonuses.get("scarf_attribute", 0.2))
+        * bonuses.get("global", 1.0) * bonuses.get("mayor", 1.0)
+        for c in dungeon_classes
+    }
+    target_xp = get_total_xp_for_level(target_level)
+    left = {c: max(target_xp - float(xp), 0) for c, xp in dungeon_classes.items()}
+    runs_done = {c: 0 for c in dungeon_classes}
+    runs = 0
+    while runs < max_runs:
+        if all(value <= 0 for value in left.values()):
+            break
+        runs += 1
+        maxval, maxindex = -1, None
+        for c in left:
+            if left[c] > maxval:
+                maxval, maxindex = left[c], c
+        for c in left:
+            if c == maxindex:
+                left[c] -= per_class_base[c]
+                runs_done[c] += 1
+            else:
+                left[c] -= per_class_base[c] * 0.25
+    return runs, runs_done
+
+
+def random_case(rng: random.Random):
+    top = get_total_xp_for_level(50)
+    classes = {c: rng.choice([0, rng.uniform(0, top), rng.uniform(0, top / 20)]) for c in CLASSES}
+    bonuses = {
+        "global": rng.choice([1.0, 1.1]),
+        "mayor": rng.choice([1.0, 1.1]),
+        "class_boosts": {c: rng.choice([0.0, 0.0, 0.02, 0.1]) for c in CLASSES},
+    }
+    return classes, rng.choice([M7_XP, F7_XP]), bonuses
+
+
+def best(stmt) -> float:
+    return min(timeit.repeat(stmt, number=NUMBER, repeat=REPEAT)) / NUMBER
+
+
+def main():
+    logger.disabled = True
+    rng = random.Random(7)
+    cases = [random_case(rng) for _ in range(300)]
+    for classes, floor_xp, bonuses in cases:
+        runs, results = simulate_to_level_all50(classes, floor_xp, bonuses, target_level=50)
+        assert (runs, {c: r["runs_done"] for c, r in results.items()}) == loop_runs_done(classes, floor_xp, bonuses)
+    print(f"runs_done identical on {len(cases)} random cases")
+
+    scenarios = {
+        "fresh account, M7": ({c: 0 for c in CLASSES}, M7_XP, {}),
+        "fresh account, F7": ({c: 0 for c in CLASSES}, F7_XP, {}),
+        "mixed levels, boosts": (cases[0][0], M7_XP, {"class_boosts": {"mage": 0.1, "tank": 0.02}}),
+    }
+    for name, (classes, floor_xp, bonuses) in scenarios.items():
+        runs, _ = loop_runs_done(classes, floor_xp, bonuses)
+        before = best(lambda: loop_runs_done(classes, floor_xp, bonuses))
+        after = best(lambda: simulate_to_level_all50(classes, floor_xp, bonuses, target_level=50))
+        print(f"{name:<24} {runs:>6} runs  {before * 1000:8.2f} ms -> {after * 1000:7.2f} ms  ({before / after:5.1f}x)")
+
+    simulation_logic.NUMPY_AVAILABLE = False
+    classes, floor_xp, bonuses = scenarios["fresh account, F7"]
+    after = best(lambda: simulate_to_level_all50(classes, floor_xp, bonuses, target_level=50))
+    print(f"{'F7 without numpy':<24} {'':>6}       {'':>8}    -> {after * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import math
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.game_data import DUNGEON_XP
+from services.xp_calculations import get_dungeon_level, get_total_xp_for_level, levels_for
+
+SAMPLES = 20000
+REPEAT = 5
+
+
+def linear_dungeon_level(xp: float) -> float:
+    total = 0.0
+    for i in range(1, len(DUNGEON_XP)):
+        total += DUNGEON_XP[i]
+        if xp < total:
+            prev = total - DUNGEON_XP[i]
+            return round(i - 1 + (xp - prev) / DUNGEON_XP[i], 2)
+    return round((len(DUNGEON_XP) - 1) + (xp - total) / DUNGEON_XP[-1], 2)
+
+
+def linear_total_xp_for_level(level: float) -> float:
+    total = 0.0
+    level_int = math.floor(level)
+    for i in range(1, min(level_int + 1, len(DUNGEON_XP))):
+        total += DUNGEON_XP[i]
+    frac = level - level_int
+    if level_int + 1 < len(DUNGEON_XP) and frac > 0:
+        total += DUNGEON_XP[level_int + 1] * frac
+    return total
+
+
+def best(stmt) -> float:
+    return min(timeit.repeat(stmt, number=1, repeat=REPEAT))
+
+
+def report(name: str, before: float, after: float):
+    print(f"{name:<28} {before * 1000:9.2f} ms -> {after * 1000:9.2f} ms  ({before / after:5.1f}x)")
+
+
+def main():
+    rng = random.Random(42)
+    xps = [rng.uniform(0, 600_000_000) for _ in range(SAMPLES)]
+    levels = [rng.uniform(0, 49.99) for _ in range(SAMPLES)]
+
+    assert [linear_dungeon_level(xp) for xp in xps] == [get_dungeon_level(xp) for xp in xps] == levels_for(xps)
+
+    print(f"{SAMPLES} conversions, best of {REPEAT}")
+    linear = best(lambda: [linear_dungeon_level(xp) for xp in xps])
+    report("get_dungeon_level", linear, best(lambda: [get_dungeon_level(xp) for xp in xps]))
+    report("levels_for", linear, best(lambda: levels_for(xps)))
+    report("get_total_xp_for_level",
+           best(lambda: [linear_total_xp_for_level(level) for level in levels]),
+           best(lambda: [get_total_xp_for_level(level) for level in levels]))
+
+
+if __name__ == "__main__":
+    main()
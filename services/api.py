@@ -1,6 +1,8 @@
 import aiohttp
 import asyncio
+import bisect
 import os
+import re
 import time
 import aiofiles
 from services import json_utils
@@ -9,35 +11,175 @@ from core.config import config
 from core.game_data import SKELETON_MASTER_CHESTPLATE_50
 
 from core.logger import log_debug, log_error, log_info
-from core.cache import cache_get, cache_set, get_cache_expiry
+from core.cache import cache_get, cache_set, cache_get_stale, revalidate, configure_namespace, get_cache_expiry
+from services.profile_projection import DungeonSnapshot, project_profile_data, snapshot_for
 from typing import Optional
 
+configure_namespace("profile", stale_grace=config.profile_stale_grace)
+
 PRICES_CACHE_FILE = "data/prices_cache.json"
 _prices_memory: Optional[dict] = None
 _prices_fetched_at: float = 0.0
 
 
 _SESSION: Optional[aiohttp.ClientSession] = None
-_CONNECTOR: Optional[aiohttp.TCPConnector] = None
+
+DNS_CACHE_TTL = 300
+DEFAULT_POOL = "default"
+HTTP_POOL_DEFAULTS = {
+    "limit": 8,
+    "limit_per_host": 8,
+    "keepalive_timeout": 30,
+    "connect_timeout": 5,
+    "read_timeout": 15,
+    "total_timeout": 20,
+}
+HTTP_POOLS = {
+    "playerdb": {"read_timeout": 8, "total_timeout": 10},
+    "soopy": {},
+    "soterm": {},
+    "adjectils": {},
+    "plain_dawn": {},
+    "hypixel": {"limit": 4, "limit_per_host": 4},
+    "skycrypt": {"limit": 4, "limit_per_host": 4},
+    "moulberry": {"limit": 2, "limit_per_host": 2, "read_timeout": 8, "total_timeout": 10},
+    "coflnet": {"limit": 4, "limit_per_host": 4, "connect_timeout": 3, "read_timeout": 4, "total_timeout": 5},
+    "mojang": {"limit": 6, "limit_per_host": 6, "connect_timeout": 3, "read_timeout": 8, "total_timeout": 10},
+    "google": {"limit": 2, "limit_per_host": 2},
+}
+
+
+class _PoolStats:
+    def __init__(self):
+        self.in_flight = 0
+        self.waiting = 0
+        self.requests = 0
+        self.created = 0
+        self.reused = 0
+        self.queued = 0
+        self.errors = 0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_request_end.append(self._on_request_end)
+        trace.on_request_exception.append(self._on_request_exception)
+        trace.on_connection_queued_start.append(self._on_queued_start)
+        trace.on_connection_queued_end.append(self._on_queued_end)
+        trace.on_connection_create_end.append(self._on_connection_create)
+        trace.on_connection_reuseconn.append(self._on_connection_reuse)
+        return trace
+
+    async def _on_request_start(self, session, ctx, params):
+        self.in_flight += 1
+        self.requests += 1
+
+    async def _on_request_end(self, session, ctx, params):
+        self.in_flight = max(0, self.in_flight - 1)
+
+    async def _on_request_exception(self, session, ctx, params):
+        self.in_flight = max(0, self.in_flight - 1)
+        self.errors += 1
+
+    async def _on_queued_start(self, session, ctx, params):
+        self.waiting += 1
+        self.queued += 1
+
+    async def _on_queued_end(self, session, ctx, params):
+        self.waiting = max(0, self.waiting - 1)
+
+    async def _on_connection_create(self, session, ctx, params):
+        self.created += 1
+
+    async def _on_connection_reuse(self, session, ctx, params):
+        self.reused += 1
+
+    def stats(self) -> dict:
+        return {
+            "acquired": self.in_flight,
+            "waiting": self.waiting,
+            "requests": self.requests,
+            "created": self.created,
+            "reused": self.reused,
+            "queued": self.queued,
+            "errors": self.errors,
+        }
+
+
+_POOLS: dict[str, aiohttp.ClientSession] = {}
+_POOL_STATS: dict[str, _PoolStats] = {}
+
+
+def _pool_settings(name: str) -> dict:
+    settings = dict(HTTP_POOL_DEFAULTS)
+    settings.update(HTTP_POOLS.get(name, {}))
+    settings.update(config.http_pools.get(name, {}))
+    return settings
+
+
+def _create_pool(name: str) -> aiohttp.ClientSession:
+    settings = _pool_settings(name)
+    connector = aiohttp.TCPConnector(
+        limit=settings["limit"],
+        limit_per_host=settings["limit_per_host"],
+        ttl_dns_cache=DNS_CACHE_TTL,
+        use_dns_cache=True,
+        keepalive_timeout=settings["keepalive_timeout"],
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=settings["total_timeout"],
+        connect=settings["connect_timeout"],
+        sock_read=settings["read_timeout"],
+    )
+    stats = _POOL_STATS.setdefault(name, _PoolStats())
+    return aiohttp.ClientSession(
+        headers=HEADERS,
+        connector=connector,
+        timeout=timeout,
+        trace_configs=[stats.trace_config()],
+    )
+
+
+def _session_for(pool: str) -> Optional[aiohttp.ClientSession]:
+    session = _POOLS.get(pool)
+    if session is None and _SESSION is not None and pool not in HTTP_POOLS:
+        session = _POOLS[pool] = _create_pool(pool)
+    return session or _SESSION
+
+
+def get_pool_stats() -> dict:
+    result = {}
+    for name, stats in _POOL_STATS.items():
+        entry = stats.stats()
+        session = _POOLS.get(name)
+        if session is not None:
+            entry["limit"] = session.connector.limit
+            entry["limit_per_host"] = session.connector.limit_per_host
+        result[name] = entry
+    return result
+
 
 async def init_session():
-    global _SESSION, _CONNECTOR
+    global _SESSION
     if _SESSION is None:
-        _CONNECTOR = aiohttp.TCPConnector(limit=10)
-        _SESSION = aiohttp.ClientSession(headers=HEADERS, connector=_CONNECTOR)
-        log_info("Global API Session initialized.")
+        for name in (*HTTP_POOLS, DEFAULT_POOL):
+            if name not in _POOLS:
+                _POOLS[name] = _create_pool(name)
+        _SESSION = _POOLS[DEFAULT_POOL]
+        log_info(f"Global API Session initialized with {len(_POOLS)} provider pools.")
 
 async def close_session():
-    global _SESSION, _CONNECTOR
-    if _SESSION:
+    global _SESSION
+    for session in list(_POOLS.values()):
+        if not session.closed:
+            await session.close()
+    _POOLS.clear()
+
+    if _SESSION and not _SESSION.closed:
         await _SESSION.close()
-    
-    if _CONNECTOR and not _CONNECTOR.closed:
-        await _CONNECTOR.close()
 
     await asyncio.sleep(0.5)
     _SESSION = None
-    _CONNECTOR = None
     log_info("Global API Session closed.")
 
 
@@ -55,12 +197,35 @@ HEADERS = {
 }
 
 
+_INFLIGHT: dict[str, asyncio.Task] = {}
+
+
+async def _single_flight(key: str, fetch):
+    task = _INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        _INFLIGHT[key] = task
+
+        def _release(done, key=key):
+            if _INFLIGHT.get(key) is done:
+                del _INFLIGHT[key]
+
+        task.add_done_callback(_release)
+    else:
+        log_debug(f"Joining in-flight request for {key}")
+    return await asyncio.shield(task)
+
+
 async def get_uuid(name: str):
     cached = await cache_get(name.lower())
     if cached:
         log_debug(f"Using cached UUID for {name}")
         return cached
 
+    return await _single_flight(f"uuid:{name.lower()}", lambda: _fetch_uuid(name))
+
+
+async def _fetch_uuid(name: str):
     log_debug(f"Requesting UUID for {name}")
     
     if not _SESSION:
@@ -72,7 +237,7 @@ async def get_uuid(name: str):
         
     msg = quote(name)
     try:
-        async with _SESSION.get(f"https://playerdb.co/api/player/minecraft/{msg}") as r:
+        async with _session_for("playerdb").get(f"https://playerdb.co/api/player/minecraft/{msg}") as r:
             if r.status != 200:
                 log_error(f"UUID request failed ({r.status})")
                 return None
@@ -86,6 +251,83 @@ async def get_uuid(name: str):
          return None
 
 
+MOJANG_BULK_URL = "https://api.mojang.com/profiles/minecraft"
+MOJANG_BULK_LIMIT = 10
+UUID_BULK_CONCURRENCY = 4
+_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_]{1,16}$")
+
+
+async def _fetch_uuids_bulk(names: list) -> Optional[dict]:
+    try:
+        async with _session_for("mojang").post(MOJANG_BULK_URL, json=names) as r:
+            if r.status != 200:
+                log_error(f"Mojang bulk UUID request failed ({r.status})")
+                return None
+            data = await r.json(loads=json_utils.loads)
+    except Exception as e:
+        log_error(f"Mojang bulk UUID request error: {e}")
+        return None
+
+    resolved = {}
+    for entry in data or []:
+        name = entry.get("name")
+        uuid = entry.get("id")
+        if name and uuid:
+            resolved[name.lower()] = uuid
+            await cache_set(name.lower(), uuid, ttl=config.profile_cache_ttl)
+    return {name.lower(): resolved.get(name.lower()) for name in names}
+
+
+async def get_uuids(names: list) -> dict:
+    result = {}
+    pending = []
+    seen = set()
+    for name in names:
+        if not isinstance(name, str):
+            continue
+        key = name.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        if not _NAME_PATTERN.match(name):
+            result[key] = None
+            continue
+        cached = await cache_get(key)
+        if cached:
+            result[key] = cached
+        else:
+            pending.append(name)
+
+    if not pending:
+        return result
+
+    if not _SESSION:
+        await init_session()
+
+    semaphore = asyncio.Semaphore(UUID_BULK_CONCURRENCY)
+
+    async def bulk(chunk):
+        async with semaphore:
+            return chunk, await _fetch_uuids_bulk(chunk)
+
+    async def single(name):
+        async with semaphore:
+            return name.lower(), await get_uuid(name)
+
+    chunks = [pending[i:i + MOJANG_BULK_LIMIT] for i in range(0, len(pending), MOJANG_BULK_LIMIT)]
+    fallback = []
+    for chunk, resolved in await asyncio.gather(*(bulk(chunk) for chunk in chunks)):
+        if resolved is None:
+            fallback.extend(chunk)
+        else:
+            result.update(resolved)
+
+    if fallback:
+        log_debug(f"Falling back to playerdb for {len(fallback)} names")
+        result.update(await asyncio.gather(*(single(name) for name in fallback)))
+    return result
+
+
 async def get_soopy_player_data(uuid: str):
     cached = await cache_get(f"soopy_player:{uuid}")
     if cached:
@@ -97,7 +339,7 @@ async def get_soopy_player_data(uuid: str):
     url = f"https://soopy.dev/api/v2/player/{uuid}"
     log_debug(f"Requesting player data (soopy.dev): {url}")
     try:
-        async with _SESSION.get(url, timeout=aiohttp.ClientTimeout(total=20)) as r:
+        async with _session_for("soopy").get(url) as r:
             if r.status == 200:
                 data = await r.json(loads=json_utils.loads)
                 if data.get("success") and data.get("data"):
@@ -128,52 +370,227 @@ PLAIN_DAWN_BASE_URL = "https://plain-dawn-a5d2.ryaneagers2015.workers.dev/hypixe
 ADJECTILS_BASE_URL = "https://adjectilsbackend.adjectivenoun3215.workers.dev"
 SHIIYU_BASE_URL = "https://sky.shiiyu.moe/api/stats"
 
-class _ApiCooldownTracker:
-    def __init__(self):
-        self._cooldowns: dict[str, float] = {}
-        self._consecutive_failures: dict[str, int] = {}
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+HALF_OPEN_PROBES = 1
+
+LIMITER_INITIAL = 4
+LIMITER_MIN = 1
+LIMITER_MAX = 8
+LIMITER_DECREASE_FACTOR = 0.5
+LIMITER_LATENCY_TOLERANCE = 2.0
+LIMITER_LATENCY_BACKOFF = 0.9
+
+
+class _AdaptiveLimiter:
+    def __init__(self, initial=LIMITER_INITIAL, minimum=LIMITER_MIN, maximum=LIMITER_MAX):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.in_flight = 0
+        self.baseline_latency: Optional[float] = None
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self):
+        async with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def on_latency(self, seconds: float):
+        if self.baseline_latency is None or seconds < self.baseline_latency:
+            self.baseline_latency = seconds
+        else:
+            self.baseline_latency = self.baseline_latency * 0.95 + seconds * 0.05
 
-    def is_cooling_down(self, api_name: str) -> bool:
-        return time.time() < self._cooldowns.get(api_name, 0.0)
+        if seconds > self.baseline_latency * LIMITER_LATENCY_TOLERANCE:
+            self.limit = max(self.minimum, self.limit * LIMITER_LATENCY_BACKOFF)
+        else:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+    def on_congestion(self):
+        self.limit = max(self.minimum, self.limit * LIMITER_DECREASE_FACTOR)
+
+
+class _ProviderGuard:
+    def __init__(self, name: str):
+        self.name = name
+        self.state = CIRCUIT_CLOSED
+        self.open_until = 0.0
+        self.consecutive_failures = 0
+        self.probes_in_flight = 0
+        self.limiter = _AdaptiveLimiter()
+
+    def is_open(self) -> bool:
+        if self.state == CIRCUIT_OPEN:
+            return time.time() < self.open_until
+        if self.state == CIRCUIT_HALF_OPEN:
+            return self.probes_in_flight >= HALF_OPEN_PROBES
+        return False
+
+    def admit(self) -> tuple:
+        if self.state == CIRCUIT_OPEN:
+            if time.time() < self.open_until:
+                return False, False
+            self.state = CIRCUIT_HALF_OPEN
+            self.probes_in_flight = 0
+            log_info(f"API '{self.name}' circuit half-open, sending probe request")
+        if self.state == CIRCUIT_HALF_OPEN:
+            if self.probes_in_flight >= HALF_OPEN_PROBES:
+                return False, False
+            self.probes_in_flight += 1
+            return True, True
+        return True, False
+
+    def finish(self, is_probe: bool):
+        if is_probe and self.state == CIRCUIT_HALF_OPEN and self.probes_in_flight > 0:
+            self.probes_in_flight -= 1
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        if self.state != CIRCUIT_CLOSED:
+            log_info(f"API '{self.name}' circuit closed")
+        self.state = CIRCUIT_CLOSED
+        self.probes_in_flight = 0
+
+    def record_failure(self, status: int, retry_after: int = 0):
+        self.consecutive_failures += 1
+        fails = self.consecutive_failures
 
-    def record_failure(self, api_name: str, status: int, retry_after: int = 0):
-        self._consecutive_failures[api_name] = self._consecutive_failures.get(api_name, 0) + 1
-        fails = self._consecutive_failures[api_name]
-        
         if status == 429:
              duration = COOLDOWN_FIRST_429 if fails == 1 else COOLDOWN_SUBSEQUENT_429
         else:
              duration = COOLDOWN_SERVER_ERROR
-             
+
         duration = max(duration, retry_after)
-        self._cooldowns[api_name] = time.time() + duration
-        log_error(f"API '{api_name}' failed ({status}). On cooldown for {duration}s (Failure #{fails})")
+        self.open_until = time.time() + duration
+        self.state = CIRCUIT_OPEN
+        self.probes_in_flight = 0
+        if status in (408, 429) or status >= 500:
+            self.limiter.on_congestion()
+        log_error(f"API '{self.name}' failed ({status}). Circuit open for {duration}s (Failure #{fails})")
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "open_until": self.open_until,
+            "consecutive_failures": self.consecutive_failures,
+            "concurrency_limit": round(self.limiter.limit, 2),
+            "in_flight": self.limiter.in_flight,
+        }
+
+
+class _ApiGuard:
+    def __init__(self):
+        self._guards: dict[str, _ProviderGuard] = {}
+
+    def get(self, api_name: str) -> _ProviderGuard:
+        guard = self._guards.get(api_name)
+        if guard is None:
+            guard = self._guards[api_name] = _ProviderGuard(api_name)
+        return guard
+
+    def is_open(self, api_name: str) -> bool:
+        return self.get(api_name).is_open()
 
     def record_success(self, api_name: str):
-        if api_name in self._consecutive_failures:
-            del self._consecutive_failures[api_name]
+        self.get(api_name).record_success()
+
+    def record_failure(self, api_name: str, status: int, retry_after: int = 0):
+        self.get(api_name).record_failure(status, retry_after)
+
+    def stats(self) -> dict:
+        return {name: guard.stats() for name, guard in self._guards.items()}
+
+_api_guard = _ApiGuard()
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.2, 0.35, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 8.0, 12.0, 20.0)
+HEDGE_MIN_SAMPLES = 20
 
-_api_cooldown = _ApiCooldownTracker()
+
+class _LatencyHistogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.total += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.total:
+            return None
+        rank = q * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+        return self.buckets[-1]
+
+
+_provider_latency: dict[str, _LatencyHistogram] = {}
+
+
+def _record_latency(api_name: str, seconds: float):
+    hist = _provider_latency.get(api_name)
+    if hist is None:
+        hist = _provider_latency[api_name] = _LatencyHistogram()
+    hist.observe(seconds)
+
+
+def get_provider_latency_stats() -> dict:
+    return {
+        name: {
+            "samples": hist.total,
+            "p50": hist.quantile(0.5),
+            "p95": hist.quantile(0.95),
+            "hedge_delay": _hedge_delay(name),
+        }
+        for name, hist in _provider_latency.items()
+    }
+
+
+def is_provider_open(api_name: str) -> bool:
+    return _api_guard.is_open(api_name)
+
+
+def get_provider_health() -> dict:
+    return _api_guard.stats()
+
+
+def _hedge_delay(api_name: str) -> float:
+    budget = config.hedge_delay_ms / 1000
+    hist = _provider_latency.get(api_name)
+    if hist is None or hist.total < HEDGE_MIN_SAMPLES:
+        return budget
+    return min(hist.quantile(config.hedge_quantile), budget)
 
 async def fetch_soterm_profile(uuid: str):
     url = f"https://api.soterm.workers.dev/v2/skyblock/profiles?uuid={uuid}"
     log_debug(f"Requesting profile data (soterm): {url}")
     try:
-        async with _SESSION.get(url, timeout=aiohttp.ClientTimeout(total=20)) as r:
+        async with _session_for("soterm").get(url) as r:
             if r.status == 200:
-                _api_cooldown.record_success("soterm")
+                _api_guard.record_success("soterm")
                 data = await r.json(loads=json_utils.loads)
                 if data:
                     data["_source"] = "soterm"
                     return data
             else:
                 retry_after = int(r.headers.get("Retry-After", 0))
-                _api_cooldown.record_failure("soterm", r.status, retry_after)
+                _api_guard.record_failure("soterm", r.status, retry_after)
     except asyncio.TimeoutError:
-        _api_cooldown.record_failure("soterm", 408)
+        _api_guard.record_failure("soterm", 408)
         log_error("Soterm profile request timed out")
     except Exception as e:
-        _api_cooldown.record_failure("soterm", 500)
+        _api_guard.record_failure("soterm", 500)
         log_error(f"Soterm profile request error: {e}")
     return None
 
@@ -182,21 +599,21 @@ async def fetch_soopy_profile(uuid: str):
     url = f"{SOOPY_BASE_URL}/{uuid}"
     log_debug(f"Requesting profile data (soopy.dev): {url}")
     try:
-        async with _SESSION.get(url, timeout=aiohttp.ClientTimeout(total=20)) as r:
+        async with _session_for("soopy").get(url) as r:
             if r.status == 200:
-                _api_cooldown.record_success("soopy")
+                _api_guard.record_success("soopy")
                 data = await r.json(loads=json_utils.loads)
                 if data.get("success") and data.get("data"):
                     return _normalize_soopy(data["data"], uuid)
                 log_error(f"soopy.dev returned success=false for {uuid}")
             else:
                 retry_after = int(r.headers.get("Retry-After", 0))
-                _api_cooldown.record_failure("soopy", r.status, retry_after)
+                _api_guard.record_failure("soopy", r.status, retry_after)
     except asyncio.TimeoutError:
-        _api_cooldown.record_failure("soopy", 408)
+        _api_guard.record_failure("soopy", 408)
         log_error("soopy.dev profile request timed out")
     except Exception as e:
-        _api_cooldown.record_failure("soopy", 500)
+        _api_guard.record_failure("soopy", 500)
         log_error(f"soopy.dev profile request error: {e}")
     return None
 
@@ -204,21 +621,21 @@ async def fetch_plain_dawn_profile(uuid: str):
     url = f"{PLAIN_DAWN_BASE_URL}/{uuid}"
     log_debug(f"Requesting profile data (PlainDawn): {url}")
     try:
-        async with _SESSION.get(url, timeout=aiohttp.ClientTimeout(total=20)) as r:
+        async with _session_for("plain_dawn").get(url) as r:
             if r.status == 200:
-                _api_cooldown.record_success("plain_dawn")
+                _api_guard.record_success("plain_dawn")
                 data = await r.json(loads=json_utils.loads)
                 if data:
                     data["_source"] = "plain_dawn"
                     return data
             else:
                 retry_after = int(r.headers.get("Retry-After", 0))
-                _api_cooldown.record_failure("plain_dawn", r.status, retry_after)
+                _api_guard.record_failure("plain_dawn", r.status, retry_after)
     except asyncio.TimeoutError:
-        _api_cooldown.record_failure("plain_dawn", 408)
+        _api_guard.record_failure("plain_dawn", 408)
         log_error("PlainDawn profile request timed out")
     except Exception as e:
-        _api_cooldown.record_failure("plain_dawn", 500)
+        _api_guard.record_failure("plain_dawn", 500)
         log_error(f"PlainDawn profile request error: {e}")
     return None
 async def fetch_adjectils_profile(uuid: str):
@@ -226,21 +643,21 @@ async def fetch_adjectils_profile(uuid: str):
     log_debug(f"Requesting profile data (adjectilsbackend): {url}")
     headers = {"X-Timestamp": str(int(time.time() * 1000))}
     try:
-        async with _SESSION.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=20)) as r:
+        async with _session_for("adjectils").get(url, headers=headers) as r:
             if r.status == 200:
-                _api_cooldown.record_success("adjectils")
+                _api_guard.record_success("adjectils")
                 data = await r.json(loads=json_utils.loads)
                 if data:
                     data["_source"] = "adjectils"
                     return data
             else:
                 retry_after = int(r.headers.get("Retry-After", 0))
-                _api_cooldown.record_failure("adjectils", r.status, retry_after)
+                _api_guard.record_failure("adjectils", r.status, retry_after)
     except asyncio.TimeoutError:
-        _api_cooldown.record_failure("adjectils", 408)
+        _api_guard.record_failure("adjectils", 408)
         log_error("Adjectils profile request timed out (15s)")
     except Exception as e:
-        _api_cooldown.record_failure("adjectils", 500)
+        _api_guard.record_failure("adjectils", 500)
         log_error(f"Adjectils profile request error: {e}")
     return None
 
@@ -254,21 +671,21 @@ async def fetch_skycrypt_shiiyu_profile(uuid: str):
     url = f"{SHIIYU_BASE_URL}/{ign}"
     log_debug(f"Requesting profile data (sky.shiiyu.moe): {url}")
     try:
-        async with _SESSION.get(url, timeout=aiohttp.ClientTimeout(total=20)) as r:
+        async with _session_for("skycrypt").get(url) as r:
             if r.status == 200:
-                _api_cooldown.record_success("skycrypt")
+                _api_guard.record_success("skycrypt")
                 data = await r.json(content_type=None)
                 if data and "profiles" in data:
                     data["_source"] = "skycrypt"
                     return data
             else:
                 retry_after = int(r.headers.get("Retry-After", 0))
-                _api_cooldown.record_failure("skycrypt", r.status, retry_after)
+                _api_guard.record_failure("skycrypt", r.status, retry_after)
     except asyncio.TimeoutError:
-        _api_cooldown.record_failure("skycrypt", 408)
+        _api_guard.record_failure("skycrypt", 408)
         log_error("sky.shiiyu.moe profile request timed out")
     except Exception as e:
-        _api_cooldown.record_failure("skycrypt", 500)
+        _api_guard.record_failure("skycrypt", 500)
         log_error(f"sky.shiiyu.moe profile request error: {e}")
     return None
 
@@ -285,9 +702,9 @@ async def fetch_hypixel_profile(uuid: str):
         "API-Key": HYPIXEL_API_KEY
     }
     try:
-        async with _SESSION.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=20)) as r:
+        async with _session_for("hypixel").get(url, headers=headers) as r:
             if r.status == 200:
-                _api_cooldown.record_success("hypixel")
+                _api_guard.record_success("hypixel")
                 data = await r.json(loads=json_utils.loads)
                 if data and data.get("success") and "profiles" in data:
                     data["_source"] = "hypixel"
@@ -296,12 +713,12 @@ async def fetch_hypixel_profile(uuid: str):
                     log_error(f"Hypixel API returned success=False or no profiles: {data}")
             else:
                 retry_after = int(r.headers.get("Retry-After", 0))
-                _api_cooldown.record_failure("hypixel", r.status, retry_after)
+                _api_guard.record_failure("hypixel", r.status, retry_after)
     except asyncio.TimeoutError:
-        _api_cooldown.record_failure("hypixel", 408)
+        _api_guard.record_failure("hypixel", 408)
         log_error("Hypixel API profile request timed out")
     except Exception as e:
-        _api_cooldown.record_failure("hypixel", 500)
+        _api_guard.record_failure("hypixel", 500)
         log_error(f"Hypixel API profile request error: {e}")
     return None
 
@@ -309,7 +726,7 @@ async def fetch_hypixel_profile(uuid: str):
 async def get_ign(uuid: str) -> Optional[str]:
     url = f"https://playerdb.co/api/player/minecraft/{uuid}"
     try:
-        async with _SESSION.get(url, timeout=aiohttp.ClientTimeout(total=10)) as r:
+        async with _session_for("playerdb").get(url) as r:
             if r.status == 200:
                 data = await r.json()
                 return data.get("data", {}).get("player", {}).get("username")
@@ -318,7 +735,7 @@ async def get_ign(uuid: str) -> Optional[str]:
     return None
 
 
-async def get_profile_data(uuid: str):
+async def get_profile_data(uuid: str, provider: Optional[str] = None):
     cached = await cache_get(uuid)
     if cached:
         log_debug(f"Using cached data for {uuid}")
@@ -328,32 +745,109 @@ async def get_profile_data(uuid: str):
         log_error(f"Invalid UUID format: {uuid}")
         return None
 
-    if not _SESSION:
-        await init_session()
+    def refresh():
+        return _single_flight(f"profile:{uuid}", lambda: _fetch_profile_data(uuid, provider))
 
-    result = None
+    stale = await cache_get_stale(uuid)
+    if stale:
+        log_debug(f"Serving stale data for {uuid} while revalidating")
+        revalidate(uuid, refresh)
+        return stale
+
+    return await refresh()
+
+
+async def _fetch_from_provider(api_name: str, uuid: str):
+    fetchers = {
+        "plain_dawn": fetch_plain_dawn_profile,
+        "soterm": fetch_soterm_profile,
+        "adjectils": fetch_adjectils_profile,
+        "soopy": fetch_soopy_profile,
+        "skycrypt": fetch_skycrypt_shiiyu_profile,
+        "hypixel": fetch_hypixel_profile,
+    }
+    fetcher = fetchers.get(api_name)
+    if fetcher is None:
+        return None
+
+    guard = _api_guard.get(api_name)
+    allowed, is_probe = guard.admit()
+    if not allowed:
+        log_debug(f"Skipping API '{api_name}' (circuit {guard.state})")
+        return None
+
+    acquired = False
+    try:
+        await guard.limiter.acquire()
+        acquired = True
+        started = time.perf_counter()
+        result = await fetcher(uuid)
+    finally:
+        guard.finish(is_probe)
+        if acquired:
+            await guard.limiter.release()
+
+    if result:
+        elapsed = time.perf_counter() - started
+        _record_latency(api_name, elapsed)
+        guard.limiter.on_latency(elapsed)
+    return result
+
+
+async def _fetch_profile_sequential(uuid: str, skip: Optional[str] = None):
     for api_name in config.api_priority:
-        if _api_cooldown.is_cooling_down(api_name):
-            log_debug(f"Skipping API '{api_name}' (on cooldown)")
+        if api_name == skip:
             continue
-
-        if api_name == "plain_dawn":
-            result = await fetch_plain_dawn_profile(uuid)
-        elif api_name == "soterm":
-            result = await fetch_soterm_profile(uuid)
-        elif api_name == "adjectils":
-            result = await fetch_adjectils_profile(uuid)
-        elif api_name == "soopy":
-            result = await fetch_soopy_profile(uuid)
-        elif api_name == "skycrypt":
-            result = await fetch_skycrypt_shiiyu_profile(uuid)
-        elif api_name == "hypixel":
-            result = await fetch_hypixel_profile(uuid)
-            
+        result = await _fetch_from_provider(api_name, uuid)
         if result:
-            break
+            return result
+    return None
+
+
+async def _fetch_profile_hedged(uuid: str, skip: Optional[str] = None):
+    candidates = [
+        api_name for api_name in config.api_priority
+        if api_name != skip and not _api_guard.is_open(api_name)
+    ]
+
+    pending = set()
+    next_index = 0
+    try:
+        while next_index < len(candidates) or pending:
+            timeout = None
+            if next_index < len(candidates):
+                api_name = candidates[next_index]
+                next_index += 1
+                if pending:
+                    log_debug(f"Hedging profile request for {uuid} with '{api_name}'")
+                pending.add(asyncio.ensure_future(_fetch_from_provider(api_name, uuid)))
+                timeout = _hedge_delay(api_name)
+
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None and task.result():
+                    return task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+    return None
+
+
+async def _fetch_profile_data(uuid: str, provider: Optional[str] = None):
+    if not _SESSION:
+        await init_session()
+
+    result = None
+    if provider:
+        result = await _fetch_from_provider(provider, uuid)
+    if not result:
+        if config.profile_fetch_mode == "hedged":
+            result = await _fetch_profile_hedged(uuid, skip=provider)
+        else:
+            result = await _fetch_profile_sequential(uuid, skip=provider)
 
     if result:
+        result = project_profile_data(result, uuid)
         await cache_set(uuid, result, ttl=config.profile_cache_ttl)
         return result
     
@@ -385,63 +879,52 @@ def _normalize_soopy(data: dict, uuid: str) -> dict:
     return {"profiles": profiles, "_source": "soopy"}
 
 
-def _parse_soopy_dungeon_stats(member: dict, player_data: dict = None) -> dict:
-    dungeons = member.get("dungeons", {})
-    cata_xp = float(dungeons.get("catacombs_xp", 0) or 0)
-
-    class_levels = dungeons.get("class_levels", {})
-    class_xp = {}
-    for cls in ["archer", "berserk", "healer", "mage", "tank"]:
-        cls_data = class_levels.get(cls, {})
-        class_xp[cls.capitalize()] = float((cls_data or {}).get("xp", 0) or 0)
-
-    floor_stats_raw = dungeons.get("floorStats", {})
-    floors = {}
-    floor_key_map = {
-        "e": "Entrance",
-        "f1": "F1", "f2": "F2", "f3": "F3", "f4": "F4",
-        "f5": "F5", "f6": "F6", "f7": "F7",
-        "m1": "M1", "m2": "M2", "m3": "M3", "m4": "M4",
-        "m5": "M5", "m6": "M6", "m7": "M7",
-    }
-    for raw_key, display_key in floor_key_map.items():
-        floor_data = floor_stats_raw.get(raw_key) or {}
-        completions = int(floor_data.get("completions") or 0)
-        s_raw = (floor_data.get("fastest_time_s") or {}).get("raw")
-        s_plus_raw = (floor_data.get("fastest_time_s_plus") or {}).get("raw")
-        floors[display_key] = {
-            "runs": completions,
-            "best_score": int(floor_data.get("best_score") or 0),
-            "fastest_s": int(s_raw) if isinstance(s_raw, (int, float)) and not isinstance(s_raw, bool) else 0,
-            "fastest_s_plus": int(s_plus_raw) if isinstance(s_plus_raw, (int, float)) and not isinstance(s_plus_raw, bool) else 0,
-        }
-
-    kills = member.get("kills", {})
-    blood_mob_kills = int((kills or {}).get("watcher_summon_undead", 0) or 0)
-    
-    secrets = -1
-    if player_data:
-        achievements = player_data.get("stats", {}).get("achievements", {}).get("skyblock", {})
-        secrets = achievements.get("dungeon_secrets", -1)
-
-    accessory_reforge = member.get("accessory_reforge", {})
-    magical_power = int((accessory_reforge or {}).get("highest_magical_power", 0) or 0)
-
+def _dungeon_stats_payload(snapshot: DungeonSnapshot) -> dict:
     return {
-        "catacombs": cata_xp,
-        "secrets": secrets,
-        "blood_mob_kills": blood_mob_kills,
-        "classes": class_xp,
-        "floors": floors,
-        "magical_power": magical_power,
+        "catacombs": snapshot.catacombs_xp,
+        "secrets": snapshot.secrets,
+        "blood_mob_kills": snapshot.blood_mob_kills,
+        "classes": {cls.capitalize(): xp for cls, xp in snapshot.class_xp.items()},
+        "floors": snapshot.floors,
+        "magical_power": snapshot.magical_power,
         "accessory_bag_storage": {
-            "highest_magical_power": magical_power
+            "highest_magical_power": snapshot.magical_power
         }
     }
 
 
+def _parse_soopy_dungeon_stats(member: dict, player_data: dict = None) -> dict:
+    snapshot = DungeonSnapshot.from_soopy(member, player_data)
+    return _dungeon_stats_payload(snapshot)
+
+
+async def _get_skycrypt_section(uuid: str, profile_id: str) -> Optional[dict]:
+    cache_key = f"skycrypt_section:{uuid}:{profile_id}"
+    cached = await cache_get(cache_key)
+    if cached:
+        return cached
+
+    from services.skycrypt_service import fetch_dungeon_sections
+    stats = (await fetch_dungeon_sections(uuid, [profile_id])).get(profile_id)
+    if stats:
+        await cache_set(cache_key, stats, ttl=config.profile_cache_ttl)
+    return stats
+
+
+async def _detailed_snapshot(source: Optional[str], profile: dict, uuid: str) -> Optional[DungeonSnapshot]:
+    if source == "skycrypt" and profile.get("profile_id"):
+        stats = await _get_skycrypt_section(uuid, profile["profile_id"])
+        if stats:
+            return DungeonSnapshot.from_skycrypt(stats)
+
+    snapshot = snapshot_for(profile, uuid)
+    if snapshot is not None and snapshot.source == "soopy":
+        snapshot = snapshot.with_player_data(await get_soopy_player_data(uuid))
+    return snapshot
+
 
-async def _load_prices_from_disk() -> Optional[dict]:
+
+async def _load_prices_from_disk() -> Optional[tuple]:
     if not os.path.exists(PRICES_CACHE_FILE):
         return None
     try:
@@ -449,12 +932,13 @@ async def _load_prices_from_disk() -> Optional[dict]:
             content = await f.read()
         data = json_utils.loads(content)
         fetched_at = data.get("_fetched_at", 0)
-        if time.time() - fetched_at > config.prices_cache_ttl:
+        age = time.time() - fetched_at
+        if age > config.prices_cache_ttl + config.prices_stale_grace:
             log_info("Prices cache file is expired, will re-fetch.")
             return None
-        log_info(f"Loaded prices from disk (age: {int(time.time() - fetched_at)}s).")
+        log_info(f"Loaded prices from disk (age: {int(age)}s).")
         prices = {k: v for k, v in data.items() if k != "_fetched_at"}
-        return prices
+        return prices, fetched_at
     except Exception as e:
         log_error(f"Failed to load prices from disk: {e}")
         return None
@@ -480,7 +964,7 @@ async def _fetch_bazaar_prices() -> dict:
     if not _SESSION:
         await init_session()
     try:
-        async with _SESSION.get(url, timeout=aiohttp.ClientTimeout(total=10)) as r:
+        async with _session_for("hypixel").get(url) as r:
             if r.status != 200:
                 log_error(f"Bazaar request failed ({r.status})")
                 return {}
@@ -501,7 +985,7 @@ async def _fetch_ah_prices() -> dict:
     if not _SESSION:
         await init_session()
     try:
-        async with _SESSION.get(url, timeout=aiohttp.ClientTimeout(total=10)) as r:
+        async with _session_for("moulberry").get(url) as r:
             if r.status != 200:
                 log_error(f"AH request failed ({r.status})")
                 return {}
@@ -520,7 +1004,7 @@ async def get_player_discord(uuid: str) -> Optional[str]:
     url = f"{ADJECTILS_BASE_URL}/v2/player?uuid={uuid}"
     headers = {"X-Timestamp": str(int(time.time() * 1000))}
     try:
-        async with _SESSION.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=10)) as r:
+        async with _session_for("adjectils").get(url, headers=headers) as r:
             if r.status != 200:
                 log_error(f"Player request failed ({r.status})")
                 return None
@@ -538,7 +1022,7 @@ async def get_player_discord(uuid: str) -> Optional[str]:
 
 async def fetch_special_price(session, key, url):
     try:
-        async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as r:
+        async with session.get(url) as r:
             if r.status == 200:
                 data = await r.json(loads=json_utils.loads)
                 price = data.get("median", data.get("min", 0))
@@ -552,29 +1036,18 @@ async def get_special_prices() -> dict:
     if not _SESSION:
         await init_session()
     tasks = [
-        fetch_special_price(_SESSION, "SHINY_NECRON_HANDLE",
+        fetch_special_price(_session_for("coflnet"), "SHINY_NECRON_HANDLE",
             "https://sky.coflnet.com/api/item/price/NECRON_HANDLE?IsShiny=true"),
-        fetch_special_price(_SESSION, SKELETON_MASTER_CHESTPLATE_50,
+        fetch_special_price(_session_for("coflnet"), SKELETON_MASTER_CHESTPLATE_50,
             "https://sky.coflnet.com/api/item/price/SKELETON_MASTER_CHESTPLATE?ItemTier=10-10&NoOtherValuableEnchants=true&BaseStatBoost=50"),
     ]
     results = await asyncio.gather(*tasks)
     return {k: v for k, v in results if v is not None}
 
 
-async def get_all_prices() -> dict:
+async def _refresh_prices() -> dict:
     global _prices_memory, _prices_fetched_at
 
-    if _prices_memory is not None:
-        age = time.time() - _prices_fetched_at
-        if age < config.prices_cache_ttl:
-            return _prices_memory
-
-    from_disk = await _load_prices_from_disk()
-    if from_disk is not None:
-        _prices_memory = from_disk
-        _prices_fetched_at = time.time()
-        return _prices_memory
-
     bz, ah, special = await asyncio.gather(
         _fetch_bazaar_prices(),
         _fetch_ah_prices(),
@@ -592,13 +1065,33 @@ async def get_all_prices() -> dict:
     return prices
 
 
+async def get_all_prices() -> dict:
+    global _prices_memory, _prices_fetched_at
+
+    if _prices_memory is None:
+        from_disk = await _load_prices_from_disk()
+        if from_disk is not None:
+            _prices_memory, _prices_fetched_at = from_disk
+
+    if _prices_memory is not None:
+        age = time.time() - _prices_fetched_at
+        if age < config.prices_cache_ttl:
+            return _prices_memory
+        if age < config.prices_cache_ttl + config.prices_stale_grace:
+            log_debug("Serving stale prices while revalidating")
+            revalidate("prices", lambda: _single_flight("prices", _refresh_prices))
+            return _prices_memory
+
+    return await _single_flight("prices", _refresh_prices)
+
+
 def get_prices_expiry() -> float:
     if not os.path.exists(PRICES_CACHE_FILE):
         return 0.0
     return os.path.getmtime(PRICES_CACHE_FILE) + config.prices_cache_ttl
 
 
-def _select_member(profile_data, uuid, profile_name=None):
+def _select_profile(profile_data, profile_name=None):
     profiles = profile_data.get("profiles")
     if not profiles:
         return None
@@ -610,105 +1103,66 @@ def _select_member(profile_data, uuid, profile_name=None):
 
     if not profile:
         profile = next((p for p in profiles if p.get("selected")), profiles[0])
+    return profile
+
+
+def _select_member(profile_data, uuid, profile_name=None):
+    profile = _select_profile(profile_data, profile_name)
+    if profile is None:
+        return None
 
     uuid_no_dashes = uuid.replace("-", "")
     members = profile.get("members", {})
     return members.get(uuid) or members.get(uuid_no_dashes) or {}
 
+
+def _select_snapshot(profile_data, uuid, profile_name=None) -> Optional[DungeonSnapshot]:
+    profile = _select_profile(profile_data, profile_name)
+    if profile is None:
+        return None
+    return snapshot_for(profile, uuid)
+
+
+FLOOR_NAMES = {
+    "1": "Floor 1 (Bonzo)", "2": "Floor 2 (Scarf)",
+    "3": "Floor 3 (Professor)", "4": "Floor 4 (Thorn)",
+    "5": "Floor 5 (Livid)", "6": "Floor 6 (Sadan)",
+    "7": "Floor 7 (Necron)",
+}
+
+
 async def get_dungeon_runs(uuid: str, profile_name: str = None):
     profile_data = await get_profile_data(uuid)
     if not profile_data:
         return {}
 
-    member = _select_member(profile_data, uuid, profile_name)
-    if not member:
+    snapshot = _select_snapshot(profile_data, uuid, profile_name)
+    if not snapshot:
         return {}
 
-    dungeons = member.get("dungeons", {})
-
-    if "floorStats" in dungeons:
-        floor_stats = dungeons.get("floorStats", {})
-        tier_to_floor_soopy = {
-            "f1": "Floor 1 (Bonzo)", "f2": "Floor 2 (Scarf)",
-            "f3": "Floor 3 (Professor)", "f4": "Floor 4 (Thorn)",
-            "f5": "Floor 5 (Livid)", "f6": "Floor 6 (Sadan)",
-            "f7": "Floor 7 (Necron)",
-        }
-        run_counts = {}
-        for floor_key, floor_name in tier_to_floor_soopy.items():
-            normal_runs = int((floor_stats.get(floor_key) or {}).get("completions", 0) or 0)
-            master_key = floor_key.replace("f", "m")
-            master_runs = int((floor_stats.get(master_key) or {}).get("completions", 0) or 0)
-            run_counts[floor_name] = {"normal": normal_runs, "master": master_runs}
-        return run_counts
-
-    catacombs_data = dungeons.get("dungeon_types", {}).get("catacombs", {})
-    master_catacombs_data = dungeons.get("dungeon_types", {}).get("master_catacombs", {})
-    master_completions = master_catacombs_data.get("tier_completions", {})
-    normal_completions = catacombs_data.get("tier_completions", {})
-
-    tier_to_floor = {
-        "1": "Floor 1 (Bonzo)", "2": "Floor 2 (Scarf)",
-        "3": "Floor 3 (Professor)", "4": "Floor 4 (Thorn)",
-        "5": "Floor 5 (Livid)", "6": "Floor 6 (Sadan)",
-        "7": "Floor 7 (Necron)",
-    }
     run_counts = {}
-    for tier_key, floor_name in tier_to_floor.items():
-        master_runs = int(master_completions.get(tier_key, 0))
-        normal_runs = int(normal_completions.get(tier_key, 0))
+    for tier_key, floor_name in FLOOR_NAMES.items():
+        normal_runs = int(snapshot.normal_runs.get(tier_key, 0) or 0)
+        master_runs = int(snapshot.master_runs.get(tier_key, 0) or 0)
         run_counts[floor_name] = {"normal": normal_runs, "master": master_runs}
 
     log_debug(f"Fetched run counts for {uuid}: {run_counts}")
     return run_counts
 
 
-async def get_dungeon_xp(uuid: str, profile_name: str = None):
-    profile_data = await get_profile_data(uuid)
+async def get_dungeon_xp(uuid: str, profile_name: str = None, provider: Optional[str] = None):
+    profile_data = await get_profile_data(uuid, provider=provider)
     if not profile_data:
         return None
 
-    member = _select_member(profile_data, uuid, profile_name)
-    if not member:
+    snapshot = _select_snapshot(profile_data, uuid, profile_name)
+    if not snapshot:
         return None
 
-    dungeons = member.get("dungeons", {})
-
-    if "catacombs_xp" in dungeons:
-        class_levels = dungeons.get("class_levels", {})
-        class_xp = {
-            cls: float((class_levels.get(cls) or {}).get("xp", 0) or 0)
-            for cls in ["archer", "berserk", "healer", "mage", "tank"]
-        }
-        floor_stats = dungeons.get("floorStats", {})
-        normal_runs = {
-            str(i): int((floor_stats.get(f"f{i}") or {}).get("completions", 0) or 0)
-            for i in range(1, 8)
-        }
-        master_runs = {
-            str(i): int((floor_stats.get(f"m{i}") or {}).get("completions", 0) or 0)
-            for i in range(1, 8)
-        }
-        return {
-            "catacombs": float(dungeons.get("catacombs_xp", 0) or 0),
-            "classes": class_xp,
-            "runs": {"normal": normal_runs, "master": master_runs},
-        }
-
-    catacombs = dungeons.get("dungeon_types", {}).get("catacombs", {})
-    master_catacombs = dungeons.get("dungeon_types", {}).get("master_catacombs", {})
-    cata_xp = float(catacombs.get("experience", 0))
-    normal_runs = catacombs.get("tier_completions", {})
-    master_runs = master_catacombs.get("tier_completions", {})
-    classes = dungeons.get("player_classes", {})
-    class_xp = {
-        cls: float((classes.get(cls) or {}).get("experience", 0))
-        for cls in ["archer", "berserk", "healer", "mage", "tank"]
-    }
     return {
-        "catacombs": cata_xp,
-        "classes": class_xp,
-        "runs": {"normal": normal_runs, "master": master_runs},
+        "catacombs": snapshot.catacombs_xp,
+        "classes": dict(snapshot.class_xp),
+        "runs": {"normal": snapshot.normal_runs, "master": snapshot.master_runs},
     }
 
 
@@ -717,101 +1171,23 @@ async def get_dungeon_stats(uuid: str, profile_name: str = None):
     if not profile_data:
         return None
 
-    member = _select_member(profile_data, uuid, profile_name)
-    if not member:
+    profile = _select_profile(profile_data, profile_name)
+    if profile is None:
         return None
 
-    dungeons = member.get("dungeons", {})
-
-    if profile_data.get("_source") == "skycrypt":
-        from services.skycrypt_service import get_dungeon_stats_skycrypt
-        ign = await get_ign(uuid)
-        if ign:
-            return await get_dungeon_stats_skycrypt(ign, profile_name)
-
-    if profile_data.get("_source") == "soopy" or "catacombs_xp" in dungeons:
-        player_data = await get_soopy_player_data(uuid)
-        return _parse_soopy_dungeon_stats(member, player_data)
-
-
-    catacombs = dungeons.get("dungeon_types", {}).get("catacombs", {})
-    master_catacombs = dungeons.get("dungeon_types", {}).get("master_catacombs", {})
-
-    cata_xp = float(catacombs.get("experience", 0))
-
-    secrets = int(dungeons.get("secrets", 0))
-    if secrets == 0:
-        secrets = int(member.get("achievements", {}).get("skyblock_treasure_hunter", 0))
-
-    player_classes = dungeons.get("player_classes", {})
-    class_xp = {}
-    for cls in ["archer", "berserk", "healer", "mage", "tank"]:
-        cls_data = player_classes.get(cls, {})
-        class_xp[cls.capitalize()] = float(cls_data.get("experience", 0))
-
-    player_stats = member.get("player_stats", {})
-    kills = player_stats.get("kills", {})
-    blood_mob_kills = kills.get("watcher_summon_undead", 0)
-
-    accessory_bag = member.get("accessory_bag_storage", {})
-    magical_power = int((accessory_bag or {}).get("highest_magical_power", 0) or 0)
-
-    floors = {}
-
-    def process_tier(tier_data, prefix="F"):
-        times_s_plus = tier_data.get("fastest_time_s_plus", {})
-        times_s = tier_data.get("fastest_time_s", {})
-        runs = tier_data.get("tier_completions", {})
-        best_score = tier_data.get("best_score", {})
-
-        for tier in runs.keys():
-            if tier == "total":
-                continue
-            if tier == "0":
-                floor_name = "Entrance" if prefix == "F" else "M0"
-            else:
-                floor_name = f"{prefix}{tier}"
-
-            ms_s_plus = times_s_plus.get(tier, 0)
-            ms_s = times_s.get(tier, 0)
-            score = best_score.get(tier, 0)
-            count = runs.get(tier, 0)
-
-            floors[floor_name] = {
-                "runs": count,
-                "best_score": score,
-                "fastest_s_plus": ms_s_plus,
-                "fastest_s": ms_s,
-            }
+    snapshot = await _detailed_snapshot(profile_data.get("_source"), profile, uuid)
+    if not snapshot:
+        return None
 
-    process_tier(catacombs, "F")
-    process_tier(master_catacombs, "M")
-
-    return {
-        "catacombs": cata_xp,
-        "secrets": secrets,
-        "blood_mob_kills": blood_mob_kills,
-        "classes": class_xp,
-        "floors": floors,
-        "magical_power": magical_power,
-        "accessory_bag_storage": {
-            "highest_magical_power": magical_power
-        }
-    }
+    return _dungeon_stats_payload(snapshot)
 
 async def get_recent_runs(uuid: str, profile_name: str = None):
     profile_data = await get_profile_data(uuid)
     if not profile_data:
         return []
 
-    member = _select_member(profile_data, uuid, profile_name)
-    if not member:
+    snapshot = _select_snapshot(profile_data, uuid, profile_name)
+    if not snapshot:
         return []
 
-    dungeons = member.get("dungeons", {})
-
-    if isinstance(dungeons.get("treasures"), list):
-        return dungeons.get("treasures", [])
-
-    treasures = dungeons.get("treasures", {})
-    return treasures.get("runs", [])
+    return snapshot.recent_runs
@@ -0,0 +1,84 @@
+import ipaddress
+from typing import List, Optional, Union
+
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+Address = Union[ipaddress.IPv4Address, ipaddress.IPv6Address]
+
+
+def parse_network(value: str) -> Optional[Network]:
+    try:
+        return ipaddress.ip_network(str(value).strip(), strict=False)
+    except ValueError:
+        return None
+
+
+def network_key(network: Network) -> str:
+    if network.prefixlen == network.max_prefixlen:
+        return str(network.network_address)
+    return str(network)
+
+
+class BanIndex:
+    def __init__(self):
+        self._roots = {4: [None, None, None], 6: [None, None, None]}
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def clear(self):
+        self._roots = {4: [None, None, None], 6: [None, None, None]}
+        self.size = 0
+
+    def insert(self, network: Network, key: str):
+        node = self._roots[network.version]
+        bits = int(network.network_address)
+        width = network.max_prefixlen
+        for depth in range(network.prefixlen):
+            bit = (bits >> (width - 1 - depth)) & 1
+            child = node[bit]
+            if child is None:
+                child = node[bit] = [None, None, None]
+            node = child
+        if node[2] is None:
+            self.size += 1
+        node[2] = key
+
+    def remove(self, network: Network) -> bool:
+        node = self._roots[network.version]
+        bits = int(network.network_address)
+        width = network.max_prefixlen
+        path = []
+        for depth in range(network.prefixlen):
+            bit = (bits >> (width - 1 - depth)) & 1
+            child = node[bit]
+            if child is None:
+                return False
+            path.append((node, bit))
+            node = child
+        if node[2] is None:
+            return False
+        node[2] = None
+        self.size -= 1
+        for parent, bit in reversed(path):
+            child = parent[bit]
+            if child[0] is not None or child[1] is not None or child[2] is not None:
+                break
+            parent[bit] = None
+        return True
+
+    def lookup(self, address: Address) -> List[str]:
+        node = self._roots[address.version]
+        bits = int(address)
+        width = address.max_prefixlen
+        matches = []
+        depth = 0
+        while node is not None:
+            if node[2] is not None:
+                matches.append(node[2])
+            if depth == width:
+                break
+            node = node[(bits >> (width - 1 - depth)) & 1]
+            depth += 1
+        matches.reverse()
+        return matches
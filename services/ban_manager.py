@@ -1,75 +1,188 @@
 from services import json_utils as json
+import asyncio
+import ipaddress
 import os
+import re
 import time
 import aiofiles
-from typing import Dict, Optional, List
+from typing import Dict, Optional
 from core.logger import log_info, log_error
+from services.ban_index import BanIndex, parse_network, network_key
 
 BANS_FILE = "data/ip_bans.json"
+BANS_JOURNAL_FILE = "data/ip_bans.journal"
+COMPACT_AFTER_OPS = 256
+
+_DURATION_PATTERN = re.compile(r"^\s*(\d+)\s*([smhdw]?)\s*$", re.IGNORECASE)
+_DURATION_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def parse_duration(value: str) -> Optional[int]:
+    match = _DURATION_PATTERN.match(value or "")
+    if not match:
+        return None
+    return int(match.group(1)) * _DURATION_UNITS[match.group(2).lower()]
+
+
+def _expired(entry: dict, now: float) -> bool:
+    expires_at = entry.get("expires_at")
+    return bool(expires_at) and expires_at <= now
 
 
 class BanManager:
-    def __init__(self):
+    def __init__(self, path: str = BANS_FILE, journal_path: str = BANS_JOURNAL_FILE):
+        self.path = path
+        self.journal_path = journal_path
         self.bans: Dict[str, dict] = {}
+        self.index = BanIndex()
+        self.journal_ops = 0
+        self._lock = asyncio.Lock()
 
     async def initialize(self):
         await self.load_bans()
 
     async def load_bans(self):
-        if not os.path.exists(BANS_FILE):
-            self.bans = {}
-            if not os.path.exists("data"):
-                os.makedirs("data")
-            async with aiofiles.open(BANS_FILE, json.get_write_mode()) as f:
-                await f.write(json.dumps({}, indent=4))
+        self.bans = {}
+        self.index.clear()
+        self.journal_ops = 0
+        if not os.path.exists(self.path):
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            async with aiofiles.open(self.path, json.get_write_mode()) as f:
+                await f.write(json.dumps({}))
             log_info("No IP bans file found, created empty one.")
-            return
+        else:
+            try:
+                async with aiofiles.open(self.path, json.get_read_mode()) as f:
+                    self.bans = json.loads(await f.read())
+            except Exception as e:
+                log_error(f"Failed to load IP bans: {e}")
+                self.bans = {}
 
-        try:
-            async with aiofiles.open(BANS_FILE, json.get_read_mode()) as f:
+        if os.path.exists(self.journal_path):
+            async with aiofiles.open(self.journal_path, "rb") as f:
                 content = await f.read()
-                self.bans = json.loads(content)
-            log_info(f"Loaded {len(self.bans)} IP bans.")
-        except Exception as e:
-            log_error(f"Failed to load IP bans: {e}")
-            self.bans = {}
+            for line in content.splitlines():
+                try:
+                    self._apply(json.loads(line))
+                except Exception:
+                    log_error(f"Skipping corrupt IP ban journal record in {self.journal_path}")
+                    continue
+                self.journal_ops += 1
+
+        for key in list(self.bans):
+            network = parse_network(key)
+            if network is None:
+                log_error(f"IP ban entry '{key}' is not a valid address or CIDR, matching it exactly.")
+                continue
+            self.index.insert(network, key)
+
+        if self.purge_expired() or self.journal_ops >= COMPACT_AFTER_OPS:
+            await self.compact()
+        log_info(f"Loaded {len(self.bans)} IP bans.")
+
+    def _apply(self, record: dict):
+        if record["op"] == "ban":
+            self.bans[record["key"]] = record["entry"]
+        elif record["op"] == "unban":
+            self.bans.pop(record["key"], None)
+
+    def _remove(self, key: str):
+        self.bans.pop(key, None)
+        network = parse_network(key)
+        if network is not None:
+            self.index.remove(network)
+
+    async def _append(self, record: dict):
+        async with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.journal_path) or ".", exist_ok=True)
+                async with aiofiles.open(self.journal_path, "ab") as f:
+                    await f.write(json.dumps(record) + b"\n")
+                self.journal_ops += 1
+            except Exception as e:
+                log_error(f"Failed to append IP ban journal: {e}")
+        if self.journal_ops >= COMPACT_AFTER_OPS:
+            await self.compact()
+
+    async def compact(self):
+        async with self._lock:
+            temp_path = self.path + ".tmp"
+            try:
+                async with aiofiles.open(temp_path, json.get_write_mode()) as f:
+                    await f.write(json.dumps(self.bans))
+                os.replace(temp_path, self.path)
+                if os.path.exists(self.journal_path):
+                    os.remove(self.journal_path)
+                self.journal_ops = 0
+            except Exception as e:
+                log_error(f"Failed to save IP bans: {e}")
 
     async def save_bans(self):
-        try:
-            async with aiofiles.open(BANS_FILE, json.get_write_mode()) as f:
-                await f.write(json.dumps(self.bans, indent=4))
-        except Exception as e:
-            log_error(f"Failed to save IP bans: {e}")
+        await self.compact()
 
     def is_banned(self, ip: str) -> bool:
-        return ip in self.bans
+        return self.get_ban(ip) is not None
 
     def get_ban(self, ip: str) -> Optional[dict]:
-        return self.bans.get(ip)
+        now = time.time()
+        entry = self.bans.get(ip)
+        if entry is not None and not _expired(entry, now):
+            return entry
+        if not self.index.size:
+            return None
+
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return None
+        for key in self.index.lookup(address):
+            entry = self.bans.get(key)
+            if entry is not None and not _expired(entry, now):
+                return entry
+        return None
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        expired = [key for key, entry in self.bans.items() if _expired(entry, now)]
+        for key in expired:
+            self._remove(key)
+        return len(expired)
 
     def get_all(self) -> Dict[str, dict]:
-        return self.bans
+        now = time.time()
+        return {key: entry for key, entry in self.bans.items() if not _expired(entry, now)}
 
-    async def ban(self, ip: str, reason: str, banned_by: int) -> bool:
-        ip = ip.strip()
-        if not ip:
+    async def ban(self, ip: str, reason: str, banned_by: int, duration: Optional[int] = None) -> bool:
+        network = parse_network(ip)
+        if network is None:
             return False
-        self.bans[ip] = {
+
+        key = network_key(network)
+        now = int(time.time())
+        entry = {
             "reason": reason or "No reason provided",
             "banned_by": str(banned_by),
-            "banned_at": int(time.time()),
+            "banned_at": now,
         }
-        await self.save_bans()
-        log_info(f"IP banned: {ip} by {banned_by} (reason: {reason})")
+        if duration:
+            entry["expires_at"] = now + int(duration)
+
+        self.purge_expired()
+        self.bans[key] = entry
+        self.index.insert(network, key)
+        await self._append({"op": "ban", "key": key, "entry": entry})
+        log_info(f"IP banned: {key} by {banned_by} (reason: {reason})")
         return True
 
     async def unban(self, ip: str) -> bool:
         ip = ip.strip()
-        if ip not in self.bans:
+        network = parse_network(ip)
+        key = network_key(network) if network is not None else ip
+        if key not in self.bans:
             return False
-        del self.bans[ip]
-        await self.save_bans()
-        log_info(f"IP unbanned: {ip}")
+        self._remove(key)
+        await self._append({"op": "unban", "key": key})
+        log_info(f"IP unbanned: {key}")
         return True
 
 
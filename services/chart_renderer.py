@@ -0,0 +1,153 @@
+import io
+import math
+import os
+from typing import List, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+BACKGROUND = (0x2b, 0x2d, 0x31)
+TEXT_COLOR = (255, 255, 255)
+TRACK_COLOR = (0x40, 0x44, 0x4b)
+GRID_ALPHA = 0.1
+BAR_HEIGHT = 0.6
+PANEL_PADDING = 16
+TITLE_GAP = 14
+TICK_TARGET = 6
+
+_FONT_CACHE = {}
+
+
+def _font_candidates(bold: bool) -> List[str]:
+    names = ["DejaVuSans-Bold.ttf", "arialbd.ttf", "Arial Bold.ttf"] if bold else ["DejaVuSans.ttf", "arial.ttf", "Arial.ttf"]
+    try:
+        import matplotlib
+        names.append(os.path.join(matplotlib.get_data_path(), "fonts", "ttf", names[0]))
+    except ImportError:
+        pass
+    return names
+
+
+def _font(size: int, bold: bool = False) -> ImageFont.ImageFont:
+    key = (size, bold)
+    font = _FONT_CACHE.get(key)
+    if font is None:
+        for name in _font_candidates(bold):
+            try:
+                font = ImageFont.truetype(name, size)
+                break
+            except OSError:
+                continue
+        else:
+            font = ImageFont.load_default()
+        _FONT_CACHE[key] = font
+    return font
+
+
+def _hex(color) -> Tuple[int, int, int]:
+    if isinstance(color, tuple):
+        return color
+    color = color.lstrip("#")
+    return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def _blend(color, alpha: float) -> Tuple[int, int, int]:
+    return tuple(round(b + (c - b) * alpha) for c, b in zip(color, BACKGROUND))
+
+
+def _text_size(draw: ImageDraw.ImageDraw, text: str, font) -> Tuple[int, int]:
+    left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+    return right - left, bottom - top
+
+
+def nice_ticks(xmax: float, target: int = TICK_TARGET) -> List[float]:
+    if xmax <= 0:
+        return [0]
+    raw = xmax / target
+    magnitude = 10 ** math.floor(math.log10(raw))
+    step = next(m * magnitude for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw)
+    return [i * step for i in range(int(xmax // step) + 1)]
+
+
+def _tick_label(value: float) -> str:
+    if value == int(value):
+        return f"{int(value):,}"
+    return f"{value:g}"
+
+
+def _draw_panel(draw: ImageDraw.ImageDraw, box: Tuple[int, int, int, int], panel: dict):
+    x0, y0, x1, y1 = box
+    title_font = _font(16, bold=True)
+    label_font = _font(12)
+    value_font = _font(12, bold=True)
+
+    title = panel.get("title", "")
+    tw, th = _text_size(draw, title, title_font)
+    draw.text(((x0 + x1 - tw) / 2, y0), title, fill=TEXT_COLOR, font=title_font)
+    top = y0 + th + TITLE_GAP
+
+    labels = panel.get("labels", [])
+    values = panel.get("values", [])
+    if not labels:
+        text = panel.get("empty_text", "No Data")
+        ew, eh = _text_size(draw, text, label_font)
+        draw.text(((x0 + x1 - ew) / 2, (top + y1 - eh) / 2), text, fill=TEXT_COLOR, font=label_font)
+        return
+
+    xlabel = panel.get("xlabel")
+    _, tick_h = _text_size(draw, "0", label_font)
+    bottom = y1 - tick_h - 8 - (tick_h + 8 if xlabel else 0)
+    left = x0 + max(_text_size(draw, label, label_font)[0] for label in labels) + 10
+    texts = panel.get("texts") or [("", TEXT_COLOR)] * len(values)
+    right = x1 - max(_text_size(draw, text, value_font)[0] for text, _ in texts) - 12
+
+    xmax = panel.get("xmax") or (max(values) * 1.05 if values and max(values) > 0 else 1)
+    scale = (right - left) / xmax
+
+    grid = _blend(TEXT_COLOR, GRID_ALPHA)
+    for tick in nice_ticks(xmax):
+        x = left + tick * scale
+        draw.line([(x, top), (x, bottom)], fill=grid)
+        draw.line([(x, bottom), (x, bottom + 4)], fill=TEXT_COLOR)
+        label = _tick_label(tick)
+        lw, _ = _text_size(draw, label, label_font)
+        draw.text((x - lw / 2, bottom + 6), label, fill=TEXT_COLOR, font=label_font)
+
+    if xlabel:
+        xw, _ = _text_size(draw, xlabel, value_font)
+        draw.text(((left + right - xw) / 2, bottom + tick_h + 14), xlabel, fill=TEXT_COLOR, font=value_font)
+
+    row_h = (bottom - top) / len(labels)
+    bar_h = row_h * BAR_HEIGHT
+    colors = panel.get("colors", [])
+    track = panel.get("track")
+    for i, (label, value) in enumerate(zip(labels, values)):
+        cy = bottom - row_h * (i + 0.5)
+        if track is not None:
+            draw.rectangle([left, cy - bar_h / 2, left + track * scale, cy + bar_h / 2], fill=TRACK_COLOR)
+        if value > 0:
+            draw.rectangle([left, cy - bar_h / 2, left + min(value, xmax) * scale, cy + bar_h / 2],
+                           fill=_hex(colors[i]) if i < len(colors) else TEXT_COLOR)
+
+        lw, lh = _text_size(draw, label, label_font)
+        draw.text((left - lw - 8, cy - lh / 2 - 2), label, fill=TEXT_COLOR, font=label_font)
+
+        text, color = texts[i]
+        if text:
+            _, vh = _text_size(draw, text, value_font)
+            draw.text((left + max(min(value, xmax), 0) * scale + 6, cy - vh / 2 - 2), text, fill=_hex(color), font=value_font)
+
+    draw.line([(left, top), (left, bottom)], fill=TEXT_COLOR)
+    draw.line([(left, bottom), (right, bottom)], fill=TEXT_COLOR)
+
+
+def render_bar_panels(panels: List[dict], width: int, height: int) -> bytes:
+    image = Image.new("RGB", (width, height), BACKGROUND)
+    draw = ImageDraw.Draw(image)
+    panel_w = (width - PANEL_PADDING * (len(panels) + 1)) / len(panels)
+    for i, panel in enumerate(panels):
+        x0 = PANEL_PADDING + i * (panel_w + PANEL_PADDING)
+        _draw_panel(draw, (int(x0), PANEL_PADDING, int(x0 + panel_w), height - PANEL_PADDING), panel)
+
+    buf = io.BytesIO()
+    image.save(buf, format="PNG", optimize=False, compress_level=3)
+    return buf.getvalue()
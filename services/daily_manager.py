@@ -7,13 +7,29 @@ from typing import Dict, List, Optional, Tuple
 from core.logger import log_info, log_error, log_debug
 from core.config import config
 from services.xp_calculations import get_dungeon_level
-from services.api import get_uuid, get_dungeon_xp
+from services.api import get_uuids, get_dungeon_xp, is_provider_open
+from services.update_scheduler import ProviderBudget
+from services.leaderboard_index import LeaderboardIndex
+from services.xp_history import XpHistory
+from services.sharded_store import ShardedStore
 from datetime import timedelta
 import asyncio
+import heapq
 import random
-from services.xp_calculations import get_dungeon_level, get_class_average
+from services.xp_calculations import get_dungeon_level, get_class_average, levels_for
 
 DAILY_DATA_FILE = "data/daily_data.json"
+XP_HISTORY_DIR = "data/xp_history"
+DAILY_DATA_DIR = "data/daily"
+USER_KEYS = ("users", "current_xp", "daily_snapshots", "monthly_snapshots", "activity")
+META_KEYS = ("last_daily_reset", "last_monthly_reset", "last_updated", "update_progress")
+UPDATE_CHECKPOINT_EVERY = 50
+UPDATE_PROGRESS_INTERVAL = 3
+REFRESH_INTERVAL_ACTIVE = 2 * 3600
+REFRESH_INTERVAL_RECENT = 6 * 3600
+REFRESH_INTERVAL_IDLE = 24 * 3600
+REFRESH_INTERVAL_DORMANT = 72 * 3600
+RESET_BOUNDARY_WINDOW = 2 * 3600
 
 
 
@@ -26,8 +42,14 @@ class DailyManager:
             "current_xp": {},
             "last_daily_reset": 0,
             "last_monthly_reset": 0,
-            "last_updated": 0
+            "last_updated": 0,
+            "update_progress": None,
+            "activity": {}
         }
+        self._leaderboards: Dict[Tuple[str, str], LeaderboardIndex] = {}
+        self.version = 0
+        self.history = XpHistory(XP_HISTORY_DIR)
+        self.store = ShardedStore(DAILY_DATA_DIR, self.data, USER_KEYS, META_KEYS)
     async def initialize(self):
         await self.load_data()
 
@@ -50,8 +72,9 @@ class DailyManager:
         
         now = int(time.time())
         last_updated = self.data.get("last_updated", 0)
+        progress = self.data.get("update_progress")
         
-        if not force and now - last_updated < 86400:
+        if progress is None and not force and now - last_updated < 86400:
             log_debug(f"Skipping daily update (last updated {now - last_updated}s ago)")
             if status_message:
                  try:
@@ -59,52 +82,149 @@ class DailyManager:
                  except: pass
             return 0, 0, total_users
         
-        log_info(f"Starting stats update for {total_users} users (Forced: {force})")
-        
         if total_users == 0:
             return 0, 0, 0 # updated, errors, total
-            
-        updated_count = 0
-        errors = 0
-        processed_count = 0
-        
-        for user_id, uuid in tracked_users:
-            try:
-                if not uuid:
-                    log_error(f"Skipping update for {user_id}: No UUID")
-                    errors += 1
-                else:
+
+        if progress is None or force:
+            progress = {"started_at": now, "done": []}
+            self.data["update_progress"] = progress
+            self.store.mark_meta()
+            log_info(f"Starting stats update for {total_users} users (Forced: {force})")
+        else:
+            log_info(f"Resuming stats update started at {progress['started_at']} ({len(progress['done'])}/{total_users} already processed)")
+
+        done = set(progress["done"])
+        pending = [(user_id, uuid) for user_id, uuid in tracked_users if user_id not in done]
+        counts = await self._run_updates(pending, total_users, status_message, progress)
+
+        self.data["update_progress"] = None
+        self.store.mark_meta()
+        await self._save_data()
+        if counts["updated"] > 0:
+            log_info(f"Saved daily data for {counts['updated']} updated users.")
+                
+        return counts["updated"], counts["errors"], total_users
+
+    async def refresh_incremental(self, status_message=None, slice_size: Optional[int] = None):
+        now = int(time.time())
+        batch = self.plan_refresh(now, slice_size or config.refresh_slice_size)
+        if not batch:
+            log_debug("Incremental refresh: no users due")
+            return 0, 0, 0
+
+        log_info(f"Incremental refresh of {len(batch)} due users")
+        counts = await self._run_updates(batch, len(batch), status_message)
+        await self._save_data()
+        return counts["updated"], counts["errors"], len(batch)
+
+    def _refresh_interval(self, user_id: str, now: int) -> int:
+        last_changed = self.data["activity"].get(user_id, 0)
+        idle = now - last_changed
+        if idle < 86400:
+            return REFRESH_INTERVAL_ACTIVE
+        if idle < 7 * 86400:
+            return REFRESH_INTERVAL_RECENT
+        if idle < 30 * 86400:
+            return REFRESH_INTERVAL_IDLE
+        return REFRESH_INTERVAL_DORMANT
+
+    def _due_at(self, user_id: str, now: int, next_reset: int) -> int:
+        current = self.data["current_xp"].get(user_id)
+        if not current:
+            return 0
+        checked = current.get("timestamp", 0)
+        interval = self._refresh_interval(user_id, now)
+        due_at = checked + interval
+
+        window_start = next_reset - RESET_BOUNDARY_WINDOW
+        if interval <= REFRESH_INTERVAL_RECENT and now >= window_start and checked < window_start:
+            due_at = min(due_at, window_start)
+        return due_at
+
+    def plan_refresh(self, now: int, limit: int) -> List[Tuple[str, str]]:
+        next_reset = self.get_reset_timestamps()[0]
+        heap = []
+        for user_id, info in self.data["users"].items():
+            uuid = info.get("uuid")
+            if not uuid:
+                continue
+            due_at = self._due_at(user_id, now, next_reset)
+            if due_at <= now:
+                heap.append((due_at, -self.data["activity"].get(user_id, 0), user_id, uuid))
+
+        return [(user_id, uuid) for _, _, user_id, uuid in heapq.nsmallest(limit, heap)]
+
+    async def _run_updates(self, pending: List[Tuple[str, str]], total_users: int, status_message=None,
+                           progress: Optional[dict] = None) -> dict:
+        budget = ProviderBudget(config.api_priority, config.provider_rates, is_open=is_provider_open)
+        semaphore = asyncio.Semaphore(max(1, config.update_concurrency))
+        counts = {"updated": 0, "errors": 0, "processed": total_users - len(pending)}
+
+        async def update_one(user_id: str, uuid: str):
+            async with semaphore:
+                try:
+                    if not uuid:
+                        log_error(f"Skipping update for {user_id}: No UUID")
+                        counts["errors"] += 1
+                        return
+                    provider = await budget.acquire()
                     forced_profile = self.data["users"].get(user_id, {}).get("forced_profile")
-                    xp_data = await get_dungeon_xp(uuid, profile_name=forced_profile)
+                    xp_data = await get_dungeon_xp(uuid, profile_name=forced_profile, provider=provider)
                     if xp_data:
                         await self.update_user_data(user_id, xp_data, save=False)
-                        updated_count += 1
+                        counts["updated"] += 1
                     else:
-                        errors += 1
-            except Exception as e:
-                log_error(f"Error updating user {user_id}: {e}")
-                errors += 1
-            finally:
-                processed_count += 1
-                if status_message and (processed_count <= 5 or processed_count % 5 == 0 or processed_count == total_users):
-                    try:
-                        await status_message.edit(
-                            content=f"🔄 **Force Update In Progress**\nProcessing: {processed_count}/{total_users}\nUpdated: {updated_count}\nErrors: {errors}"
-                        )
-                    except Exception:
-                        pass
-            
-            await asyncio.sleep(0.25)
+                        counts["errors"] += 1
+                except Exception as e:
+                    log_error(f"Error updating user {user_id}: {e}")
+                    counts["errors"] += 1
+                finally:
+                    counts["processed"] += 1
+                    if progress is not None:
+                        progress["done"].append(user_id)
+                        self.store.mark_meta()
+                        if counts["processed"] % UPDATE_CHECKPOINT_EVERY == 0:
+                            await self._save_data()
 
-        if updated_count > 0:
-            await self._save_data()
-            log_info(f"Saved daily data for {updated_count} updated users.")
-                
-        return updated_count, errors, total_users
+        async def report_progress():
+            while True:
+                await self._edit_update_status(status_message, counts, total_users)
+                await asyncio.sleep(UPDATE_PROGRESS_INTERVAL)
+
+        reporter = asyncio.create_task(report_progress()) if status_message else None
+        try:
+            await asyncio.gather(*(update_one(user_id, uuid) for user_id, uuid in pending))
+        finally:
+            if reporter:
+                reporter.cancel()
+
+        await self._edit_update_status(status_message, counts, total_users)
+        log_debug(f"Stats update provider budget: {budget.stats()}")
+        return counts
+
+    async def _edit_update_status(self, status_message, counts: dict, total_users: int):
+        if not status_message:
+            return
+        try:
+            await status_message.edit(
+                content=f"🔄 **Force Update In Progress**\nProcessing: {counts['processed']}/{total_users}\nUpdated: {counts['updated']}\nErrors: {counts['errors']}"
+            )
+        except Exception:
+            pass
 
     async def load_data(self):
+        try:
+            if await self.store.load():
+                self._drop_leaderboards()
+                log_info(f"Loaded daily data for {len(self.data.get('users', {}))} users.")
+                return
+        except Exception as e:
+            log_error(f"Failed to load daily data: {e}")
+            return
+
         if not os.path.exists(DAILY_DATA_FILE):
             log_info("No daily data file found, starting fresh.")
+            self.store.mark_all()
             await self._save_data()
             return
 
@@ -115,18 +235,21 @@ class DailyManager:
                 for key in self.data:
                     if key in loaded:
                         self.data[key] = loaded[key]
-            log_info(f"Loaded daily data for {len(self.data.get('users', {}))} users.")
+            self._drop_leaderboards()
+            log_info(f"Migrating daily data for {len(self.data.get('users', {}))} users to {DAILY_DATA_DIR}.")
+            self.store.mark_all()
+            await self._save_data()
+            if self.store.exists():
+                os.replace(DAILY_DATA_FILE, DAILY_DATA_FILE + ".migrated")
         except Exception as e:
             log_error(f"Failed to load daily data: {e}")
 
     async def _save_data(self):
-        try:
-            temp_path = DAILY_DATA_FILE + ".tmp"
-            async with aiofiles.open(temp_path, json.get_write_mode()) as f:
-                await f.write(json.dumps(self.data))
-            os.replace(temp_path, DAILY_DATA_FILE)
-        except Exception as e:
-            log_error(f"Failed to save daily data: {e}")
+        await self.history.flush()
+        await self.store.flush()
+
+    async def close(self):
+        await self._save_data()
 
     async def register_user(self, user_id: str, ign: str, uuid: str):
         user_id = str(user_id)
@@ -140,11 +263,13 @@ class DailyManager:
                 "uuid": uuid,
                 "forced_profile": None
             }
-            await self._save_data()
+            self._reindex_user(user_id)
+            self.store.mark_user(user_id)
             log_info(f"Registered user {ign} ({user_id}) for daily tracking.")
         elif self.data["users"][user_id]["ign"] != ign:
              self.data["users"][user_id]["ign"] = ign
-             await self._save_data()
+             self._reindex_user(user_id)
+             self.store.mark_user(user_id)
 
     def get_tracked_users(self) -> List[Tuple[str, str]]:
         return [(uid, info["uuid"]) for uid, info in self.data["users"].items()]
@@ -166,14 +291,19 @@ class DailyManager:
         if user_id in self.data["current_xp"]:
             self.data["daily_snapshots"][user_id] = self.data["current_xp"][user_id]
             self.data["monthly_snapshots"][user_id] = self.data["current_xp"][user_id]
+            self._reindex_user(user_id)
             
-        await self._save_data()
+        self.store.mark_user(user_id)
         log_info(f"Set forced profile for {user_id} to {profile_name}")
         return True
 
     async def update_user_data(self, user_id: str, xp_data: dict, save: bool = True):
         user_id = str(user_id)
         now = int(time.time())
+
+        previous = self.data["current_xp"].get(user_id)
+        if previous is None or previous.get("cata_xp") != xp_data["catacombs"] or previous.get("classes") != xp_data["classes"]:
+            self.data["activity"][user_id] = now
         
         self.data["current_xp"][user_id] = {
             "timestamp": now,
@@ -181,6 +311,7 @@ class DailyManager:
             "classes": xp_data["classes"],
             "runs": xp_data.get("runs", {"normal": {}, "master": {}})
         }
+        await self.history.record(user_id, now, self.data["current_xp"][user_id])
         
         if user_id not in self.data["daily_snapshots"]:
              self.data["daily_snapshots"][user_id] = self.data["current_xp"][user_id]
@@ -191,8 +322,11 @@ class DailyManager:
              self.data["monthly_snapshots"][user_id] = self.data["current_xp"][user_id]
         elif "runs" not in self.data["monthly_snapshots"][user_id]:
              self.data["monthly_snapshots"][user_id]["runs"] = self.data["current_xp"][user_id]["runs"]
-             
+
+        self._reindex_user(user_id)
         self.data["last_updated"] = now
+        self.store.mark_user(user_id)
+        self.store.mark_meta()
         if save:
             await self._save_data()
 
@@ -206,7 +340,8 @@ class DailyManager:
             log_info("Performing Daily Reset...")
             self.data["daily_snapshots"] = self.data["current_xp"].copy()
             self.data["last_daily_reset"] = int(now.timestamp())
-        await self._save_data()
+            self._drop_leaderboards("daily")
+            self.store.mark_all()
              
         last_month_ts = self.data.get("last_monthly_reset", 0)
         last_month_date = datetime.fromtimestamp(last_month_ts, timezone.utc)
@@ -215,7 +350,8 @@ class DailyManager:
             log_info("Performing Monthly Reset...")
             self.data["monthly_snapshots"] = self.data["current_xp"].copy()
             self.data["last_monthly_reset"] = int(now.timestamp())
-            await self._save_data()
+            self._drop_leaderboards("monthly")
+            self.store.mark_all()
 
     def get_last_updated(self) -> int:
         return self.data.get("last_updated", 0)
@@ -226,6 +362,13 @@ class DailyManager:
     def get_monthly_stats(self, user_id: str):
         return self._calculate_stats(user_id, "monthly_snapshots")
 
+    async def get_window_stats(self, user_id: str, start: int, end: Optional[int] = None) -> Optional[dict]:
+        return await self.history.gained(str(user_id), start, end if end is not None else int(time.time()))
+
+    async def get_weekly_stats(self, user_id: str, weeks: int = 1) -> List[dict]:
+        now = int(time.time())
+        return await self.history.gained_by_bucket(str(user_id), now - weeks * 7 * 86400, now, 7 * 86400)
+
     def _calculate_stats(self, user_id: str, snapshot_key: str):
         user_id = str(user_id)
         current = self.data["current_xp"].get(user_id)
@@ -233,14 +376,19 @@ class DailyManager:
         
         if not current or not start:
             return None
+
+        classes = list(current["classes"].items())
+        start_class_xp = [start["classes"].get(cls, 0) for cls, _ in classes]
+        levels = levels_for([start["cata_xp"], current["cata_xp"], *start_class_xp, *(xp for _, xp in classes)])
+        start_levels = levels[2:2 + len(classes)]
+        current_levels = levels[2 + len(classes):]
             
         stats = {
             "cata_gained": current["cata_xp"] - start["cata_xp"],
             "cata_start_xp": start["cata_xp"],
             "cata_current_xp": current["cata_xp"],
-            "cata_start_lvl": get_dungeon_level(start["cata_xp"]),
-            "cata_current_lvl": get_dungeon_level(current["cata_xp"]),
-            "cata_current_lvl": get_dungeon_level(current["cata_xp"]),
+            "cata_start_lvl": levels[0],
+            "cata_current_lvl": levels[1],
             "classes": {},
             "runs": {"normal": {}, "master": {}}
         }
@@ -260,52 +408,81 @@ class DailyManager:
                 if diff > 0:
                     stats["runs"][type_key][floor] = diff
         
-        for cls, xp in current["classes"].items():
-            start_xp = start["classes"].get(cls, 0)
+        for (cls, xp), start_xp, start_lvl, current_lvl in zip(classes, start_class_xp, start_levels, current_levels):
             stats["classes"][cls] = {
                 "gained": xp - start_xp,
                 "start_xp": start_xp,
                 "current_xp": xp,
-                "start_lvl": get_dungeon_level(start_xp),
-                "current_lvl": get_dungeon_level(xp)
+                "start_lvl": start_lvl,
+                "current_lvl": current_lvl
             }
             
         return stats
 
+    def _metric_value(self, user_id: str, snapshot_key: str, metric: str) -> Optional[float]:
+        current = self.data["current_xp"].get(user_id)
+        start = self.data[snapshot_key].get(user_id)
+        if not current or not start:
+            return None
+
+        if not metric.startswith("runs"):
+            return current["cata_xp"] - start["cata_xp"]
+
+        current_runs = current.get("runs", {"normal": {}, "master": {}})
+        start_runs = start.get("runs", {"normal": {}, "master": {}})
+
+        if metric == "runs":
+            total = 0
+            for type_key in ["normal", "master"]:
+                c_runs = current_runs.get(type_key, {})
+                s_runs = start_runs.get(type_key, {})
+                for floor in set(c_runs.keys()) | set(s_runs.keys()):
+                    diff = int(c_runs.get(floor, 0)) - int(s_runs.get(floor, 0))
+                    if diff > 0:
+                        total += diff
+            return total
+
+        try:
+            _, m_type, m_floor = metric.split("_", 2)
+        except ValueError:
+            return 0
+        diff = int(current_runs.get(m_type, {}).get(m_floor, 0)) - int(start_runs.get(m_type, {}).get(m_floor, 0))
+        return diff if diff > 0 else 0
+
+    def _leaderboard_index(self, type: str, metric: str) -> LeaderboardIndex:
+        period = "daily" if type == "daily" else "monthly"
+        key = (period, metric)
+        index = self._leaderboards.get(key)
+        if index is None:
+            snapshot_key = f"{period}_snapshots"
+            index = LeaderboardIndex(lambda user_id: self._metric_value(user_id, snapshot_key, metric))
+            index.build((user_id, info["ign"]) for user_id, info in self.data["users"].items())
+            self._leaderboards[key] = index
+        return index
+
+    def _reindex_user(self, user_id: str):
+        self.version += 1
+        ign = self.data["users"].get(user_id, {}).get("ign")
+        for index in self._leaderboards.values():
+            index.update_user(user_id, ign)
+
+    def _drop_leaderboards(self, period: Optional[str] = None):
+        self.version += 1
+        for key in list(self._leaderboards):
+            if period is None or key[0] == period:
+                del self._leaderboards[key]
+
     def get_leaderboard(self, type="daily", metric="xp"):
-        snapshot_key = "daily_snapshots" if type == "daily" else "monthly_snapshots"
-        leaderboard_map = {}
-        
-        for user_id, info in self.data["users"].items():
-            stats = self._calculate_stats(user_id, snapshot_key)
-            if stats:
-                ign = info["ign"]
-                val = 0
-                
-                if metric == "runs":
-                    if "runs" in stats:
-                        for cat in ["normal", "master"]:
-                            for count in stats["runs"].get(cat, {}).values():
-                                val += count
-                elif metric.startswith("runs_"):
-                    try:
-                        _, m_type, m_floor = metric.split("_", 2)
-                        val = stats.get("runs", {}).get(m_type, {}).get(m_floor, 0)
-                    except:
-                        val = 0
-                else:
-                    val = stats["cata_gained"]
-
-                if ign not in leaderboard_map or val > leaderboard_map[ign]["gained"]:
-                    leaderboard_map[ign] = {
-                        "ign": ign,
-                        "gained": val,
-                        "user_id": user_id
-                    }
-        
-        leaderboard = list(leaderboard_map.values())
-        leaderboard.sort(key=lambda x: x["gained"], reverse=True)
-        return leaderboard
+        return self._leaderboard_index(type, metric).entries()
+
+    def get_leaderboard_page(self, type: str, metric: str, start: int, end: int) -> List[dict]:
+        return self._leaderboard_index(type, metric).page(start, end)
+
+    def get_leaderboard_size(self, type: str, metric: str) -> int:
+        return len(self._leaderboard_index(type, metric))
+
+    def find_leaderboard_rank(self, type: str, metric: str, ign: str) -> Optional[int]:
+        return self._leaderboard_index(type, metric).rank(ign)
 
     async def sanitize_data(self):
         sanitize_stamp = "data/.last_sanitize"
@@ -318,19 +495,24 @@ class DailyManager:
 
         log_info("Sanitizing daily data...")
         updates = False
+        broken = []
         for user_id, info in self.data["users"].items():
             uuid = info.get("uuid", "")
             ign = info.get("ign", "")
-
             if not uuid or len(uuid) != 32:
                 log_info(f"Detected invalid UUID for {ign} ({uuid}). Fetching correct UUID...")
-                new_uuid = await get_uuid(ign)
-                if new_uuid:
-                    self.data["users"][user_id]["uuid"] = new_uuid
-                    log_info(f"Fixed UUID for {ign}: {new_uuid}")
-                    updates = True
-                else:
-                    log_error(f"Failed to fix UUID for {ign}")
+                broken.append((user_id, ign))
+
+        resolved = await get_uuids([ign for _, ign in broken if ign]) if broken else {}
+        for user_id, ign in broken:
+            new_uuid = resolved.get((ign or "").lower())
+            if new_uuid:
+                self.data["users"][user_id]["uuid"] = new_uuid
+                self.store.mark_user(user_id)
+                log_info(f"Fixed UUID for {ign}: {new_uuid}")
+                updates = True
+            else:
+                log_error(f"Failed to fix UUID for {ign}")
 
         if updates:
             await self._save_data()
@@ -1,9 +1,9 @@
 import hashlib
 import json
 import time
-from core.logger import log_info, log_error
-from core.cache import cache_get, cache_set
-from services.api import _SESSION, init_session
+from core.logger import log_info, log_error, log_debug
+from core.cache import cache_get, cache_set, cache_get_stale, revalidate
+from services import api
 
 CACHE_KEY = "google_fonts_cache"
 CACHE_TTL = 86400
@@ -13,6 +13,15 @@ async def get_fonts_data():
     if cached:
         return cached
 
+    stale = await cache_get_stale(CACHE_KEY)
+    if stale:
+        log_debug("Serving stale Google Fonts list while revalidating")
+        revalidate(CACHE_KEY, _fetch_fonts_data)
+        return stale
+
+    return await _fetch_fonts_data()
+
+async def _fetch_fonts_data():
     try:
         try:
             from core.secrets import GOOGLE_FONTS_API_KEY
@@ -25,11 +34,11 @@ async def get_fonts_data():
             raise Exception("Google Fonts API key not configured")
 
         log_info("Fetching Google Fonts list from Google API...")
-        if not _SESSION:
-            await init_session()
+        if not api._SESSION:
+            await api.init_session()
 
         url = f"https://www.googleapis.com/webfonts/v1/webfonts?key={api_key}"
-        async with _SESSION.get(url) as response:
+        async with api._session_for("google").get(url) as response:
             if response.status != 200:
                 log_error(f"Failed to fetch Google Fonts. Status: {response.status}")
                 raise Exception(f"HTTP Status {response.status}")
@@ -67,16 +76,4 @@ async def get_fonts_data():
             
     except Exception as e:
         log_error(f"Error fetching Google Fonts: {e}")
-        
-        try:
-            import core.cache
-            entry = core.cache._DATA_CACHE.get(CACHE_KEY)
-            if entry:
-                stale_data = entry[1]
-                await cache_set(CACHE_KEY, stale_data, ttl=3600)
-                log_info("Google Fonts fetch failed. Served stale cache extended by 1 hour.")
-                return stale_data
-        except Exception as cache_err:
-            log_error(f"Failed to retrieve stale cache: {cache_err}")
-            
         return None
@@ -79,7 +79,6 @@ class GithubManager:
             return False, "Failed to prepare backup repository. Check your GITHUB_BACKUP_REPO and GITHUB_BACKUP_TOKEN."
 
         important_files = [
-            "data/daily_data.json",
             "data/rng_data.json",
             "data/user_links.json",
             "data/custom_names.json",
@@ -87,6 +86,7 @@ class GithubManager:
             "data/solo_clears.json",
             "data/recent_teammates.json",
             "data/ip_bans.json",
+            "data/ip_bans.journal",
             "data/irc_history.json",
         ]
         
@@ -99,6 +99,19 @@ class GithubManager:
                 os.makedirs(os.path.dirname(dst), exist_ok=True)
                 shutil.copy2(src, dst)
                 files_copied += 1
+
+        important_dirs = [
+            "data/daily",
+            "data/xp_history",
+        ]
+
+        for rel_path in important_dirs:
+            src = os.path.join(self.project_root, rel_path)
+            dst = os.path.join(self.backup_dir, rel_path)
+
+            if os.path.isdir(src):
+                shutil.copytree(src, dst, dirs_exist_ok=True, ignore=shutil.ignore_patterns("*.tmp"))
+                files_copied += 1
         
         if files_copied == 0:
             return False, "No important data files found to back up."
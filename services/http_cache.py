@@ -0,0 +1,42 @@
+import hashlib
+import uuid
+from aiohttp import web
+from services import json_utils
+
+BOOT_ID = uuid.uuid4().hex
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.blake2b(repr((BOOT_ID,) + parts).encode("utf-8"), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(request, etag: str) -> bool:
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    target = _opaque(etag)
+    return any(_opaque(candidate) == target for candidate in header.split(","))
+
+
+def cache_headers(etag: str, max_age: int, scope: str = "public") -> dict:
+    return {"ETag": etag, "Cache-Control": f"{scope}, max-age={max_age}"}
+
+
+def not_modified(etag: str, max_age: int, scope: str = "public") -> web.Response:
+    return web.Response(status=304, headers=cache_headers(etag, max_age, scope))
+
+
+def hashed_json(request, payload: dict, max_age: int, scope: str = "public") -> web.Response:
+    body = json_utils.dumps(payload)
+    etag = f'W/"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+    if etag_matches(request, etag):
+        return not_modified(etag, max_age, scope)
+    return web.Response(body=body, content_type="application/json", headers=cache_headers(etag, max_age, scope))
@@ -13,14 +13,14 @@ def loads(data):
             data = data.decode("utf-8")
         return json.loads(data)
 
-def dumps(data, indent=None):
+def dumps(data, indent=None, default=None):
     if ORJSON_AVAILABLE:
         options = 0
         if indent:
             options |= orjson.OPT_INDENT_2
-        return orjson.dumps(data, option=options)
+        return orjson.dumps(data, default=default, option=options)
     else:
-        return json.dumps(data, indent=indent).encode("utf-8")
+        return json.dumps(data, indent=indent, default=default).encode("utf-8")
 
 def get_read_mode():
     return 'rb'
@@ -0,0 +1,77 @@
+import bisect
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class LeaderboardIndex:
+    def __init__(self, value_of: Callable[[str], Optional[float]]):
+        self.value_of = value_of
+        self._keys: List[Tuple[float, int, str]] = []
+        self._key_by_ign: Dict[str, Tuple[float, int, str]] = {}
+        self._entry_by_ign: Dict[str, dict] = {}
+        self._members: Dict[str, Dict[str, Optional[float]]] = {}
+        self._ign_of: Dict[str, str] = {}
+        self._order: Dict[str, int] = {}
+        self._igns_by_lower: Dict[str, set] = {}
+
+    def build(self, users: Iterable[Tuple[str, str]]):
+        for user_id, ign in users:
+            self.update_user(user_id, ign)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def update_user(self, user_id: str, ign: Optional[str]):
+        old_ign = self._ign_of.get(user_id)
+        if old_ign is not None and old_ign != ign:
+            self._members[old_ign].pop(user_id, None)
+            del self._ign_of[user_id]
+            self._refresh_ign(old_ign)
+
+        if ign is None:
+            return
+
+        if ign not in self._order:
+            self._order[ign] = len(self._order)
+        self._ign_of[user_id] = ign
+        self._members.setdefault(ign, {})[user_id] = self.value_of(user_id)
+        self._refresh_ign(ign)
+
+    def remove_user(self, user_id: str):
+        self.update_user(user_id, None)
+
+    def _refresh_ign(self, ign: str):
+        old_key = self._key_by_ign.pop(ign, None)
+        if old_key is not None:
+            index = bisect.bisect_left(self._keys, old_key)
+            del self._keys[index]
+            del self._entry_by_ign[ign]
+            self._igns_by_lower[ign.lower()].discard(ign)
+
+        best_user, best_value = None, None
+        for user_id, value in self._members.get(ign, {}).items():
+            if value is not None and (best_value is None or value > best_value):
+                best_user, best_value = user_id, value
+
+        if best_user is None:
+            if not self._members.get(ign):
+                self._members.pop(ign, None)
+            return
+
+        key = (-best_value, self._order[ign], ign)
+        bisect.insort(self._keys, key)
+        self._key_by_ign[ign] = key
+        self._entry_by_ign[ign] = {"ign": ign, "gained": best_value, "user_id": best_user}
+        self._igns_by_lower.setdefault(ign.lower(), set()).add(ign)
+
+    def rank(self, ign: str) -> Optional[int]:
+        ranks = [
+            bisect.bisect_left(self._keys, self._key_by_ign[candidate])
+            for candidate in self._igns_by_lower.get(ign.lower(), ())
+        ]
+        return min(ranks) if ranks else None
+
+    def page(self, start: int, end: int) -> List[dict]:
+        return [dict(self._entry_by_ign[key[2]]) for key in self._keys[max(start, 0):max(end, 0)]]
+
+    def entries(self) -> List[dict]:
+        return self.page(0, len(self._keys))
@@ -48,7 +48,7 @@ async def verify_session(ign: str, server_id: str, expected_uuid: Optional[str]
     url = f"{HAS_JOINED_URL}?username={quote(ign)}&serverId={quote(server_id)}"
 
     try:
-        async with api_service._SESSION.get(url) as resp:
+        async with api_service._session_for("mojang").get(url) as resp:
             if resp.status == 204:
                 log_error(f"[Mojang] hasJoined returned 204 (not authenticated) for {ign}")
                 return False
@@ -9,6 +9,7 @@ NAMES_FILE = "data/custom_names.json"
 class NameManager:
     def __init__(self):
         self.names: Dict[str, dict] = {}
+        self.version = 0
 
     async def initialize(self):
         await self.load_names()
@@ -27,6 +28,7 @@ class NameManager:
             async with aiofiles.open(NAMES_FILE, json.get_read_mode()) as f:
                 content = await f.read()
                 self.names = json.loads(content)
+            self.version += 1
             log_info(f"Loaded {len(self.names)} custom names.")
         except Exception as e:
             log_error(f"Failed to load custom names: {e}")
@@ -47,6 +49,7 @@ class NameManager:
             "display": display_name,
             "color": color
         }
+        self.version += 1
         await self.save_names()
         log_info(f"Set custom name for {ign}: {display_name} ({color})")
 
@@ -5,6 +5,7 @@ class PartyManager:
     def __init__(self):
         self.parties = {}
         self.cleanup_interval = 600
+        self.version = 0
 
     def add_party(self, player_name, player_uuid, floor, note, reqs, max_size=5):
         self.cleanup()
@@ -20,11 +21,13 @@ class PartyManager:
             "member_count": 1,
             "timestamp": time.time()
         }
+        self.version += 1
         return self.parties[player_uuid]
 
     def remove_party(self, player_uuid):
         if player_uuid in self.parties:
             del self.parties[player_uuid]
+            self.version += 1
             return True
         return False
 
@@ -33,6 +36,7 @@ class PartyManager:
             if member_count is not None:
                 self.parties[player_uuid]["member_count"] = member_count
             self.parties[player_uuid]["timestamp"] = time.time()
+            self.version += 1
             return True
         return False
 
@@ -62,5 +66,7 @@ class PartyManager:
         expired = [uid for uid, p in self.parties.items() if now - p["timestamp"] > self.cleanup_interval]
         for uid in expired:
             del self.parties[uid]
+        if expired:
+            self.version += 1
 
 party_manager = PartyManager()
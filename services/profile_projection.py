@@ -0,0 +1,290 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional
+
+DUNGEON_CLASSES = ["archer", "berserk", "healer", "mage", "tank"]
+
+SOOPY_FLOOR_KEYS = {
+    "e": "Entrance",
+    "f1": "F1", "f2": "F2", "f3": "F3", "f4": "F4",
+    "f5": "F5", "f6": "F6", "f7": "F7",
+    "m1": "M1", "m2": "M2", "m3": "M3", "m4": "M4",
+    "m5": "M5", "m6": "M6", "m7": "M7",
+}
+
+PROFILE_KEYS = ("profile_id", "cute_name", "selected", "game_mode", "_soopy")
+
+MEMBER_KEYS = (
+    "dungeons", "player_data", "skills", "experience", "networth", "nw",
+    "currencies", "slayer", "fairy_soul", "fairy_souls", "fairy_souls_collected",
+    "leveling", "bestiary", "mining_core", "accessory_bag_storage",
+    "accessory_reforge", "achievements", "kills",
+)
+MEMBER_KEY_PREFIXES = ("skill_", "experience_skill_")
+SNAPSHOT_MEMO_SIZE = 1024
+
+_snapshot_memo: "OrderedDict[int, tuple]" = OrderedDict()
+
+
+def _raw_time(value) -> int:
+    raw = (value or {}).get("raw")
+    if isinstance(raw, (int, float)) and not isinstance(raw, bool):
+        return int(raw)
+    return 0
+
+
+@dataclass
+class DungeonSnapshot:
+    source: str = "hypixel"
+    catacombs_xp: float = 0.0
+    class_xp: Dict[str, float] = field(default_factory=dict)
+    normal_runs: Dict[str, int] = field(default_factory=dict)
+    master_runs: Dict[str, int] = field(default_factory=dict)
+    floors: Dict[str, dict] = field(default_factory=dict)
+    secrets: int = 0
+    blood_mob_kills: int = 0
+    magical_power: int = 0
+    recent_runs: List[dict] = field(default_factory=list)
+
+    @classmethod
+    def from_member(cls, member: dict) -> "DungeonSnapshot":
+        if "catacombs_xp" in member.get("dungeons", {}):
+            return cls.from_soopy(member)
+        return cls.from_hypixel(member)
+
+    @classmethod
+    def from_soopy(cls, member: dict, player_data: Optional[dict] = None) -> "DungeonSnapshot":
+        dungeons = member.get("dungeons", {})
+        class_levels = dungeons.get("class_levels", {})
+        floor_stats = dungeons.get("floorStats", {})
+
+        floors = {}
+        for raw_key, display_key in SOOPY_FLOOR_KEYS.items():
+            floor_data = floor_stats.get(raw_key) or {}
+            floors[display_key] = {
+                "runs": int(floor_data.get("completions") or 0),
+                "best_score": int(floor_data.get("best_score") or 0),
+                "fastest_s": _raw_time(floor_data.get("fastest_time_s")),
+                "fastest_s_plus": _raw_time(floor_data.get("fastest_time_s_plus")),
+            }
+
+        return cls(
+            source="soopy",
+            catacombs_xp=float(dungeons.get("catacombs_xp", 0) or 0),
+            class_xp={
+                cls_name: float((class_levels.get(cls_name) or {}).get("xp", 0) or 0)
+                for cls_name in DUNGEON_CLASSES
+            },
+            normal_runs={
+                str(i): int((floor_stats.get(f"f{i}") or {}).get("completions", 0) or 0)
+                for i in range(1, 8)
+            },
+            master_runs={
+                str(i): int((floor_stats.get(f"m{i}") or {}).get("completions", 0) or 0)
+                for i in range(1, 8)
+            },
+            floors=floors,
+            secrets=cls._soopy_secrets(player_data),
+            blood_mob_kills=int((member.get("kills") or {}).get("watcher_summon_undead", 0) or 0),
+            magical_power=int((member.get("accessory_reforge") or {}).get("highest_magical_power", 0) or 0),
+            recent_runs=cls._recent_runs(dungeons),
+        )
+
+    @classmethod
+    def from_hypixel(cls, member: dict) -> "DungeonSnapshot":
+        dungeons = member.get("dungeons", {})
+        dungeon_types = dungeons.get("dungeon_types", {})
+        catacombs = dungeon_types.get("catacombs", {})
+        master_catacombs = dungeon_types.get("master_catacombs", {})
+        player_classes = dungeons.get("player_classes", {})
+
+        secrets = int(dungeons.get("secrets", 0))
+        if secrets == 0:
+            secrets = int(member.get("achievements", {}).get("skyblock_treasure_hunter", 0))
+
+        floors = {}
+        cls._add_tiers(floors, catacombs, "F")
+        cls._add_tiers(floors, master_catacombs, "M")
+
+        return cls(
+            source="hypixel",
+            catacombs_xp=float(catacombs.get("experience", 0)),
+            class_xp={
+                cls_name: float((player_classes.get(cls_name) or {}).get("experience", 0))
+                for cls_name in DUNGEON_CLASSES
+            },
+            normal_runs=catacombs.get("tier_completions", {}),
+            master_runs=master_catacombs.get("tier_completions", {}),
+            floors=floors,
+            secrets=secrets,
+            blood_mob_kills=member.get("player_stats", {}).get("kills", {}).get("watcher_summon_undead", 0),
+            magical_power=int((member.get("accessory_bag_storage") or {}).get("highest_magical_power", 0) or 0),
+            recent_runs=cls._recent_runs(dungeons),
+        )
+
+    @classmethod
+    def from_skycrypt(cls, stats: dict) -> "DungeonSnapshot":
+        floors = stats.get("floors", {})
+        return cls(
+            source="skycrypt",
+            catacombs_xp=float(stats.get("catacombs", 0) or 0),
+            class_xp={
+                cls_name: float(stats.get("classes", {}).get(cls_name.capitalize(), 0) or 0)
+                for cls_name in DUNGEON_CLASSES
+            },
+            normal_runs={str(i): (floors.get(f"F{i}") or {}).get("runs", 0) for i in range(1, 8)},
+            master_runs={str(i): (floors.get(f"M{i}") or {}).get("runs", 0) for i in range(1, 8)},
+            floors=floors,
+            secrets=stats.get("secrets", 0),
+            blood_mob_kills=stats.get("blood_mob_kills", 0),
+            magical_power=int(stats.get("magical_power", 0) or 0),
+        )
+
+    @staticmethod
+    def _soopy_secrets(player_data: Optional[dict]) -> int:
+        if not player_data:
+            return -1
+        achievements = player_data.get("stats", {}).get("achievements", {}).get("skyblock", {})
+        return achievements.get("dungeon_secrets", -1)
+
+    def with_player_data(self, player_data: Optional[dict]) -> "DungeonSnapshot":
+        return replace(self, secrets=self._soopy_secrets(player_data))
+
+    @staticmethod
+    def _add_tiers(floors: dict, tier_data: dict, prefix: str):
+        times_s_plus = tier_data.get("fastest_time_s_plus", {})
+        times_s = tier_data.get("fastest_time_s", {})
+        best_score = tier_data.get("best_score", {})
+
+        for tier, count in tier_data.get("tier_completions", {}).items():
+            if tier == "total":
+                continue
+            if tier == "0":
+                floor_name = "Entrance" if prefix == "F" else "M0"
+            else:
+                floor_name = f"{prefix}{tier}"
+
+            floors[floor_name] = {
+                "runs": count,
+                "best_score": best_score.get(tier, 0),
+                "fastest_s_plus": times_s_plus.get(tier, 0),
+                "fastest_s": times_s.get(tier, 0),
+            }
+
+    @staticmethod
+    def _recent_runs(dungeons: dict) -> list:
+        treasures = dungeons.get("treasures", {})
+        if isinstance(treasures, list):
+            return treasures
+        return treasures.get("runs", [])
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DungeonSnapshot":
+        return cls(
+            source=data.get("source", "hypixel"),
+            catacombs_xp=float(data.get("catacombs_xp", 0) or 0),
+            class_xp=dict(data.get("class_xp") or {}),
+            normal_runs=dict(data.get("normal_runs") or {}),
+            master_runs=dict(data.get("master_runs") or {}),
+            floors=dict(data.get("floors") or {}),
+            secrets=data.get("secrets", 0),
+            blood_mob_kills=data.get("blood_mob_kills", 0),
+            magical_power=int(data.get("magical_power", 0) or 0),
+            recent_runs=list(data.get("recent_runs") or []),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "source": self.source,
+            "catacombs_xp": self.catacombs_xp,
+            "class_xp": self.class_xp,
+            "normal_runs": self.normal_runs,
+            "master_runs": self.master_runs,
+            "floors": self.floors,
+            "secrets": self.secrets,
+            "blood_mob_kills": self.blood_mob_kills,
+            "magical_power": self.magical_power,
+            "recent_runs": self.recent_runs,
+        }
+
+
+def _trim_member(member: dict) -> dict:
+    trimmed = {}
+    for key, value in member.items():
+        if key in MEMBER_KEYS or key.startswith(MEMBER_KEY_PREFIXES):
+            trimmed[key] = value
+
+    dungeons = trimmed.get("dungeons")
+    if isinstance(dungeons, dict) and "treasures" in dungeons:
+        trimmed["dungeons"] = {key: value for key, value in dungeons.items() if key != "treasures"}
+
+    player_stats = member.get("player_stats")
+    if isinstance(player_stats, dict) and "kills" in player_stats:
+        trimmed["player_stats"] = {"kills": player_stats["kills"]}
+    return trimmed
+
+
+def _member_of(profile: dict, uuid: str) -> Optional[dict]:
+    members = profile.get("members") or {}
+    return members.get(uuid) or members.get(uuid.replace("-", ""))
+
+
+def build_snapshot(profile: dict, uuid: str, source: Optional[str]) -> Optional[DungeonSnapshot]:
+    member = _member_of(profile, uuid)
+    if not member:
+        return None
+    if source == "soopy":
+        return DungeonSnapshot.from_soopy(member)
+    return DungeonSnapshot.from_member(member)
+
+
+def project_profile(profile: dict, uuid: str, source: Optional[str] = None) -> dict:
+    projected = {key: profile[key] for key in PROFILE_KEYS if key in profile}
+
+    banking = profile.get("banking")
+    if isinstance(banking, dict):
+        projected["banking"] = {"balance": banking.get("balance", 0)}
+
+    member = _member_of(profile, uuid)
+    projected["members"] = {uuid: _trim_member(member)} if member else {}
+
+    snapshot = build_snapshot(profile, uuid, source)
+    if snapshot is not None:
+        projected["dungeon_snapshot"] = snapshot.to_dict()
+    return projected
+
+
+def project_profile_data(profile_data: dict, uuid: str) -> dict:
+    profiles = profile_data.get("profiles")
+    if isinstance(profiles, dict):
+        profiles = list(profiles.values())
+    if not isinstance(profiles, list):
+        return profile_data
+
+    source = profile_data.get("_source")
+    projected = {key: value for key, value in profile_data.items() if key != "profiles"}
+    projected["profiles"] = [
+        project_profile(profile, uuid, source)
+        for profile in profiles
+        if isinstance(profile, dict)
+    ]
+    return projected
+
+
+def snapshot_for(profile: dict, uuid: str) -> Optional[DungeonSnapshot]:
+    stored = profile.get("dungeon_snapshot")
+    if stored is not None:
+        memo = _snapshot_memo.get(id(stored))
+        if memo is not None and memo[0] is stored:
+            _snapshot_memo.move_to_end(id(stored))
+            return memo[1]
+        snapshot = DungeonSnapshot.from_dict(stored)
+        _snapshot_memo[id(stored)] = (stored, snapshot)
+        if len(_snapshot_memo) > SNAPSHOT_MEMO_SIZE:
+            _snapshot_memo.popitem(last=False)
+        return snapshot
+
+    member = _member_of(profile, uuid)
+    if not member:
+        return None
+    return DungeonSnapshot.from_member(member)
@@ -1,6 +1,10 @@
+import abc
+import math
+import random
 import time
 from typing import Tuple
 from aiohttp import web
+from core.config import config
 from core.logger import log_info, log_error
 from services.ban_manager import ban_manager
 from services.request_log import request_log, sanitize_headers, sanitize_text
@@ -22,7 +26,7 @@ async def build_request_details(request) -> Tuple[dict, str]:
     body_preview = ""
     content_length = request.content_length or 0
 
-    if request.can_read_body and content_length and content_length <= MAX_LOG_BODY_READ:
+    if request.body_exists and content_length and content_length <= MAX_LOG_BODY_READ:
         body = await request.read()
         content_type = (request.content_type or "").lower()
         if body:
@@ -30,7 +34,7 @@ async def build_request_details(request) -> Tuple[dict, str]:
                 body_preview = body.decode("utf-8", errors="replace")[:MAX_LOG_BODY_PREVIEW]
             else:
                 body_preview = f"<{len(body)} bytes {request.content_type or 'binary'}>"
-    elif request.can_read_body and content_length > MAX_LOG_BODY_READ:
+    elif request.body_exists and content_length > MAX_LOG_BODY_READ:
         body_preview = f"<body omitted: {content_length} bytes>"
 
     peer = None
@@ -50,37 +54,133 @@ async def build_request_details(request) -> Tuple[dict, str]:
         "content_type": sanitize_text(request.content_type or "", 120),
         "content_length": content_length,
         "headers": sanitize_headers(request.headers),
+        "capture": "full",
     }
     return details, body_preview
 
 
-class RateLimiter:
-    def __init__(self, requests_per_minute=60):
-        self.requests_per_minute = requests_per_minute
-        self.window_size = 60
-        self.requests = {}
-        self.last_cleanup = time.time()
+def build_request_metadata(request) -> dict:
+    return {
+        "scheme": request.scheme,
+        "host": sanitize_text(request.host, 160),
+        "remote": sanitize_text(request.remote, 80),
+        "user_agent": sanitize_text(request.headers.get("User-Agent", ""), 240),
+        "content_type": sanitize_text(request.content_type or "", 120),
+        "content_length": request.content_length or 0,
+        "capture": "metadata",
+    }
+
+
+def get_sample_rate(path: str) -> float:
+    sampling = config.request_log_sampling
+    return float(sampling.get(path, sampling.get("*", 0.0)))
+
+
+async def capture_details(request, status: int, captured=None) -> Tuple[dict, str]:
+    if captured is not None:
+        return captured
+    if not (200 <= status < 300 or status == 304):
+        return await build_request_details(request)
+    rate = get_sample_rate(request.path)
+    if rate > 0 and random.random() < rate:
+        return await build_request_details(request)
+    return build_request_metadata(request), ""
+
+
+DEFAULT_LIMIT = (60, 60)
+SWEEP_INTERVAL_SECONDS = 60
+MAX_TRACKED_KEYS = 200_000
+
+
+class RateLimitBackend(abc.ABC):
+    @abc.abstractmethod
+    async def acquire(self, key: str, emission: float, tolerance: float, now: float) -> float:
+        raise NotImplementedError
+
+    async def sweep(self, now: float) -> int:
+        return 0
+
+    def stats(self) -> dict:
+        return {}
+
 
-    def is_rate_limited(self, ip):
-        current_time = time.time()
+class MemoryRateLimitBackend(RateLimitBackend):
+    def __init__(self, sweep_interval: float = SWEEP_INTERVAL_SECONDS, max_keys: int = MAX_TRACKED_KEYS):
+        self._tat: dict = {}
+        self.sweep_interval = sweep_interval
+        self.max_keys = max_keys
+        self.last_sweep = time.time()
+        self.swept = 0
 
-        if current_time - self.last_cleanup > 60:
-            self.last_cleanup = current_time
-            for key in list(self.requests.keys()):
-                self.requests[key] = [t for t in self.requests[key] if t > current_time - self.window_size]
-                if not self.requests[key]:
-                    del self.requests[key]
+    async def acquire(self, key: str, emission: float, tolerance: float, now: float) -> float:
+        if now - self.last_sweep > self.sweep_interval or len(self._tat) > self.max_keys:
+            await self.sweep(now)
 
-        if ip not in self.requests:
-            self.requests[ip] = []
+        tat = self._tat.get(key, now)
+        if tat < now:
+            tat = now
+        allow_at = tat + emission - tolerance
+        if allow_at > now:
+            return allow_at - now
+        self._tat[key] = tat + emission
+        return 0.0
 
-        self.requests[ip] = [t for t in self.requests[ip] if t > current_time - self.window_size]
+    async def sweep(self, now: float) -> int:
+        self.last_sweep = now
+        idle = [key for key, tat in self._tat.items() if tat <= now]
+        for key in idle:
+            del self._tat[key]
+        if len(self._tat) > self.max_keys:
+            for key in list(self._tat)[:len(self._tat) - self.max_keys]:
+                del self._tat[key]
+        self.swept += len(idle)
+        return len(idle)
 
-        if len(self.requests[ip]) >= self.requests_per_minute:
-            return True
+    def stats(self) -> dict:
+        return {"backend": "memory", "keys": len(self._tat), "swept": self.swept}
 
-        self.requests[ip].append(current_time)
-        return False
+
+_backend: RateLimitBackend = MemoryRateLimitBackend()
+
+
+def get_backend() -> RateLimitBackend:
+    return _backend
+
+
+def set_backend(backend: RateLimitBackend):
+    global _backend
+    _backend = backend
+
+
+def get_limits(name: str, default: Tuple[int, int]) -> Tuple[int, int]:
+    override = config.rate_limits.get(name)
+    if not override:
+        return default
+    return int(override.get("requests", default[0])), int(override.get("window", default[1]))
+
+
+async def acquire(name: str, key: str, requests: int, window: float) -> float:
+    if requests <= 0:
+        return 0.0
+    emission = window / requests
+    return await _backend.acquire(f"{name}:{key}", emission, window, time.time())
+
+
+def _retry_seconds(delay: float) -> int:
+    return max(int(math.ceil(delay)), 1)
+
+
+class RateLimiter:
+    def __init__(self, requests_per_minute=60):
+        self.default_limit = (requests_per_minute, 60)
+
+    async def check(self, ip: str, path: str) -> int:
+        requests, window = get_limits("*", self.default_limit)
+        delay = await acquire("*", ip, requests, window)
+        if not delay and path in config.rate_limits:
+            requests, window = get_limits(path, self.default_limit)
+            delay = await acquire(path, ip, requests, window)
+        return _retry_seconds(delay) if delay else 0
 
     @web.middleware
     async def middleware(self, request, handler):
@@ -88,11 +188,12 @@ class RateLimiter:
         method = request.method
         path = request.path
         query = request.query_string
-        details, body_preview = await build_request_details(request)
+        captured = await build_request_details(request) if config.request_log_mode == "full" else None
 
         ban_entry = ban_manager.get_ban(ip)
         if ban_entry:
             log_error(f"Banned IP rejected: {ip} on {path} (reason: {ban_entry.get('reason')})")
+            details, body_preview = await capture_details(request, 403, captured)
             details["blocked_reason"] = f"banned: {ban_entry.get('reason', 'No reason provided')}"
             request_log.add(ip, method, path, query, 403, body_preview=body_preview, details=details)
             return web.json_response(
@@ -104,18 +205,22 @@ class RateLimiter:
                 status=403,
             )
 
-        if ip != "127.0.0.1" and self.is_rate_limited(ip):
+        retry_after = await self.check(ip, path) if ip != "127.0.0.1" else 0
+        if retry_after:
             log_error(f"Rate limit exceeded for IP: {ip} on {path}")
+            details, body_preview = await capture_details(request, 429, captured)
             details["blocked_reason"] = "rate limited"
             request_log.add(ip, method, path, query, 429, body_preview=body_preview, details=details)
             return web.json_response(
                 {"error": "Too Many Requests", "message": "Rate limit exceeded. Please try again in a minute."},
-                status=429
+                status=429,
+                headers={"Retry-After": str(retry_after)},
             )
 
         try:
             response = await handler(request)
             status = getattr(response, "status", 0)
+            details, body_preview = await capture_details(request, status, captured)
             auth_details = request.get("auth_details")
             if auth_details:
                 details["auth"] = auth_details
@@ -124,6 +229,7 @@ class RateLimiter:
             request_log.add(ip, method, path, query, status, body_preview=body_preview, details=details)
             return response
         except web.HTTPException as exc:
+            details, body_preview = await capture_details(request, exc.status, captured)
             auth_details = request.get("auth_details")
             if auth_details:
                 details["auth"] = auth_details
@@ -131,6 +237,7 @@ class RateLimiter:
             request_log.add(ip, method, path, query, exc.status, body_preview=body_preview, details=details)
             raise
         except Exception:
+            details, body_preview = await capture_details(request, 500, captured)
             auth_details = request.get("auth_details")
             if auth_details:
                 details["auth"] = auth_details
@@ -144,20 +251,12 @@ class EndpointRateLimiter:
         self.requests_per_window = requests_per_window
         self.window_seconds = window_seconds
         self.name = name
-        self.requests: dict = {}
-
-    def check(self, ip: str) -> tuple:
-        current_time = time.time()
-        timestamps = [t for t in self.requests.get(ip, []) if t > current_time - self.window_seconds]
-
-        if len(timestamps) >= self.requests_per_window:
-            oldest = min(timestamps)
-            retry_after = int(self.window_seconds - (current_time - oldest)) + 1
-            self.requests[ip] = timestamps
-            return False, max(retry_after, 1)
 
-        timestamps.append(current_time)
-        self.requests[ip] = timestamps
+    async def check(self, key: str) -> tuple:
+        requests, window = get_limits(self.name, (self.requests_per_window, self.window_seconds))
+        delay = await acquire(self.name, key, requests, window)
+        if delay:
+            return False, _retry_seconds(delay)
         return True, 0
 
 
@@ -1,39 +1,66 @@
-import time
+import asyncio
 import os
-import json
+import time
 from collections import deque
 from typing import List, Optional
 
+import aiofiles
+
+from services import json_utils as json
+from core.logger import log_error, log_debug
+
 MAX_ENTRIES = 100
 MAX_BODY_PREVIEW = 200
 MAX_HEADER_VALUE = 160
 MAX_HEADERS = 24
 MAX_QUERY_VALUE = 120
-LOG_FILE = "data/request_log.json"
+LOG_FILE = "data/request_log.ndjson"
+LEGACY_LOG_FILE = "data/request_log.json"
+FLUSH_INTERVAL_SECONDS = 2.0
+FLUSH_BATCH_SIZE = 256
+MAX_PENDING = 4096
+MAX_LOG_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 3
+TAIL_BLOCK_SIZE = 64 * 1024
 
 
 class RequestLog:
-    def __init__(self, max_entries: int = MAX_ENTRIES):
+    def __init__(self, max_entries: int = MAX_ENTRIES, path: str = LOG_FILE,
+                 flush_interval: float = FLUSH_INTERVAL_SECONDS, max_bytes: int = MAX_LOG_BYTES,
+                 backup_count: int = BACKUP_COUNT):
         self.entries: deque = deque(maxlen=max_entries)
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.dropped = 0
+        self.writes = 0
+        self._pending: deque = deque(maxlen=MAX_PENDING)
+        self._seq = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Future] = None
+        self._lock = asyncio.Lock()
         self._load()
 
     def _load(self):
         try:
-            if os.path.exists(LOG_FILE):
-                with open(LOG_FILE, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    if isinstance(data, list):
-                        self.entries.extend(data)
-        except Exception:
-            pass
-
-    def _save(self):
-        try:
-            os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
-            with open(LOG_FILE, "w", encoding="utf-8") as f:
-                json.dump(list(self.entries), f, indent=4, default=str)
-        except Exception:
-            pass
+            if os.path.exists(self.path):
+                for line in _read_tail(self.path, self.entries.maxlen):
+                    try:
+                        self.entries.append(json.loads(line))
+                    except ValueError:
+                        continue
+            elif self.path == LOG_FILE and os.path.exists(LEGACY_LOG_FILE):
+                with open(LEGACY_LOG_FILE, "rb") as f:
+                    data = json.loads(f.read())
+                if isinstance(data, list):
+                    for entry in data:
+                        self.entries.append(entry)
+                        self._pending.append(entry)
+                os.replace(LEGACY_LOG_FILE, LEGACY_LOG_FILE + ".migrated")
+        except Exception as e:
+            log_error(f"Failed to load request log: {e}")
+        self._seq = len(self.entries)
 
     def add(
         self,
@@ -45,9 +72,11 @@ class RequestLog:
         body_preview: str = "",
         details: Optional[dict] = None,
     ):
-        self.entries.append({
-            "id": f"{int(time.time())}-{len(self.entries)}",
-            "ts": int(time.time()),
+        now = int(time.time())
+        self._seq += 1
+        entry = {
+            "id": f"{now}-{self._seq}",
+            "ts": now,
             "ip": ip,
             "method": method,
             "path": path,
@@ -55,8 +84,79 @@ class RequestLog:
             "status": status,
             "body": sanitize_body_preview(body_preview or "", MAX_BODY_PREVIEW),
             "details": details or {},
-        })
-        self._save()
+        }
+        self.entries.append(entry)
+        if len(self._pending) == self._pending.maxlen:
+            self.dropped += 1
+        self._pending.append(entry)
+        self._schedule(immediate=len(self._pending) >= FLUSH_BATCH_SIZE)
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _schedule(self, immediate: bool = False):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if immediate:
+            if self._flush_task is None or self._flush_task.done():
+                self._flush_task = asyncio.ensure_future(self.flush())
+            return
+        if self._timer is None:
+            self._timer = loop.call_later(self.flush_interval, self._fire)
+
+    def _fire(self):
+        self._timer = None
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.ensure_future(self.flush())
+
+    def _encode(self, batch: List[dict]) -> bytes:
+        lines = []
+        for entry in batch:
+            try:
+                lines.append(json.dumps(entry, default=str))
+            except TypeError as e:
+                log_debug(f"Skipping unserializable request log entry {entry.get('id')}: {e}")
+        return b"".join(line + b"\n" for line in lines)
+
+    def _rotate(self):
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    async def flush(self):
+        async with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+
+            batch = list(self._pending)
+            self._pending.clear()
+            payload = self._encode(batch)
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                if os.path.exists(self.path) and os.path.getsize(self.path) + len(payload) > self.max_bytes:
+                    self._rotate()
+                async with aiofiles.open(self.path, "ab") as f:
+                    await f.write(payload)
+                self.writes += 1
+            except Exception as e:
+                log_error(f"Failed to write request log: {e}")
+                room = self._pending.maxlen - len(self._pending)
+                keep = batch[-room:] if room else []
+                self.dropped += len(batch) - len(keep)
+                self._pending.extendleft(reversed(keep))
+
+    async def close(self):
+        await self.flush()
 
     def get_recent(self, limit: Optional[int] = None, ip_filter: Optional[str] = None) -> List[dict]:
         items = list(self.entries)
@@ -70,7 +170,30 @@ class RequestLog:
 
     def clear(self):
         self.entries.clear()
-        self._save()
+        self._pending.clear()
+        paths = [self.path] + [f"{self.path}.{index}" for index in range(1, self.backup_count + 1)]
+        try:
+            for path in paths:
+                if os.path.exists(path):
+                    os.remove(path)
+        except OSError as e:
+            log_error(f"Failed to clear request log: {e}")
+
+
+def _read_tail(path: str, count: int) -> List[bytes]:
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        while position > 0 and data.count(b"\n") <= count:
+            step = min(TAIL_BLOCK_SIZE, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+    lines = [line for line in data.split(b"\n") if line.strip()]
+    if position > 0:
+        lines = lines[1:]
+    return lines[-count:]
 
 
 request_log = RequestLog()
@@ -0,0 +1,152 @@
+import asyncio
+import os
+import zlib
+from typing import Dict, Iterable, Optional
+
+import aiofiles
+
+from services import json_utils as json
+from core.logger import log_error, log_debug
+
+SHARD_COUNT = 64
+FLUSH_DELAY_SECONDS = 5.0
+META_FILE = "meta.json"
+SHARD_DIR = "shards"
+
+
+def shard_of(user_id: str, shard_count: int = SHARD_COUNT) -> int:
+    return zlib.crc32(str(user_id).encode("utf-8")) % shard_count
+
+
+class ShardedStore:
+    def __init__(self, directory: str, data: dict, user_keys: Iterable[str], meta_keys: Iterable[str],
+                 shard_count: int = SHARD_COUNT, flush_delay: float = FLUSH_DELAY_SECONDS):
+        self.directory = directory
+        self.data = data
+        self.user_keys = tuple(user_keys)
+        self.meta_keys = tuple(meta_keys)
+        self.shard_count = shard_count
+        self.flush_delay = flush_delay
+        self.shard_writes = 0
+        self._members: Dict[int, set] = {}
+        self._dirty: set = set()
+        self._meta_dirty = False
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def meta_path(self) -> str:
+        return os.path.join(self.directory, META_FILE)
+
+    def _shard_path(self, shard: int) -> str:
+        return os.path.join(self.directory, SHARD_DIR, f"{shard:03d}.json")
+
+    def exists(self) -> bool:
+        return os.path.exists(self.meta_path)
+
+    async def load(self) -> bool:
+        if not self.exists():
+            return False
+
+        meta = await self._read(self.meta_path)
+        for key in self.meta_keys:
+            if key in meta:
+                self.data[key] = meta[key]
+
+        for key in self.user_keys:
+            self.data[key] = {}
+        self._members = {}
+        for shard in range(self.shard_count):
+            path = self._shard_path(shard)
+            if not os.path.exists(path):
+                continue
+            for user_id, record in (await self._read(path)).items():
+                for key in self.user_keys:
+                    if key in record:
+                        self.data[key][user_id] = record[key]
+                self._members.setdefault(shard, set()).add(user_id)
+        return True
+
+    async def _read(self, path: str) -> dict:
+        async with aiofiles.open(path, json.get_read_mode()) as f:
+            return json.loads(await f.read())
+
+    def mark_user(self, user_id: str):
+        shard = shard_of(user_id, self.shard_count)
+        self._members.setdefault(shard, set()).add(user_id)
+        self._dirty.add(shard)
+        self._schedule()
+
+    def mark_meta(self):
+        self._meta_dirty = True
+        self._schedule()
+
+    def mark_all(self):
+        self._members = {}
+        for key in self.user_keys:
+            for user_id in self.data.get(key, {}):
+                self._members.setdefault(shard_of(user_id, self.shard_count), set()).add(user_id)
+        self._dirty = set(range(self.shard_count))
+        self._meta_dirty = True
+        self._schedule()
+
+    def pending(self) -> int:
+        return len(self._dirty) + (1 if self._meta_dirty else 0)
+
+    def _schedule(self):
+        if self._timer is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._timer = loop.call_later(self.flush_delay, self._fire)
+
+    def _fire(self):
+        self._timer = None
+        asyncio.ensure_future(self.flush())
+
+    def _shard_payload(self, shard: int) -> dict:
+        payload = {}
+        members = self._members.get(shard, set())
+        for user_id in list(members):
+            record = {key: self.data[key][user_id] for key in self.user_keys if user_id in self.data.get(key, {})}
+            if record:
+                payload[user_id] = record
+            else:
+                members.discard(user_id)
+        return payload
+
+    async def flush(self):
+        async with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            dirty, self._dirty = self._dirty, set()
+            meta_dirty, self._meta_dirty = self._meta_dirty or not self.exists(), False
+            if not dirty and not meta_dirty:
+                return
+
+            try:
+                os.makedirs(os.path.join(self.directory, SHARD_DIR), exist_ok=True)
+                for shard in sorted(dirty):
+                    await self._write_atomic(self._shard_path(shard), json.dumps(self._shard_payload(shard)))
+                    self.shard_writes += 1
+                if meta_dirty:
+                    meta = {key: self.data.get(key) for key in self.meta_keys}
+                    await self._write_atomic(self.meta_path, json.dumps(meta))
+                log_debug(f"Flushed {len(dirty)} shards to {self.directory}")
+            except Exception as e:
+                self._dirty |= dirty
+                self._meta_dirty = self._meta_dirty or meta_dirty
+                log_error(f"Failed to save sharded data in {self.directory}: {e}")
+
+    async def _write_atomic(self, path: str, content: bytes):
+        temp_path = path + ".tmp"
+        async with aiofiles.open(temp_path, json.get_write_mode()) as f:
+            await f.write(content)
+        os.replace(temp_path, path)
+
+    async def close(self):
+        await self.flush()
@@ -1,8 +1,123 @@
 import time
-import asyncio
+from collections import OrderedDict
 from core.logger import log_info, log_debug
 from services.xp_calculations import get_dungeon_level, get_total_xp_for_level, calculate_dungeon_xp_per_run
 from core.config import config
+from services.worker_pool import worker_pool
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+SIM_CHUNK_MIN = 64
+SIM_CHUNK_MAX = 4096
+SIM_BACKOFF_MAX = 256
+SIM_MEMO_SIZE = 512
+
+_MEMO: OrderedDict = OrderedDict()
+_MEMO_STATS = {"hits": 0, "misses": 0}
+
+
+def _scalar_runs(left: list, full: list, quarter: list, done: list, limit: int, history: list):
+    runs = 0
+    while runs < limit:
+        maxval = max(left)
+        if maxval <= 0:
+            return runs, left, True
+        index = left.index(maxval)
+        left = [value - q for value, q in zip(left, quarter)]
+        left[index] = maxval - full[index]
+        done[index] += 1
+        history.append(index)
+        runs += 1
+    return runs, left, False
+
+
+def _speculate(history: list, n: int):
+    for period in range(1, 2 * n + 1):
+        if len(history) < 2 * period:
+            break
+        if history[-period:] == history[-2 * period:-period]:
+            return history[-period:]
+    return None
+
+
+def _rotation(left: list, full: list):
+    maxval = max(left)
+    if maxval <= 0:
+        return None
+    floor = max(maxval - full[left.index(maxval)], 0)
+    return sorted((i for i, value in enumerate(left) if value > floor), key=lambda i: -left[i])
+
+
+def _simulate_runs(left: list, full: list, quarter: list, max_runs: int):
+    n = len(left)
+    left = list(left)
+    done = [0] * n
+    runs = 0
+    if not left:
+        return runs, left, done
+
+    if not NUMPY_AVAILABLE:
+        runs, left, _ = _scalar_runs(left, full, quarter, done, max_runs, [])
+        return runs, left, done
+
+    full_arr = np.array(full, dtype=np.float64)[:, None]
+    quarter_arr = np.array(quarter, dtype=np.float64)[:, None]
+    rows = np.arange(n)[:, None]
+    columns = np.arange(SIM_CHUNK_MAX)
+    history = []
+    chunk = SIM_CHUNK_MIN
+    backoff = 0
+    cooldown = 0
+    missed = False
+
+    while runs < max_runs:
+        pattern = None
+        if cooldown <= 0:
+            pattern = _rotation(left, full) if missed else _speculate(history, n)
+        if pattern is None:
+            taken, left, finished = _scalar_runs(
+                left, full, quarter, done, min(max(cooldown, n), max_runs - runs), history
+            )
+            runs += taken
+            cooldown -= taken
+            del history[:-4 * n]
+            if finished:
+                break
+            continue
+
+        length = min(chunk, max_runs - runs)
+        choices = np.array((pattern * (length // len(pattern) + 1))[:length])
+        steps = np.where(choices == rows, full_arr, quarter_arr)
+        trajectory = np.subtract.accumulate(
+            np.concatenate([np.array(left, dtype=np.float64)[:, None], steps], axis=1), axis=1
+        )
+        states = trajectory[:, :length]
+        valid = (states.argmax(axis=0) == choices) & (states[choices, columns[:length]] > 0)
+        accepted = length if valid.all() else int(valid.argmin())
+
+        if accepted:
+            left = trajectory[:, accepted].tolist()
+            for i, count in enumerate(np.bincount(choices[:accepted], minlength=n).tolist()):
+                done[i] += count
+            runs += accepted
+            history = choices[max(0, accepted - 4 * n):accepted].tolist()
+
+        if accepted == length:
+            chunk = min(chunk * 2, SIM_CHUNK_MAX)
+            backoff = 0
+            missed = False
+        else:
+            chunk = min(max(SIM_CHUNK_MIN, accepted * 2), SIM_CHUNK_MAX)
+            if accepted < SIM_CHUNK_MIN and missed:
+                backoff = min(backoff * 2 or SIM_CHUNK_MIN, SIM_BACKOFF_MAX)
+                cooldown = backoff
+            missed = not missed
+
+    return runs, left, done
 
 
 def simulate_to_level_all50(dungeon_classes: dict, floor_xp: float, bonuses: dict,
@@ -42,40 +157,15 @@ def simulate_to_level_all50(dungeon_classes: dict, floor_xp: float, bonuses: dic
     log_debug(f"Target XP for level {target_level}: {target_xp}")
     log_debug(f"Initial remaining XP: {classxpsleft}")
 
-    while runs < max_runs:
-        allnegative = True
-        for c in classes:
-            if classxpsleft[c] > 0:
-                allnegative = False
-                break
-        if allnegative:
-            break
-        
-        runs += 1
-        
-        maxval = -1
-        maxindex = None
-        for c in classes:
-            if classxpsleft[c] > maxval:
-                maxval = classxpsleft[c]
-                maxindex = c
-        
-        if maxindex is None:
-            break
-        
-        for c in classes:
-            if c == maxindex:
-                classxpsleft[c] -= per_class_base[c]
-                runs_done[c] += 1
-            else:
-                classxpsleft[c] -= per_class_base[c] * 0.25
-        
-        for c in classes:
-            classes[c] = target_xp - classxpsleft[c]
+    names = list(classes)
+    full = [per_class_base[c] for c in names]
+    quarter = [per_class_base[c] * 0.25 for c in names]
+    runs, left, done = _simulate_runs([classxpsleft[c] for c in names], full, quarter, max_runs)
 
-        if runs % 5000 == 0:
-            avg_lvl = {c: round(get_dungeon_level(xp), 2) for c, xp in classes.items()}
-            log_debug(f"#{runs:,} runs → levels: {avg_lvl}")
+    for i, c in enumerate(names):
+        runs_done[c] = done[i]
+        if runs:
+            classes[c] = target_xp - left[i]
 
     elapsed = time.perf_counter() - start_time
     log_debug(f"🏁 Simulation completed after {runs:,} runs ({elapsed*1000:.2f}ms)")
@@ -93,12 +183,63 @@ def simulate_to_level_all50(dungeon_classes: dict, floor_xp: float, bonuses: dic
 
     return runs, results
 
+def _quantize(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return round(float(value), 6)
+    return value
+
+
+def _memo_key(dungeon_classes: dict, floor_xp: float, bonuses: dict, target_level: int) -> tuple:
+    return (
+        tuple((c, round(float(xp))) for c, xp in dungeon_classes.items()),
+        _quantize(floor_xp),
+        tuple(sorted((k, _quantize(v)) for k, v in bonuses.items() if k != "class_boosts")),
+        tuple(sorted((c, _quantize(v)) for c, v in (bonuses.get("class_boosts") or {}).items())),
+        target_level,
+    )
+
+
+def _copy_result(result: tuple) -> tuple:
+    runs, results = result
+    return runs, {c: dict(r) for c, r in results.items()}
+
+
+def get_simulation_memo_stats() -> dict:
+    total = _MEMO_STATS["hits"] + _MEMO_STATS["misses"]
+    return {
+        "hits": _MEMO_STATS["hits"],
+        "misses": _MEMO_STATS["misses"],
+        "entries": len(_MEMO),
+        "max_entries": SIM_MEMO_SIZE,
+        "hit_rate": round(_MEMO_STATS["hits"] / total, 3) if total else 0.0,
+    }
+
+
+def clear_simulation_memo():
+    _MEMO.clear()
+    _MEMO_STATS["hits"] = 0
+    _MEMO_STATS["misses"] = 0
+
+
 async def simulate_async(dungeon_classes: dict, floor_xp: float, bonuses: dict):
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(
-        None, 
-        simulate_to_level_all50, 
-        dungeon_classes, 
-        floor_xp, 
-        bonuses
+    key = _memo_key(dungeon_classes, floor_xp, bonuses, config.target_level)
+    cached = _MEMO.get(key)
+    if cached is not None:
+        _MEMO.move_to_end(key)
+        _MEMO_STATS["hits"] += 1
+        return _copy_result(cached)
+
+    _MEMO_STATS["misses"] += 1
+    result = await worker_pool.run(
+        "simulation",
+        simulate_to_level_all50,
+        dungeon_classes,
+        floor_xp,
+        bonuses,
+        config.target_level
     )
+    _MEMO[key] = _copy_result(result)
+    _MEMO.move_to_end(key)
+    while len(_MEMO) > SIM_MEMO_SIZE:
+        _MEMO.popitem(last=False)
+    return result
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import re
 import base64
@@ -16,11 +17,10 @@ CLASS_NAMES = {"archer", "berserk", "healer", "mage", "tank"}
 
 
 async def _get_session():
-    from services.api import _SESSION, init_session
-    if not _SESSION:
-        await init_session()
-    from services.api import _SESSION
-    return _SESSION
+    from services import api
+    if not api._SESSION:
+        await api.init_session()
+    return api._session_for("skycrypt")
 
 
 async def _get_build_info() -> Optional[tuple]:
@@ -30,8 +30,7 @@ async def _get_build_info() -> Optional[tuple]:
 
     session = await _get_session()
     try:
-        import aiohttp
-        async with session.get(f"{SKYCRYPT_BASE}/stats/BLACKUM", timeout=aiohttp.ClientTimeout(total=10)) as resp:
+        async with session.get(f"{SKYCRYPT_BASE}/stats/BLACKUM") as resp:
             if resp.status != 200:
                 return None
             html = await resp.text()
@@ -40,7 +39,7 @@ async def _get_build_info() -> Optional[tuple]:
         if not app_match:
             return None
             
-        async with session.get(f"{SKYCRYPT_BASE}{app_match.group(0)}", timeout=aiohttp.ClientTimeout(total=10)) as resp:
+        async with session.get(f"{SKYCRYPT_BASE}{app_match.group(0)}") as resp:
             if resp.status != 200:
                 return None
             app_js = await resp.text()
@@ -49,7 +48,7 @@ async def _get_build_info() -> Optional[tuple]:
         if not node4_match:
             return None
             
-        async with session.get(f"{SKYCRYPT_BASE}/_app/immutable/{node4_match.group(0)}", timeout=aiohttp.ClientTimeout(total=10)) as resp:
+        async with session.get(f"{SKYCRYPT_BASE}/_app/immutable/{node4_match.group(0)}") as resp:
             if resp.status != 200:
                 return None
             node4_js = await resp.text()
@@ -59,7 +58,7 @@ async def _get_build_info() -> Optional[tuple]:
         rjson_header = "__skrao"
         
         for chunk in chunks:
-            async with session.get(f"{SKYCRYPT_BASE}/_app/immutable/chunks/{chunk}.js", timeout=aiohttp.ClientTimeout(total=10)) as resp:
+            async with session.get(f"{SKYCRYPT_BASE}/_app/immutable/chunks/{chunk}.js") as resp:
                 if resp.status == 200:
                     chunk_js = await resp.text()
                     
@@ -98,8 +97,7 @@ async def get_skycrypt_profile(ign: str, profile_name: Optional[str] = None) ->
     session = await _get_session()
     url = f"{SKYCRYPT_BASE}/api/stats/{ign}"
     try:
-        import aiohttp
-        async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+        async with session.get(url) as resp:
             if resp.status != 200:
                 log_error(f"SkyCrypt profile fetch failed ({resp.status}) for {ign}")
                 return None
@@ -240,12 +238,11 @@ def _make_floor_key(name: str, is_master: bool) -> Optional[str]:
 
 
 async def _call_dungeon_endpoint(session, build_id: str, rjson_header: str, uuid_no_dashes: str, profile_id: str) -> Optional[dict]:
-    import aiohttp
     payload_data = [[rjson_header, 1], {"profileId": 2, "uuid": 3}, profile_id, uuid_no_dashes]
     payload_b64 = base64.b64encode(json.dumps(payload_data, separators=(",", ":")).encode()).decode()
     url = f"{SKYCRYPT_BASE}/_app/remote/{build_id}/getDungeonsSection?payload={payload_b64}"
     try:
-        async with session.get(url, timeout=aiohttp.ClientTimeout(total=15)) as resp:
+        async with session.get(url) as resp:
             if resp.status != 200:
                 return None, resp.status
             envelope = await resp.json(content_type=None)
@@ -255,20 +252,7 @@ async def _call_dungeon_endpoint(session, build_id: str, rjson_header: str, uuid
         return None, 0
 
 
-async def get_dungeon_stats_skycrypt(ign: str, profile_name: Optional[str] = None) -> Optional[dict]:
-    cache_key = f"skycrypt_dungeons_{ign.lower()}_{(profile_name or '').lower()}"
-    cached = await cache_get(cache_key)
-    if cached:
-        return cached
-
-    profile_info = await get_skycrypt_profile(ign, profile_name)
-    if not profile_info:
-        log_error(f"Could not get SkyCrypt profile for {ign}")
-        return None
-
-    uuid, profile_id, profile_cute_name = profile_info
-    uuid_no_dashes = uuid.replace("-", "")
-
+async def _fetch_dungeon_section(uuid_no_dashes: str, profile_id: str) -> Optional[dict]:
     build_info = await _get_build_info()
     if not build_info:
         return None
@@ -287,7 +271,7 @@ async def get_dungeon_stats_skycrypt(ign: str, profile_name: Optional[str] = Non
         envelope, status = await _call_dungeon_endpoint(session, build_id, rjson_header, uuid_no_dashes, profile_id)
 
     if status != 200 or envelope is None:
-        log_error(f"SkyCrypt dungeon fetch failed (status={status}) for {ign}")
+        log_error(f"SkyCrypt dungeon fetch failed (status={status}) for {uuid_no_dashes}/{profile_id}")
         return None
 
     if envelope.get("type") != "result":
@@ -295,10 +279,36 @@ async def get_dungeon_stats_skycrypt(ign: str, profile_name: Optional[str] = Non
         return None
 
     try:
-        raw = json.loads(envelope["result"])
-        result = _parse_dungeon_data(raw)
-        await cache_set(cache_key, result, ttl=DUNGEON_TTL)
-        return result
+        return _parse_dungeon_data(json.loads(envelope["result"]))
     except Exception as e:
-        log_error(f"Failed to parse SkyCrypt dungeon data for {ign}: {e}")
+        log_error(f"Failed to parse SkyCrypt dungeon data for {uuid_no_dashes}/{profile_id}: {e}")
         return None
+
+
+async def fetch_dungeon_sections(uuid: str, profile_ids: list) -> dict:
+    uuid_no_dashes = uuid.replace("-", "")
+    if not profile_ids or not await _get_build_info():
+        return {}
+
+    results = await asyncio.gather(
+        *(_fetch_dungeon_section(uuid_no_dashes, profile_id) for profile_id in profile_ids)
+    )
+    return {profile_id: stats for profile_id, stats in zip(profile_ids, results) if stats}
+
+
+async def get_dungeon_stats_skycrypt(ign: str, profile_name: Optional[str] = None) -> Optional[dict]:
+    cache_key = f"skycrypt_dungeons_{ign.lower()}_{(profile_name or '').lower()}"
+    cached = await cache_get(cache_key)
+    if cached:
+        return cached
+
+    profile_info = await get_skycrypt_profile(ign, profile_name)
+    if not profile_info:
+        log_error(f"Could not get SkyCrypt profile for {ign}")
+        return None
+
+    uuid, profile_id, profile_cute_name = profile_info
+    result = await _fetch_dungeon_section(uuid.replace("-", ""), profile_id)
+    if result is not None:
+        await cache_set(cache_key, result, ttl=DUNGEON_TTL)
+    return result
@@ -9,6 +9,7 @@ SOLO_DATA_FILE = "data/solo_clears.json"
 class SoloManager:
     def __init__(self):
         self.data = {}
+        self.version = 0
 
     async def initialize(self):
         await self.load_data()
@@ -23,11 +24,13 @@ class SoloManager:
             async with aiofiles.open(SOLO_DATA_FILE, json.get_read_mode()) as f:
                 content = await f.read()
                 self.data = json.loads(content)
+            self.version += 1
             log_info(f"Loaded solo clears data for {len(self.data)} floors.")
         except Exception as e:
             log_error(f"Failed to load solo clears data: {e}")
 
     async def _save_data(self):
+        self.version += 1
         try:
             temp_path = SOLO_DATA_FILE + ".tmp"
             async with aiofiles.open(temp_path, json.get_write_mode()) as f:
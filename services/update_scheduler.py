@@ -0,0 +1,70 @@
+import asyncio
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+DEFAULT_PROVIDER_RATE = 2.0
+BURST_SECONDS = 2.0
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = max(rate, 0.01)
+        self.capacity = max(capacity if capacity is not None else self.rate * BURST_SECONDS, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def try_acquire(self, now: Optional[float] = None) -> bool:
+        self._refill(time.monotonic() if now is None else now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def wait_time(self, now: Optional[float] = None) -> float:
+        self._refill(time.monotonic() if now is None else now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class ProviderBudget:
+    def __init__(self, providers: Iterable[str], rates: Optional[Dict[str, float]] = None,
+                 is_open: Optional[Callable[[str], bool]] = None):
+        rates = rates or {}
+        self.buckets = {
+            name: TokenBucket(rates.get(name, DEFAULT_PROVIDER_RATE))
+            for name in providers
+        }
+        self.spent = {name: 0 for name in self.buckets}
+        self.is_open = is_open or (lambda name: False)
+        self._lock = asyncio.Lock()
+
+    def _candidates(self) -> list:
+        healthy = [name for name in self.buckets if not self.is_open(name)]
+        return healthy or list(self.buckets)
+
+    async def acquire(self) -> Optional[str]:
+        if not self.buckets:
+            return None
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                candidates = self._candidates()
+                for name in candidates:
+                    if self.buckets[name].try_acquire(now):
+                        self.spent[name] += 1
+                        return name
+                await asyncio.sleep(min(self.buckets[name].wait_time(now) for name in candidates))
+
+    def stats(self) -> dict:
+        return {
+            name: {"rate": bucket.rate, "tokens": round(bucket.tokens, 2), "spent": self.spent[name]}
+            for name, bucket in self.buckets.items()
+        }
@@ -1,13 +1,23 @@
 import matplotlib.pyplot as plt
 import io
 import discord
-from concurrent.futures import ThreadPoolExecutor
-import asyncio
 from services.xp_calculations import get_dungeon_level
 from core.config import config
+from services.worker_pool import worker_pool
+from services import chart_renderer
+from core.logger import log_error
 
 plt.switch_backend('Agg')
 
+CLASS_COLORS = {
+    'Archer': '#2ecc71',
+    'Berserk': '#e74c3c',
+    'Healer': '#f1c40f',
+    'Mage': '#3498db',
+    'Tank': '#95a5a6'
+}
+RTCA_CLASSES = ["healer", "mage", "berserk", "archer", "tank"]
+
 def _create_combined_graph(class_data: dict, floors_data: dict, cata_level: float):
     classes = list(class_data.keys())
     levels = list(class_data.values())
@@ -89,18 +99,49 @@ def _create_combined_graph(class_data: dict, floors_data: dict, cata_level: floa
 
     buf = io.BytesIO()
     plt.savefig(buf, format='png', dpi=100, bbox_inches='tight')
-    buf.seek(0)
     plt.close(fig)
-    return buf
+    return buf.getvalue()
+
+def _pillow_combined_graph(class_data: dict, floors_data: dict, cata_level: float):
+    pairs = sorted(class_data.items(), key=lambda x: x[1])
+    floor_order = ["Entrance", "F1", "F2", "F3", "F4", "F5", "F6", "F7", "M1", "M2", "M3", "M4", "M5", "M6", "M7"]
+    floors = [(f, floors_data[f]["runs"]) for f in floor_order if f in floors_data and floors_data[f]["runs"] > 0]
+
+    return chart_renderer.render_bar_panels([
+        {
+            "title": f"Class Levels (Cata {cata_level:.2f})",
+            "labels": [c for c, _ in pairs],
+            "values": [lvl for _, lvl in pairs],
+            "colors": [CLASS_COLORS.get(c, '#ffffff') for c, _ in pairs],
+            "texts": [(f"{lvl:.1f}", '#ffffff') for _, lvl in pairs],
+            "xlabel": "Level",
+        },
+        {
+            "title": "Floor Completions",
+            "labels": [f for f, _ in floors],
+            "values": [count for _, count in floors],
+            "colors": ['#d35400' if f.startswith('M') else '#9b59b6' for f, _ in floors],
+            "texts": [(f"{count:.0f}", '#ffffff') for _, count in floors],
+            "xlabel": "Runs",
+            "empty_text": "No Runs Data",
+        },
+    ], 1200, 500)
+
+def _render_dungeon_graph(renderer: str, class_data: dict, floors_data: dict, cata_level: float):
+    if renderer == "pillow":
+        try:
+            return _pillow_combined_graph(class_data, floors_data, cata_level)
+        except Exception as e:
+            log_error(f"Pillow dungeon graph failed, falling back to matplotlib: {e}")
+    return _create_combined_graph(class_data, floors_data, cata_level)
 
 async def generate_dungeon_graph(class_data: dict, floors_data: dict, cata_level: float):
-    loop = asyncio.get_running_loop()
-    with ThreadPoolExecutor() as pool:
-        buf = await loop.run_in_executor(pool, _create_combined_graph, class_data, floors_data, cata_level)
-    
-    return discord.File(buf, filename="dungeon_stats.png")
+    png = await worker_pool.run(
+        "dungeon_graph", _render_dungeon_graph, config.graph_renderer, class_data, floors_data, cata_level
+    )
+    return discord.File(io.BytesIO(png), filename="dungeon_stats.png")
 
-def _create_rtca_graph(current_xp_data: dict, simulation_results: dict, ign: str):
+def _create_rtca_graph(current_xp_data: dict, simulation_results: dict, ign: str, target_level: int):
     classes = ["healer", "mage", "berserk", "archer", "tank"]
     
     labels = [c.capitalize() for c in classes]
@@ -131,7 +172,7 @@ def _create_rtca_graph(current_xp_data: dict, simulation_results: dict, ign: str
     
     ax1.set_facecolor('#2b2d31')
     
-    target = config.target_level
+    target = target_level
     ax1.barh(labels, [target]*5, color='#40444b', height=0.6, label='Target')
     
     bars1 = ax1.barh(labels, current_levels, color=bar_colors, height=0.6, label='Current')
@@ -183,13 +224,45 @@ def _create_rtca_graph(current_xp_data: dict, simulation_results: dict, ign: str
     
     buf = io.BytesIO()
     plt.savefig(buf, format='png', dpi=100, bbox_inches='tight')
-    buf.seek(0)
     plt.close(fig)
-    return buf
+    return buf.getvalue()
+
+def _pillow_rtca_graph(current_xp_data: dict, simulation_results: dict, ign: str, target_level: int):
+    labels = [c.capitalize() for c in RTCA_CLASSES]
+    levels = [get_dungeon_level(current_xp_data.get(c, 0)) for c in RTCA_CLASSES]
+    runs = [int(simulation_results.get(c, {}).get("runs_done", 0)) for c in RTCA_CLASSES]
+    colors = [CLASS_COLORS.get(l, '#ffffff') for l in labels]
+
+    return chart_renderer.render_bar_panels([
+        {
+            "title": f"Class Levels ({ign})",
+            "labels": labels,
+            "values": levels,
+            "colors": colors,
+            "texts": [(f"{lvl:.2f}", '#ffffff') for lvl in levels],
+            "xmax": target_level * 1.05,
+            "track": target_level,
+        },
+        {
+            "title": "Runs Needed to Max",
+            "labels": labels,
+            "values": runs,
+            "colors": colors,
+            "texts": [(f"{r:,}", '#ffffff') if r > 0 else ("DONE", '#2ecc71') for r in runs],
+        },
+    ], 1400, 600)
+
+def _render_rtca_graph(renderer: str, current_xp_data: dict, simulation_results: dict, ign: str, target_level: int):
+    if renderer == "pillow":
+        try:
+            return _pillow_rtca_graph(current_xp_data, simulation_results, ign, target_level)
+        except Exception as e:
+            log_error(f"Pillow RTCA graph failed, falling back to matplotlib: {e}")
+    return _create_rtca_graph(current_xp_data, simulation_results, ign, target_level)
 
 async def generate_rtca_graph(current_xp_data: dict, simulation_results: dict, ign: str):
-    loop = asyncio.get_running_loop()
-    with ThreadPoolExecutor() as pool:
-        buf = await loop.run_in_executor(pool, _create_rtca_graph, current_xp_data, simulation_results, ign)
-    
-    return discord.File(buf, filename="rtca_stats.png")
+    png = await worker_pool.run(
+        "rtca_graph", _render_rtca_graph, config.graph_renderer,
+        current_xp_data, simulation_results, ign, config.target_level
+    )
+    return discord.File(io.BytesIO(png), filename="rtca_stats.png")
@@ -0,0 +1,198 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional
+
+from core.config import config
+from core.logger import log_info, log_error
+
+QUEUE_WAIT_TIMEOUT = 15.0
+WARMUP_TIMEOUT = 60.0
+LATENCY_WINDOW = 200
+WARM_MODULES = (
+    "matplotlib.pyplot",
+    "PIL.Image",
+    "services.visualization",
+    "services.map_renderer",
+    "services.simulation_logic",
+)
+
+
+class WorkerPoolBusy(Exception):
+    pass
+
+
+_warmup_barrier = None
+
+
+def _init_worker(barrier=None):
+    global _warmup_barrier
+    _warmup_barrier = barrier
+
+    import importlib
+    import matplotlib
+    matplotlib.use("Agg")
+
+    from core import logger as bot_logger
+    bot_logger.logger.removeHandler(bot_logger.queue_handler)
+    bot_logger.logger.addHandler(bot_logger.console_handler)
+
+    for name in WARM_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            log_error(f"Worker could not preload {name}: {e}")
+
+
+def _ping() -> int:
+    if _warmup_barrier is not None:
+        try:
+            _warmup_barrier.wait(WARMUP_TIMEOUT)
+        except threading.BrokenBarrierError:
+            pass
+    return os.getpid()
+
+
+class _TaskStats:
+    __slots__ = ("completed", "errors", "rejected", "wait_total", "max_latency", "latencies")
+
+    def __init__(self):
+        self.completed = 0
+        self.errors = 0
+        self.rejected = 0
+        self.wait_total = 0.0
+        self.max_latency = 0.0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, wait: float, latency: float):
+        self.completed += 1
+        self.wait_total += wait
+        self.max_latency = max(self.max_latency, latency)
+        self.latencies.append(latency)
+
+    def stats(self) -> dict:
+        recent = sorted(self.latencies)
+        return {
+            "completed": self.completed,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.wait_total / self.completed * 1000, 2) if self.completed else 0.0,
+            "avg_ms": round(sum(recent) / len(recent) * 1000, 2) if recent else 0.0,
+            "p95_ms": round(recent[min(len(recent) - 1, int(len(recent) * 0.95))] * 1000, 2) if recent else 0.0,
+            "max_ms": round(self.max_latency * 1000, 2),
+        }
+
+
+class WorkerPool:
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._stats: Dict[str, _TaskStats] = {}
+        self.workers = 0
+        self.warmed = 0
+        self.max_pending = 0
+        self.pending = 0
+
+    @staticmethod
+    def _context():
+        methods = multiprocessing.get_all_start_methods()
+        return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        context = self._context()
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(context.Barrier(self.workers),),
+        )
+
+    def _ensure_slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self.max_pending = max(1, self.max_pending or config.worker_queue_depth)
+            self._slots = asyncio.Semaphore(self.max_pending)
+        return self._slots
+
+    async def start(self, workers: Optional[int] = None, max_pending: Optional[int] = None):
+        self.workers = max(0, workers if workers is not None else config.worker_processes)
+        self.max_pending = max(1, max_pending if max_pending is not None else config.worker_queue_depth)
+        self._slots = asyncio.Semaphore(self.max_pending)
+        if self.workers == 0:
+            log_info("Worker pool disabled, CPU tasks will run in threads.")
+            return
+
+        try:
+            self._executor = self._create_executor()
+            loop = asyncio.get_running_loop()
+            pids = await asyncio.gather(*(loop.run_in_executor(self._executor, _ping) for _ in range(self.workers)))
+            self.warmed = len(set(pids))
+            if self.warmed != self.workers:
+                log_error(f"Only {self.warmed} of {self.workers} worker processes answered the warmup.")
+            log_info(f"Started {self.warmed} warm worker processes (queue depth {self.max_pending}).")
+        except Exception as e:
+            log_error(f"Failed to start worker pool, falling back to threads: {e}")
+            self._discard_executor()
+
+    def _discard_executor(self):
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _restart(self):
+        self._discard_executor()
+        try:
+            self._executor = self._create_executor()
+        except Exception as e:
+            log_error(f"Failed to restart worker pool: {e}")
+
+    async def run(self, name: str, fn: Callable, *args):
+        stats = self._stats.setdefault(name, _TaskStats())
+        slots = self._ensure_slots()
+        queued_at = time.perf_counter()
+        try:
+            await asyncio.wait_for(slots.acquire(), QUEUE_WAIT_TIMEOUT)
+        except asyncio.TimeoutError:
+            stats.rejected += 1
+            raise WorkerPoolBusy(f"Worker pool is saturated ({self.max_pending} tasks pending)")
+
+        started = time.perf_counter()
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            try:
+                result = await loop.run_in_executor(self._executor, fn, *args)
+            except BrokenProcessPool:
+                log_error(f"Worker pool broke while running {name}, restarting it.")
+                self._restart()
+                result = await loop.run_in_executor(None, fn, *args)
+            stats.record(started - queued_at, time.perf_counter() - started)
+            return result
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            self.pending -= 1
+            slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "mode": "process" if self._executor is not None else "thread",
+            "workers": self.workers,
+            "warmed": self.warmed,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "tasks": {name: task.stats() for name, task in self._stats.items()},
+        }
+
+    async def shutdown(self):
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.get_running_loop().run_in_executor(None, lambda: executor.shutdown(wait=True, cancel_futures=True))
+
+
+worker_pool = WorkerPool()
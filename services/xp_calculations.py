@@ -1,40 +1,47 @@
+import bisect
 import math
 from core.game_data import DUNGEON_XP
 
+CUMULATIVE_XP = [0]
+for _xp in DUNGEON_XP[1:]:
+    CUMULATIVE_XP.append(CUMULATIVE_XP[-1] + _xp)
+MAX_TABLE_LEVEL = len(DUNGEON_XP) - 1
+OVERFLOW_XP = DUNGEON_XP[-1]
+
 
 def get_total_xp_for_level(level: float) -> float:
-    total = 0.0
     level_int = math.floor(level)
-    for i in range(1, min(level_int + 1, len(DUNGEON_XP))):
-        total += DUNGEON_XP[i]
     if level_int + 1 < len(DUNGEON_XP):
+        total = float(CUMULATIVE_XP[max(level_int, 0)])
         frac = level - level_int
         if frac > 0:
             total += DUNGEON_XP[level_int + 1] * frac
         return total
-    base_levels = len(DUNGEON_XP) - 1
-    total = sum(DUNGEON_XP[1:base_levels + 1])
-    if level > base_levels:
-        extra_levels = level - base_levels
+    total = CUMULATIVE_XP[-1]
+    if level > MAX_TABLE_LEVEL:
+        extra_levels = level - MAX_TABLE_LEVEL
         extra_whole = math.floor(extra_levels)
-        total += extra_whole * DUNGEON_XP[-1]
+        total += extra_whole * OVERFLOW_XP
         frac = extra_levels - extra_whole
         if frac > 0:
-            total += DUNGEON_XP[-1] * frac
+            total += OVERFLOW_XP * frac
     return total
 
 
+def _raw_level(xp: float) -> float:
+    i = bisect.bisect_right(CUMULATIVE_XP, xp)
+    if i > MAX_TABLE_LEVEL:
+        return MAX_TABLE_LEVEL + (xp - CUMULATIVE_XP[-1]) / OVERFLOW_XP
+    i = max(i, 1)
+    return i - 1 + (xp - CUMULATIVE_XP[i - 1]) / DUNGEON_XP[i]
+
+
 def get_dungeon_level(xp: float) -> float:
-    total = 0.0
-    for i in range(1, len(DUNGEON_XP)):
-        total += DUNGEON_XP[i]
-        if xp < total:
-            prev = total - DUNGEON_XP[i]
-            progress = (xp - prev) / DUNGEON_XP[i]
-            return round(i - 1 + progress, 2)
-    extra = xp - total
-    extra_levels = extra / DUNGEON_XP[-1]
-    return round((len(DUNGEON_XP) - 1) + extra_levels, 2)
+    return round(_raw_level(xp), 2)
+
+
+def levels_for(xps) -> list:
+    return [round(_raw_level(xp), 2) for xp in xps]
 
 
 def get_class_average(classes_data: dict) -> float:
@@ -0,0 +1,282 @@
+import asyncio
+import bisect
+import os
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import aiofiles
+
+from core.logger import log_debug, log_error
+
+CLASSES = ["archer", "berserk", "healer", "mage", "tank"]
+NORMAL_FLOORS = [str(i) for i in range(0, 8)]
+MASTER_FLOORS = [str(i) for i in range(1, 8)]
+
+COLUMNS = (
+    ["cata_xp"]
+    + [f"class_{cls}" for cls in CLASSES]
+    + [f"normal_{floor}" for floor in NORMAL_FLOORS]
+    + [f"master_{floor}" for floor in MASTER_FLOORS]
+)
+XP_SCALE = 100
+LOOKBACK_MONTHS = 2
+
+
+def _month_key(ts: int) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m")
+
+
+def _previous_month(month: str) -> str:
+    year, mon = (int(part) for part in month.split("-"))
+    if mon == 1:
+        return f"{year - 1}-12"
+    return f"{year}-{mon - 1:02d}"
+
+
+def _months_between(start_ts: int, end_ts: int) -> List[str]:
+    months = []
+    month = _month_key(end_ts)
+    first = _month_key(start_ts)
+    while True:
+        months.append(month)
+        if month <= first:
+            break
+        month = _previous_month(month)
+    return list(reversed(months))
+
+
+def _write_varint(buf: bytearray, value: int):
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            buf.append(byte | 0x80)
+        else:
+            buf.append(byte)
+            return
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    return value << 1 if value >= 0 else ((-value) << 1) - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def encode_sample(entry: dict) -> List[int]:
+    classes = entry.get("classes", {}) or {}
+    runs = entry.get("runs", {}) or {}
+    normal = runs.get("normal", {}) or {}
+    master = runs.get("master", {}) or {}
+    return (
+        [round(float(entry.get("cata_xp", 0) or 0) * XP_SCALE)]
+        + [round(float(classes.get(cls, 0) or 0) * XP_SCALE) for cls in CLASSES]
+        + [int(normal.get(floor, 0) or 0) for floor in NORMAL_FLOORS]
+        + [int(master.get(floor, 0) or 0) for floor in MASTER_FLOORS]
+    )
+
+
+def decode_sample(values) -> dict:
+    offset = 1 + len(CLASSES)
+    return {
+        "cata_xp": values[0] / XP_SCALE,
+        "classes": {cls: values[1 + i] / XP_SCALE for i, cls in enumerate(CLASSES)},
+        "runs": {
+            "normal": {floor: values[offset + i] for i, floor in enumerate(NORMAL_FLOORS)},
+            "master": {floor: values[offset + len(NORMAL_FLOORS) + i] for i, floor in enumerate(MASTER_FLOORS)},
+        },
+    }
+
+
+class _Series:
+    __slots__ = ("timestamps", "columns")
+
+    def __init__(self):
+        self.timestamps = array("q")
+        self.columns = [array("q") for _ in COLUMNS]
+
+    def append(self, ts: int, values: List[int]):
+        self.timestamps.append(ts)
+        for column, value in zip(self.columns, values):
+            column.append(value)
+
+    def last(self) -> Optional[Tuple[int, List[int]]]:
+        if not self.timestamps:
+            return None
+        return self.timestamps[-1], [column[-1] for column in self.columns]
+
+    def at(self, index: int) -> Tuple[int, List[int]]:
+        return self.timestamps[index], [column[index] for column in self.columns]
+
+
+def _decode_month(data: bytes) -> Tuple[Dict[int, _Series], int]:
+    series: Dict[int, _Series] = {}
+    pos = 0
+    good = 0
+    try:
+        while pos < len(data):
+            user, pos = _read_varint(data, pos)
+            ts_delta, pos = _read_varint(data, pos)
+            deltas = []
+            for _ in COLUMNS:
+                raw, pos = _read_varint(data, pos)
+                deltas.append(_unzigzag(raw))
+
+            user_series = series.setdefault(user, _Series())
+            last = user_series.last()
+            prev_ts, prev_values = last if last else (0, [0] * len(COLUMNS))
+            user_series.append(prev_ts + ts_delta, [p + d for p, d in zip(prev_values, deltas)])
+            good = pos
+    except IndexError:
+        pass
+    return series, good
+
+
+class XpHistory:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._months: Dict[str, Dict[int, _Series]] = {}
+        self._pending: Dict[str, bytearray] = {}
+        self._loading: Dict[str, asyncio.Future] = {}
+
+    def _path(self, month: str) -> str:
+        return os.path.join(self.directory, f"{month}.bin")
+
+    async def _load_month(self, month: str) -> Dict[int, _Series]:
+        series = self._months.get(month)
+        if series is not None:
+            return series
+
+        task = self._loading.get(month)
+        if task is None:
+            task = self._loading[month] = asyncio.ensure_future(self._read_month(month))
+            task.add_done_callback(lambda _: self._loading.pop(month, None))
+        return await asyncio.shield(task)
+
+    async def _read_month(self, month: str) -> Dict[int, _Series]:
+        series = {}
+        path = self._path(month)
+        if os.path.exists(path):
+            async with aiofiles.open(path, "rb") as f:
+                data = await f.read()
+            series, good = await asyncio.to_thread(_decode_month, data)
+            if good < len(data):
+                log_error(f"XP history {path} has a truncated tail, dropping {len(data) - good} bytes")
+                os.truncate(path, good)
+        self._months[month] = series
+        return series
+
+    async def record(self, user_id: str, ts: int, entry: dict):
+        try:
+            user = int(user_id)
+        except (TypeError, ValueError):
+            log_debug(f"Skipping XP history for non-numeric user id {user_id}")
+            return
+
+        month = _month_key(ts)
+        try:
+            months = await self._load_month(month)
+        except Exception as e:
+            log_error(f"Failed to load XP history for {month}: {e}")
+            return
+        user_series = months.setdefault(user, _Series())
+        values = encode_sample(entry)
+        last = user_series.last()
+        prev_ts, prev_values = last if last else (0, [0] * len(COLUMNS))
+        if ts < prev_ts:
+            return
+
+        buf = self._pending.setdefault(month, bytearray())
+        _write_varint(buf, user)
+        _write_varint(buf, ts - prev_ts)
+        for value, prev in zip(values, prev_values):
+            _write_varint(buf, _zigzag(value - prev))
+        user_series.append(ts, values)
+
+    async def flush(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        os.makedirs(self.directory, exist_ok=True)
+        for month, buf in pending.items():
+            try:
+                async with aiofiles.open(self._path(month), "ab") as f:
+                    await f.write(bytes(buf))
+            except Exception as e:
+                log_error(f"Failed to append XP history for {month}: {e}")
+
+    async def _sample_at(self, user: int, ts: int) -> Optional[Tuple[int, List[int]]]:
+        month = _month_key(ts)
+        for _ in range(LOOKBACK_MONTHS + 1):
+            user_series = (await self._load_month(month)).get(user)
+            if user_series is not None:
+                index = bisect.bisect_right(user_series.timestamps, ts) - 1
+                if index >= 0:
+                    return user_series.at(index)
+            month = _previous_month(month)
+        return None
+
+    async def _first_after(self, user: int, start_ts: int, end_ts: int) -> Optional[Tuple[int, List[int]]]:
+        for month in _months_between(start_ts, end_ts):
+            user_series = (await self._load_month(month)).get(user)
+            if user_series is None:
+                continue
+            index = bisect.bisect_left(user_series.timestamps, start_ts)
+            if index < len(user_series.timestamps) and user_series.timestamps[index] <= end_ts:
+                return user_series.at(index)
+        return None
+
+    async def samples(self, user_id: str, start_ts: int, end_ts: int) -> List[dict]:
+        user = int(user_id)
+        result = []
+        for month in _months_between(start_ts, end_ts):
+            user_series = (await self._load_month(month)).get(user)
+            if user_series is None:
+                continue
+            lo = bisect.bisect_left(user_series.timestamps, start_ts)
+            hi = bisect.bisect_right(user_series.timestamps, end_ts)
+            for index in range(lo, hi):
+                ts, values = user_series.at(index)
+                sample = decode_sample(values)
+                sample["timestamp"] = ts
+                result.append(sample)
+        return result
+
+    async def gained(self, user_id: str, start_ts: int, end_ts: int) -> Optional[dict]:
+        user = int(user_id)
+        end = await self._sample_at(user, end_ts)
+        if end is None:
+            return None
+        start = await self._sample_at(user, start_ts) or await self._first_after(user, start_ts, end_ts)
+        if start is None:
+            return None
+
+        diff = [e - s for e, s in zip(end[1], start[1])]
+        result = decode_sample(diff)
+        result["start"] = start[0]
+        result["end"] = end[0]
+        return result
+
+    async def gained_by_bucket(self, user_id: str, start_ts: int, end_ts: int, bucket_seconds: int) -> List[dict]:
+        buckets = []
+        bucket_start = start_ts
+        while bucket_start < end_ts:
+            bucket_end = min(bucket_start + bucket_seconds, end_ts)
+            gain = await self.gained(user_id, bucket_start, bucket_end)
+            buckets.append({"start": bucket_start, "end": bucket_end, "gained": gain})
+            bucket_start = bucket_end
+        return buckets
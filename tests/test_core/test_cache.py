@@ -0,0 +1,183 @@
+import pytest
+from core import cache
+
+
+@pytest.fixture
+def namespaces(mocker):
+    fresh = {
+        name: cache.CacheNamespace(name, *limits)
+        for name, limits in cache.NAMESPACE_LIMITS.items()
+    }
+    mocker.patch.object(cache, "_NAMESPACES", fresh)
+    return fresh
+
+
+def test_namespace_resolution(namespaces):
+    assert cache._resolve_namespace("player_1").name == "uuid"
+    assert cache._resolve_namespace("a" * 32).name == "profile"
+    assert cache._resolve_namespace("soopy_player:" + "a" * 32).name == "soopy_player"
+    assert cache._resolve_namespace("skycrypt_build_id").name == "skycrypt"
+    assert cache._resolve_namespace("google_fonts_cache").name == "fonts"
+    assert cache._resolve_namespace("Some Other Key!").name == "default"
+
+
+def test_lru_evicts_by_bytes():
+    ns = cache.CacheNamespace("test", max_bytes=30, default_ttl=60)
+    ns.set("a", "x", expiry=1e12, size=10)
+    ns.set("b", "x", expiry=1e12, size=10)
+    ns.set("c", "x", expiry=1e12, size=10)
+
+    assert ns.get("a", now=0) == "x"
+    ns.set("d", "x", expiry=1e12, size=10)
+
+    assert "b" not in ns
+    assert "a" in ns and "c" in ns and "d" in ns
+    assert ns.bytes_used == 30
+    assert ns.evictions == 1
+
+
+def test_oversized_entry_is_rejected():
+    ns = cache.CacheNamespace("test", max_bytes=10, default_ttl=60)
+    ns.set("small", "x", expiry=1e12, size=5)
+    assert ns.set("big", "x", expiry=1e12, size=11) is False
+    assert "small" in ns
+    assert ns.bytes_used == 5
+
+
+def test_expired_entry_is_a_miss():
+    ns = cache.CacheNamespace("test", max_bytes=100, default_ttl=60)
+    ns.set("k", "v", expiry=100.0, size=5)
+    assert ns.get("k", now=50.0) == "v"
+    assert ns.get("k", now=150.0) is None
+    assert "k" not in ns
+    assert ns.bytes_used == 0
+    assert ns.hits == 1 and ns.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_set_uses_namespace_default_ttl(namespaces, mocker):
+    mocker.patch("core.cache.time.time", return_value=1000.0)
+    await cache.cache_set("google_fonts_cache", {"hash": "h"})
+    assert cache.get_cache_expiry("google_fonts_cache") == 1000.0 + cache.NAMESPACE_LIMITS["fonts"][1]
+    assert await cache.cache_get("google_fonts_cache") == {"hash": "h"}
+    assert cache.get_cache_stats()["fonts"]["entries"] == 1
+
+
+@pytest.fixture
+def journal(tmp_path, mocker, namespaces):
+    path = tmp_path / "cache.journal"
+    mocker.patch.object(cache, "JOURNAL_FILE", str(path))
+    mocker.patch.object(cache, "LEGACY_CACHE_FILE", str(tmp_path / "cache.json"))
+    mocker.patch.object(cache, "_PENDING", {})
+    mocker.patch.object(cache, "_DISK_INDEX", {})
+    mocker.patch.object(cache, "_JOURNAL_SIZE", 0)
+    mocker.patch.object(cache, "_INDEX_LOADED", False)
+    return path
+
+
+def _reset_memory(mocker):
+    mocker.patch.object(cache, "_NAMESPACES", {
+        name: cache.CacheNamespace(name, *limits)
+        for name, limits in cache.NAMESPACE_LIMITS.items()
+    })
+    mocker.patch.object(cache, "_DISK_INDEX", {})
+    mocker.patch.object(cache, "_JOURNAL_SIZE", 0)
+    mocker.patch.object(cache, "_INDEX_LOADED", False)
+
+
+@pytest.mark.asyncio
+async def test_journal_appends_only_changed_keys(journal):
+    await cache.cache_set("player_a", "uuid_a", ttl=600)
+    await cache.cache_set("player_b", "uuid_b", ttl=600)
+    await cache.shutdown()
+    size_after_first = journal.stat().st_size
+
+    await cache.cache_set("player_b", "uuid_b2", ttl=600)
+    await cache.shutdown()
+    lines = journal.read_bytes().splitlines()
+
+    assert len(lines) == 3
+    assert journal.stat().st_size > size_after_first
+    assert lines[-1].startswith(b"player_b\t")
+    assert cache._PENDING == {}
+
+
+@pytest.mark.asyncio
+async def test_journal_loads_lazily_latest_record(journal, mocker):
+    await cache.cache_set("player_a", "old", ttl=600)
+    await cache.cache_set("a" * 32, {"profiles": []}, ttl=600)
+    await cache.shutdown()
+    await cache.cache_set("player_a", "new", ttl=600)
+    await cache.shutdown()
+
+    _reset_memory(mocker)
+    assert len(cache._NAMESPACES["uuid"]) == 0
+
+    assert await cache.cache_get("player_a") == "new"
+    assert len(cache._NAMESPACES["profile"]) == 0
+    assert await cache.cache_get("a" * 32) == {"profiles": []}
+    assert await cache.cache_get("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_journal_ignores_expired_and_truncated_records(journal, mocker):
+    await cache.cache_set("player_a", "live", ttl=600)
+    await cache.shutdown()
+    with open(journal, "ab") as f:
+        f.write(b"player_b\t1.0\t\"dead\"\n")
+        f.write(b"player_c\t99999999999.0\t\"partial")
+
+    _reset_memory(mocker)
+
+    assert await cache.cache_get("player_b") is None
+    assert await cache.cache_get("player_c") is None
+    assert await cache.cache_get("player_a") == "live"
+    assert journal.read_bytes().endswith(b"\n")
+
+
+@pytest.mark.asyncio
+async def test_compaction_drops_superseded_records(journal, mocker):
+    for i in range(5):
+        await cache.cache_set("player_a", f"value_{i}", ttl=600)
+        await cache.shutdown()
+    before = journal.stat().st_size
+
+    await cache._compact_journal()
+
+    assert journal.stat().st_size < before
+    assert len(journal.read_bytes().splitlines()) == 1
+    _reset_memory(mocker)
+    assert await cache.cache_get("player_a") == "value_4"
+
+
+def test_stale_entry_kept_through_grace():
+    ns = cache.CacheNamespace("test", max_bytes=100, default_ttl=60, stale_grace=50)
+    ns.set("k", "v", expiry=100.0, size=5)
+    assert ns.get_stale("k", now=90.0) is None
+    assert ns.get("k", now=120.0) is None
+    assert ns.get_stale("k", now=120.0) == "v"
+    assert ns.get_stale("k", now=151.0) is None
+    assert ns.sweep(now=151.0) == 1
+    assert "k" not in ns
+
+
+@pytest.mark.asyncio
+async def test_revalidate_runs_refresh_once(mocker):
+    import asyncio
+    mocker.patch.object(cache, "_REVALIDATING", {})
+    calls = []
+    release = asyncio.Event()
+
+    async def refresh():
+        calls.append(1)
+        await release.wait()
+
+    cache.revalidate("key", refresh)
+    cache.revalidate("key", refresh)
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert calls == [1]
+    assert "key" not in cache._REVALIDATING
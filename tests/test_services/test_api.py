@@ -121,6 +121,164 @@ async def test_get_profile_data_success_stop(mocker):
     assert not mock_shiiyu.called
     assert not mock_hypixel.called
 
+@pytest.mark.asyncio
+async def test_get_profile_data_coalesces_concurrent_callers(mocker):
+    import asyncio
+    mocker.patch("services.api.cache_get", return_value=None)
+    mock_set = mocker.patch("services.api.cache_set")
+    mocker.patch("services.api.init_session")
+
+    release = asyncio.Event()
+
+    async def slow_fetch(uuid):
+        await release.wait()
+        return {"_source": "plain_dawn"}
+
+    mock_plain_dawn = mocker.patch("services.api.fetch_plain_dawn_profile", side_effect=slow_fetch)
+
+    from core.config import config
+    config.api_priority = ["plain_dawn"]
+
+    callers = [asyncio.create_task(api.get_profile_data("b" * 32)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*callers)
+
+    assert all(r == {"_source": "plain_dawn"} for r in results)
+    assert mock_plain_dawn.call_count == 1
+    assert mock_set.call_count == 1
+    assert "profile:" + "b" * 32 not in api._INFLIGHT
+
+@pytest.mark.asyncio
+async def test_get_uuid_coalesces_case_insensitive(mocker):
+    import asyncio
+    mocker.patch("services.api.cache_get", return_value=None)
+
+    release = asyncio.Event()
+
+    async def slow_fetch(name):
+        await release.wait()
+        return "real_uuid"
+
+    mock_fetch = mocker.patch("services.api._fetch_uuid", side_effect=slow_fetch)
+
+    callers = [asyncio.create_task(api.get_uuid(n)) for n in ("Player", "player", "PLAYER")]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*callers)
+
+    assert results == ["real_uuid"] * 3
+    assert mock_fetch.call_count == 1
+
+@pytest.mark.asyncio
+async def test_get_profile_data_hedged_races_next_provider(mocker):
+    import asyncio
+    mocker.patch("services.api.cache_get", return_value=None)
+    mocker.patch("services.api.cache_set")
+    mocker.patch("services.api.init_session")
+
+    primary_cancelled = asyncio.Event()
+
+    async def slow_primary(uuid):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            primary_cancelled.set()
+            raise
+
+    mocker.patch("services.api.fetch_soterm_profile", side_effect=slow_primary)
+    mock_adjectils = mocker.patch("services.api.fetch_adjectils_profile", return_value={"_source": "adjectils"})
+    mock_soopy = mocker.patch("services.api.fetch_soopy_profile", return_value={"_source": "soopy"})
+
+    from core.config import config
+    mocker.patch.object(config, "api_priority", ["soterm", "adjectils", "soopy"])
+    mocker.patch.object(config, "profile_fetch_mode", "hedged")
+    mocker.patch.object(config, "hedge_delay_ms", 10)
+
+    result = await api.get_profile_data("c" * 32)
+    await asyncio.sleep(0)
+
+    assert result == {"_source": "adjectils"}
+    assert mock_adjectils.called
+    assert not mock_soopy.called
+    assert primary_cancelled.is_set()
+
+def test_latency_histogram_quantile():
+    hist = api._LatencyHistogram()
+    assert hist.quantile(0.95) is None
+    for _ in range(95):
+        hist.observe(0.08)
+    for _ in range(5):
+        hist.observe(4.0)
+    assert hist.quantile(0.5) == 0.1
+    assert hist.quantile(0.95) == 0.1
+    assert hist.quantile(0.99) == 5.0
+
+def test_hedge_delay_adapts_to_histogram(mocker):
+    from core.config import config
+    mocker.patch.object(config, "hedge_delay_ms", 2000)
+    mocker.patch.dict(api._provider_latency, clear=True)
+
+    assert api._hedge_delay("soterm") == 2.0
+    for _ in range(api.HEDGE_MIN_SAMPLES):
+        api._record_latency("soterm", 0.3)
+    assert api._hedge_delay("soterm") == 0.35
+    stats = api.get_provider_latency_stats()["soterm"]
+    assert stats["hedge_delay"] == 0.35
+    assert stats["samples"] == api.HEDGE_MIN_SAMPLES
+
+@pytest.mark.asyncio
+async def test_get_profile_data_serves_stale_and_revalidates(mocker):
+    mocker.patch("services.api.cache_get", return_value=None)
+    mocker.patch("services.api.cache_get_stale", return_value={"_source": "stale"})
+    mock_revalidate = mocker.patch("services.api.revalidate")
+    mock_fetch = mocker.patch("services.api._fetch_profile_data")
+
+    result = await api.get_profile_data("d" * 32)
+
+    assert result == {"_source": "stale"}
+    mock_revalidate.assert_called_once()
+    assert mock_revalidate.call_args.args[0] == "d" * 32
+    assert not mock_fetch.called
+
+@pytest.mark.asyncio
+async def test_fetch_profile_data_uses_budgeted_provider_first(mocker):
+    calls = []
+
+    async def fake_fetch(api_name, uuid):
+        calls.append(api_name)
+        return {"_source": api_name, "profiles": []} if api_name != "soterm" else None
+
+    mocker.patch("services.api._SESSION", mocker.MagicMock())
+    mocker.patch("services.api.cache_set")
+    mocker.patch("services.api._fetch_from_provider", side_effect=fake_fetch)
+    mocker.patch.object(api.config, "api_priority", ["plain_dawn", "soterm", "soopy"])
+    mocker.patch.object(api.config, "profile_fetch_mode", "sequential")
+
+    result = await api._fetch_profile_data("d" * 32, provider="soopy")
+    assert result["_source"] == "soopy"
+    assert calls == ["soopy"]
+
+    calls.clear()
+    result = await api._fetch_profile_data("d" * 32, provider="soterm")
+    assert result["_source"] == "plain_dawn"
+    assert calls == ["soterm", "plain_dawn"]
+
+@pytest.mark.asyncio
+async def test_get_all_prices_serves_stale_within_grace(mocker):
+    from core.config import config
+    mocker.patch.object(config, "prices_cache_ttl", 100)
+    mocker.patch.object(config, "prices_stale_grace", 50)
+    mocker.patch("services.api.time.time", return_value=1120.0)
+    mocker.patch("services.api._prices_memory", {"ITEM": 1.0})
+    mocker.patch("services.api._prices_fetched_at", 1000.0)
+    mock_revalidate = mocker.patch("services.api.revalidate")
+    mock_refresh = mocker.patch("services.api._refresh_prices")
+
+    assert await api.get_all_prices() == {"ITEM": 1.0}
+    mock_revalidate.assert_called_once()
+    assert not mock_refresh.called
+
 @pytest.mark.asyncio
 async def test_fetch_hypixel_profile(mocker):
     mock_session = mocker.MagicMock()
@@ -293,13 +451,15 @@ def test_parse_soopy_dungeon_stats():
 
 
 @pytest.mark.asyncio
-async def test_get_dungeon_stats_soopy_with_extra_api(mocker):
-    mock_profile = {
+async def test_get_dungeon_stats_soopy_fetches_player_data_lazily(mocker):
+    uuid = "e" * 32
+    soopy_profile = {
+        "_source": "soopy",
         "profiles": [
             {
                 "selected": True,
                 "members": {
-                    "uuid": {
+                    uuid: {
                         "dungeons": {"catacombs_xp": 10},
                         "accessory_reforge": {"highest_magical_power": 123},
                         "kills": {"watcher_summon_undead": 5}
@@ -317,14 +477,76 @@ async def test_get_dungeon_stats_soopy_with_extra_api(mocker):
             }
         }
     }
-    mocker.patch("services.api.get_profile_data", return_value=mock_profile)
-    mocker.patch("services.api.get_soopy_player_data", return_value=mock_player)
-    
-    stats = await api.get_dungeon_stats("uuid")
-    
+    mocker.patch("services.api._SESSION", mocker.MagicMock())
+    mocker.patch("services.api.cache_set")
+    mocker.patch.object(api.config, "api_priority", ["soopy"])
+    mocker.patch("services.api.fetch_soopy_profile", return_value=soopy_profile)
+    mock_player_data = mocker.patch("services.api.get_soopy_player_data", return_value=mock_player)
+
+    normalized = await api._fetch_profile_data(uuid)
+    mocker.patch("services.api.get_profile_data", return_value=normalized)
+    xp = await api.get_dungeon_xp(uuid)
+    assert xp["catacombs"] == 10
+    assert mock_player_data.call_count == 0
+
+    stats = await api.get_dungeon_stats(uuid)
+    assert mock_player_data.call_count == 1
     assert stats["magical_power"] == 123
     assert stats["accessory_bag_storage"]["highest_magical_power"] == 123
     assert stats["secrets"] == 74445
+    assert stats["blood_mob_kills"] == 5
+
+@pytest.mark.asyncio
+async def test_get_dungeon_stats_skycrypt_fetches_section_lazily(mocker):
+    uuid = "f" * 32
+    member = {"dungeons": {"dungeon_types": {"catacombs": {"experience": 250.0, "tier_completions": {"7": 4}}}}}
+    skycrypt_profile = {
+        "_source": "skycrypt",
+        "profiles": {
+            "p1": {"profile_id": "p1", "cute_name": "Apple", "selected": True, "members": {uuid: member}},
+            "p2": {"profile_id": "p2", "cute_name": "Banana", "selected": False, "members": {uuid: member}},
+        }
+    }
+    section = {"catacombs": 500.0, "secrets": 7, "blood_mob_kills": 3, "classes": {"Mage": 40.0},
+               "floors": {"F7": {"runs": 9, "best_score": 300, "fastest_s": 1, "fastest_s_plus": 2}}}
+    mocker.patch("services.api._SESSION", mocker.MagicMock())
+    mocker.patch("services.api.cache_get", return_value=None)
+    mocker.patch("services.api.cache_set")
+    mocker.patch.object(api.config, "api_priority", ["skycrypt"])
+    mocker.patch("services.api.fetch_skycrypt_shiiyu_profile", return_value=skycrypt_profile)
+    mock_sections = mocker.patch("services.skycrypt_service.fetch_dungeon_sections", return_value={"p1": section})
+    mock_ign = mocker.patch("services.api.get_ign")
+
+    normalized = await api._fetch_profile_data(uuid)
+    mocker.patch("services.api.get_profile_data", return_value=normalized)
+    xp = await api.get_dungeon_xp(uuid)
+    runs = await api.get_dungeon_runs(uuid)
+    assert not mock_sections.called
+    assert xp["catacombs"] == 250.0
+    assert runs["Floor 7 (Necron)"] == {"normal": 4, "master": 0}
+
+    stats = await api.get_dungeon_stats(uuid)
+    mock_sections.assert_called_once_with(uuid, ["p1"])
+    assert not mock_ign.called
+    assert stats["catacombs"] == 500.0
+    assert stats["classes"]["Mage"] == 40.0
+    assert stats["floors"]["F7"]["runs"] == 9
+
+
+@pytest.mark.asyncio
+async def test_get_dungeon_stats_skycrypt_falls_back_to_member(mocker):
+    uuid = "f" * 32
+    member = {"dungeons": {"dungeon_types": {"catacombs": {"experience": 250.0}}}}
+    profile_data = {
+        "_source": "skycrypt",
+        "profiles": [{"profile_id": "p1", "selected": True, "members": {uuid: member}}],
+    }
+    mocker.patch("services.api.cache_get", return_value=None)
+    mocker.patch("services.api.get_profile_data", return_value=profile_data)
+    mocker.patch("services.skycrypt_service.fetch_dungeon_sections", return_value={})
+
+    stats = await api.get_dungeon_stats(uuid)
+    assert stats["catacombs"] == 250.0
 
 @pytest.mark.asyncio
 async def test_get_dungeon_stats_ignores_total(mocker):
@@ -370,27 +592,220 @@ async def test_get_dungeon_stats_ignores_total(mocker):
     total_runs = sum(f["runs"] for f in stats["floors"].values())
     assert total_runs == 15
 
-def test_api_cooldown_escalation(mocker):
-    api._api_cooldown._cooldowns = {}
-    api._api_cooldown._consecutive_failures = {}
+def test_api_circuit_breaker_escalation(mocker):
+    api._api_guard._guards = {}
 
     mock_time = mocker.patch("services.api.time.time", return_value=100.0)
+    guard = api._api_guard.get("test_api")
 
-    api._api_cooldown.record_failure("test_api", 429, retry_after=1)
-    assert api._api_cooldown._cooldowns["test_api"] == 105.0
-    assert api._api_cooldown.is_cooling_down("test_api") is True
+    api._api_guard.record_failure("test_api", 429, retry_after=1)
+    assert guard.open_until == 105.0
+    assert guard.state == api.CIRCUIT_OPEN
+    assert api._api_guard.is_open("test_api") is True
 
     mock_time.return_value = 106.0
-    assert api._api_cooldown.is_cooling_down("test_api") is False
+    assert api._api_guard.is_open("test_api") is False
+    assert guard.admit() == (True, True)
+    assert guard.state == api.CIRCUIT_HALF_OPEN
+    assert guard.admit() == (False, False)
 
-    api._api_cooldown.record_failure("test_api", 429, retry_after=1)
-    assert api._api_cooldown._cooldowns["test_api"] == 166.0
-    assert api._api_cooldown.is_cooling_down("test_api") is True
+    api._api_guard.record_failure("test_api", 429, retry_after=1)
+    assert guard.open_until == 166.0
+    assert api._api_guard.is_open("test_api") is True
 
-    api._api_cooldown.record_success("test_api")
-    assert "test_api" not in api._api_cooldown._consecutive_failures
+    api._api_guard.record_success("test_api")
+    assert guard.consecutive_failures == 0
+    assert guard.state == api.CIRCUIT_CLOSED
 
     mock_time.return_value = 200.0
-    api._api_cooldown.record_failure("test_api", 500)
-    assert api._api_cooldown._cooldowns["test_api"] == 230.0
+    api._api_guard.record_failure("test_api", 500)
+    assert guard.open_until == 230.0
+
+def test_half_open_probe_released_when_cancelled(mocker):
+    mocker.patch("services.api.time.time", return_value=100.0)
+    guard = api._ProviderGuard("test_api")
+    guard.record_failure(500)
+
+    mocker.patch("services.api.time.time", return_value=200.0)
+    allowed, is_probe = guard.admit()
+    assert allowed and is_probe
+    guard.finish(is_probe)
+    assert guard.admit() == (True, True)
+
+@pytest.mark.asyncio
+async def test_probe_cancelled_while_waiting_for_limiter_is_released(mocker):
+    import asyncio
+    api._api_guard._guards = {}
+    mocker.patch("services.api.fetch_soopy_profile", mocker.AsyncMock(return_value={"ok": True}))
+    mocker.patch("services.api.time.time", return_value=100.0)
+    guard = api._api_guard.get("soopy")
+    guard.record_failure(500)
+    guard.limiter.in_flight = int(guard.limiter.limit)
+
+    mocker.patch("services.api.time.time", return_value=200.0)
+    task = asyncio.ensure_future(api._fetch_from_provider("soopy", "a" * 32))
+    await asyncio.sleep(0.01)
+    assert guard.probes_in_flight == 1
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert guard.probes_in_flight == 0
+    assert guard.limiter.in_flight == int(guard.limiter.limit)
+    assert guard.admit() == (True, True)
+
+def test_adaptive_limiter_aimd():
+    limiter = api._AdaptiveLimiter(initial=4, minimum=1, maximum=8)
+
+    limiter.on_congestion()
+    assert limiter.limit == 2
+
+    for _ in range(20):
+        limiter.on_latency(0.2)
+    assert limiter.limit > 4
+
+    before = limiter.limit
+    limiter.on_latency(5.0)
+    assert limiter.limit < before
+
+    for _ in range(10):
+        limiter.on_congestion()
+    assert limiter.limit == 1
+
+@pytest.mark.asyncio
+async def test_adaptive_limiter_bounds_in_flight():
+    import asyncio
+    limiter = api._AdaptiveLimiter(initial=2, minimum=1, maximum=2)
+    peak = 0
+
+    async def worker():
+        nonlocal peak
+        await limiter.acquire()
+        peak = max(peak, limiter.in_flight)
+        await asyncio.sleep(0.01)
+        await limiter.release()
+
+    await asyncio.gather(*(worker() for _ in range(6)))
+    assert peak == 2
+    assert limiter.in_flight == 0
+
+def test_pool_settings_apply_config_overrides(mocker):
+    mocker.patch.object(api.config, "http_pools", {"mojang": {"limit_per_host": 2, "read_timeout": 3}})
+    settings = api._pool_settings("mojang")
+    assert settings["limit_per_host"] == 2
+    assert settings["read_timeout"] == 3
+    assert settings["connect_timeout"] == api.HTTP_POOLS["mojang"]["connect_timeout"]
+    assert api._pool_settings("unknown") == api.HTTP_POOL_DEFAULTS
+
+def test_session_for_falls_back_to_shared_session(mocker):
+    shared = mocker.MagicMock()
+    mojang = mocker.MagicMock()
+    mocker.patch("services.api._SESSION", shared)
+    mocker.patch.dict(api._POOLS, {"mojang": mojang}, clear=True)
+    assert api._session_for("mojang") is mojang
+    assert api._session_for("playerdb") is shared
+
+@pytest.mark.asyncio
+async def test_unknown_provider_gets_its_own_pool(mocker):
+    mocker.patch("services.api._SESSION", None)
+    mocker.patch.dict(api._POOLS, {}, clear=True)
+    mocker.patch("services.api.asyncio.sleep", mocker.AsyncMock())
+    await api.init_session()
+    try:
+        extra = api._session_for("new_provider")
+        assert extra is api._POOLS["new_provider"]
+        assert extra is not api._SESSION
+        assert api._session_for("new_provider") is extra
+        assert extra.connector.limit == api.HTTP_POOL_DEFAULTS["limit"]
+        assert "new_provider" in api.get_pool_stats()
+    finally:
+        await api.close_session()
+
+@pytest.mark.asyncio
+async def test_init_session_creates_isolated_pools(mocker):
+    mocker.patch("services.api._SESSION", None)
+    mocker.patch.dict(api._POOLS, {}, clear=True)
+    mocker.patch("services.api.asyncio.sleep", mocker.AsyncMock())
+    await api.init_session()
+    try:
+        assert set(api._POOLS) == set(api.HTTP_POOLS) | {api.DEFAULT_POOL}
+        assert api._SESSION is api._POOLS[api.DEFAULT_POOL]
+        mojang = api._POOLS["mojang"]
+        profiles = api._POOLS["soterm"]
+        assert mojang.connector is not profiles.connector
+        assert mojang.connector.limit_per_host == api.HTTP_POOLS["mojang"]["limit_per_host"]
+        assert mojang.timeout.connect == api.HTTP_POOLS["mojang"]["connect_timeout"]
+        assert "mojang" in api.get_pool_stats()
+    finally:
+        await api.close_session()
+    assert api._POOLS == {}
+
+@pytest.mark.asyncio
+async def test_pool_stats_trace_hooks():
+    stats = api._PoolStats()
+    await stats._on_queued_start(None, None, None)
+    await stats._on_request_start(None, None, None)
+    assert stats.stats()["waiting"] == 1
+    await stats._on_queued_end(None, None, None)
+    await stats._on_connection_create(None, None, None)
+    await stats._on_request_end(None, None, None)
+    await stats._on_request_start(None, None, None)
+    await stats._on_connection_reuse(None, None, None)
+    assert stats.stats()["acquired"] == 1
+    await stats._on_request_exception(None, None, None)
+    result = stats.stats()
+    assert result == {"acquired": 0, "waiting": 0, "requests": 2, "created": 1, "reused": 1, "queued": 1, "errors": 1}
+
+@pytest.mark.asyncio
+async def test_get_uuids_dedupes_and_uses_cache(mocker):
+    cache = {"cached": "c" * 32}
+    mocker.patch("services.api.cache_get", side_effect=lambda key: cache.get(key))
+    mocker.patch("services.api._SESSION", mocker.MagicMock())
+    mock_bulk = mocker.patch("services.api._fetch_uuids_bulk", return_value={"alice": "a" * 32, "bob": None})
+
+    result = await api.get_uuids(["Alice", "alice", "Cached", "bob", "bad name!"])
+
+    mock_bulk.assert_called_once_with(["Alice", "bob"])
+    assert result == {"alice": "a" * 32, "cached": "c" * 32, "bob": None, "bad name!": None}
+
+@pytest.mark.asyncio
+async def test_get_uuids_chunks_and_falls_back_on_bulk_failure(mocker):
+    mocker.patch("services.api.cache_get", return_value=None)
+    mocker.patch("services.api._SESSION", mocker.MagicMock())
+    names = [f"player{i}" for i in range(api.MOJANG_BULK_LIMIT + 3)]
+
+    async def bulk(chunk):
+        if len(chunk) == api.MOJANG_BULK_LIMIT:
+            return {name: name.upper() for name in chunk}
+        return None
+
+    mock_bulk = mocker.patch("services.api._fetch_uuids_bulk", side_effect=bulk)
+    mock_single = mocker.patch("services.api.get_uuid", side_effect=lambda name: f"single-{name}")
+
+    result = await api.get_uuids(names)
+
+    assert mock_bulk.call_count == 2
+    assert mock_single.call_count == 3
+    assert result["player0"] == "PLAYER0"
+    assert result[names[-1]] == f"single-{names[-1]}"
+    assert len(result) == len(names)
+
+@pytest.mark.asyncio
+async def test_fetch_uuids_bulk_caches_found_names(mocker):
+    mock_set = mocker.patch("services.api.cache_set")
+    mock_session = mocker.MagicMock()
+    mocker.patch("services.api._SESSION", mock_session)
+
+    mock_resp = mocker.AsyncMock()
+    mock_resp.status = 200
+    mock_resp.json.return_value = [{"id": "a" * 32, "name": "Alice"}]
+    cm = mocker.AsyncMock()
+    cm.__aenter__.return_value = mock_resp
+    cm.__aexit__.return_value = None
+    mock_session.post.return_value = cm
+
+    result = await api._fetch_uuids_bulk(["alice", "Ghost"])
 
+    assert result == {"alice": "a" * 32, "ghost": None}
+    mock_set.assert_called_once_with("alice", "a" * 32, ttl=api.config.profile_cache_ttl)
+    assert mock_session.post.call_args.kwargs["json"] == ["alice", "Ghost"]
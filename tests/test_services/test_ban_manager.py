@@ -0,0 +1,98 @@
+import ipaddress
+import os
+import time
+import pytest
+from services import ban_manager as ban_manager_module
+from services.ban_index import BanIndex, parse_network
+from services.ban_manager import BanManager, parse_duration
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return BanManager(path=str(tmp_path / "ip_bans.json"), journal_path=str(tmp_path / "ip_bans.journal"))
+
+
+def test_index_returns_most_specific_match_first():
+    index = BanIndex()
+    index.insert(parse_network("10.0.0.0/8"), "10.0.0.0/8")
+    index.insert(parse_network("10.1.2.0/24"), "10.1.2.0/24")
+    index.insert(parse_network("10.1.2.3"), "10.1.2.3")
+
+    assert index.lookup(ipaddress.ip_address("10.1.2.3")) == ["10.1.2.3", "10.1.2.0/24", "10.0.0.0/8"]
+    assert index.lookup(ipaddress.ip_address("10.9.9.9")) == ["10.0.0.0/8"]
+    assert index.lookup(ipaddress.ip_address("11.0.0.1")) == []
+
+    assert index.remove(parse_network("10.1.2.0/24"))
+    assert not index.remove(parse_network("10.1.2.0/24"))
+    assert index.lookup(ipaddress.ip_address("10.1.2.3")) == ["10.1.2.3", "10.0.0.0/8"]
+    assert len(index) == 2
+
+
+@pytest.mark.asyncio
+async def test_cidr_bans_cover_ipv4_and_ipv6(manager):
+    await manager.load_bans()
+    assert await manager.ban("203.0.113.0/24", "scraper", 1)
+    assert await manager.ban("2001:db8:1:2::/64", "scraper v6", 1)
+    assert not await manager.ban("not-an-ip", "nope", 1)
+
+    assert manager.get_ban("203.0.113.77")["reason"] == "scraper"
+    assert manager.get_ban("2001:db8:1:2:abcd::1")["reason"] == "scraper v6"
+    assert manager.get_ban("203.0.114.1") is None
+    assert manager.get_ban("2001:db8:1:3::1") is None
+    assert manager.get_ban("garbage") is None
+
+
+@pytest.mark.asyncio
+async def test_expired_bans_are_ignored(manager, monkeypatch):
+    await manager.load_bans()
+    await manager.ban("198.51.100.0/24", "temporary", 1, duration=60)
+    assert manager.is_banned("198.51.100.5")
+
+    real_time = time.time
+    monkeypatch.setattr(ban_manager_module.time, "time", lambda: real_time() + 120)
+    assert not manager.is_banned("198.51.100.5")
+    assert manager.get_all() == {}
+
+
+@pytest.mark.asyncio
+async def test_bans_are_journaled_and_replayed(manager, tmp_path):
+    await manager.load_bans()
+    await manager.ban("192.0.2.1", "one", 1)
+    await manager.ban("192.0.2.0/28", "range", 1)
+    await manager.unban("192.0.2.1")
+
+    assert os.path.exists(manager.journal_path)
+    assert manager.journal_ops == 3
+
+    reloaded = BanManager(path=manager.path, journal_path=manager.journal_path)
+    await reloaded.load_bans()
+    assert set(reloaded.get_all()) == {"192.0.2.0/28"}
+    assert reloaded.get_ban("192.0.2.1")["reason"] == "range"
+
+
+@pytest.mark.asyncio
+async def test_journal_is_compacted(manager, monkeypatch):
+    monkeypatch.setattr(ban_manager_module, "COMPACT_AFTER_OPS", 4)
+    await manager.load_bans()
+    for i in range(5):
+        await manager.ban(f"192.0.2.{i}", "spam", 1)
+
+    assert manager.journal_ops == 1
+    reloaded = BanManager(path=manager.path, journal_path=manager.journal_path)
+    await reloaded.load_bans()
+    assert len(reloaded.get_all()) == 5
+
+
+@pytest.mark.asyncio
+async def test_legacy_file_is_loaded(manager):
+    with open(manager.path, "w") as f:
+        f.write('{"1.2.3.4": {"reason": "old", "banned_by": "1", "banned_at": 0}}')
+    await manager.load_bans()
+    assert manager.get_ban("1.2.3.4")["reason"] == "old"
+
+
+def test_parse_duration():
+    assert parse_duration("90") == 90
+    assert parse_duration("30m") == 1800
+    assert parse_duration("7d") == 604800
+    assert parse_duration("soon") is None
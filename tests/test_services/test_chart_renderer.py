@@ -0,0 +1,56 @@
+import io
+from PIL import Image
+from services import visualization
+from services.chart_renderer import nice_ticks, render_bar_panels
+
+CLASS_DATA = {"Archer": 42.5, "Berserk": 38.1, "Healer": 45.9, "Mage": 50.0, "Tank": 33.3}
+FLOORS_DATA = {"F7": {"runs": 850}, "M7": {"runs": 1500}, "M1": {"runs": 0}}
+
+
+def _image(png: bytes) -> Image.Image:
+    image = Image.open(io.BytesIO(png))
+    image.load()
+    return image
+
+
+def test_nice_ticks():
+    assert nice_ticks(52.5) == [0, 10, 20, 30, 40, 50]
+    assert nice_ticks(1575) == [0, 500, 1000, 1500]
+    assert nice_ticks(0) == [0]
+
+
+def test_render_bar_panels_size_and_background():
+    png = render_bar_panels([
+        {"title": "A", "labels": ["x", "y"], "values": [1, 2], "colors": ["#ff0000", "#00ff00"]},
+        {"title": "B", "labels": [], "values": [], "empty_text": "Nothing"},
+    ], 400, 200)
+
+    image = _image(png)
+    assert image.format == "PNG"
+    assert image.size == (400, 200)
+    assert image.getpixel((2, 2)) == (0x2b, 0x2d, 0x31)
+
+
+def test_pillow_graphs_render():
+    dungeon = _image(visualization._pillow_combined_graph(CLASS_DATA, FLOORS_DATA, 47.2))
+    assert dungeon.size == (1200, 500)
+
+    rtca = _image(visualization._pillow_rtca_graph(
+        {"healer": 1000, "mage": 569_809_640}, {"healer": {"runs_done": 120}, "mage": {"runs_done": 0}}, "Player", 50
+    ))
+    assert rtca.size == (1400, 600)
+
+
+def test_renderer_selection_and_fallback(monkeypatch):
+    calls = []
+    monkeypatch.setattr(visualization, "_create_combined_graph", lambda *args: calls.append("matplotlib") or b"mpl")
+
+    assert visualization._render_dungeon_graph("matplotlib", CLASS_DATA, FLOORS_DATA, 47.2) == b"mpl"
+    assert visualization._render_dungeon_graph("pillow", CLASS_DATA, FLOORS_DATA, 47.2).startswith(b"\x89PNG")
+
+    def broken(*args):
+        raise RuntimeError("no fonts")
+
+    monkeypatch.setattr(visualization, "_pillow_combined_graph", broken)
+    assert visualization._render_dungeon_graph("pillow", CLASS_DATA, FLOORS_DATA, 47.2) == b"mpl"
+    assert calls == ["matplotlib", "matplotlib"]
@@ -2,6 +2,13 @@ import pytest
 import time
 from services.daily_manager import DailyManager
 from services import json_utils
+from core.config import config
+
+
+@pytest.fixture(autouse=True)
+def xp_history_dir(tmp_path, mocker):
+    mocker.patch("services.daily_manager.XP_HISTORY_DIR", str(tmp_path / "xp_history"))
+    mocker.patch("services.daily_manager.DAILY_DATA_DIR", str(tmp_path / "daily"))
 
 @pytest.mark.asyncio
 async def test_daily_register(mock_aiofiles, mocker):
@@ -57,3 +64,194 @@ async def test_daily_leaderboard(mock_aiofiles, mocker):
     assert lb[0]["gained"] == 1000
     assert lb[1]["ign"] == "User2"
     assert lb[1]["gained"] == 500
+
+@pytest.mark.asyncio
+async def test_force_update_all_runs_concurrently(mock_aiofiles, mocker):
+    import asyncio
+    mocker.patch("os.replace")
+    mocker.patch.object(config, "update_concurrency", 4)
+    mocker.patch.object(config, "provider_rates", {name: 1000 for name in config.api_priority})
+    dm = DailyManager()
+    for i in range(12):
+        dm.data["users"][str(i)] = {"ign": f"User{i}", "uuid": f"{i:032d}", "forced_profile": None}
+
+    state = {"active": 0, "peak": 0, "providers": []}
+
+    async def fake_xp(uuid, profile_name=None, provider=None):
+        state["providers"].append(provider)
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.01)
+        state["active"] -= 1
+        return {"catacombs": 100.0, "classes": {}}
+
+    mocker.patch("services.daily_manager.get_dungeon_xp", side_effect=fake_xp)
+
+    updated, errors, total = await dm.force_update_all(force=True)
+
+    assert (updated, errors, total) == (12, 0, 12)
+    assert 1 < state["peak"] <= 4
+    assert set(state["providers"]) <= set(config.api_priority)
+    assert dm.data["update_progress"] is None
+    assert len(dm.data["current_xp"]) == 12
+
+@pytest.mark.asyncio
+async def test_force_update_all_resumes_interrupted_run(mock_aiofiles, mocker):
+    mocker.patch("os.replace")
+    dm = DailyManager()
+    for i in range(5):
+        dm.data["users"][str(i)] = {"ign": f"User{i}", "uuid": f"{i:032d}", "forced_profile": None}
+    dm.data["last_updated"] = int(time.time())
+    dm.data["update_progress"] = {"started_at": int(time.time()) - 60, "done": ["0", "1", "2"]}
+
+    mock_xp = mocker.patch("services.daily_manager.get_dungeon_xp", return_value={"catacombs": 1.0, "classes": {}})
+    status = mocker.AsyncMock()
+
+    updated, errors, total = await dm.force_update_all(status_message=status)
+
+    assert (updated, errors, total) == (2, 0, 5)
+    assert sorted(call.args[0] for call in mock_xp.call_args_list) == [f"{3:032d}", f"{4:032d}"]
+    assert "Processing: 5/5" in status.edit.call_args.kwargs["content"]
+    assert dm.data["update_progress"] is None
+
+def test_plan_refresh_prioritizes_stale_and_active_users(mocker):
+    dm = DailyManager()
+    now = 1_000_000
+    mocker.patch.object(dm, "get_reset_timestamps", return_value=(now + 12 * 3600, now + 20 * 86400))
+    for user_id in ["new", "active", "fresh", "dormant", "dormant_due"]:
+        dm.data["users"][user_id] = {"ign": user_id, "uuid": user_id * 2}
+
+    dm.data["current_xp"]["active"] = {"timestamp": now - 3 * 3600}
+    dm.data["activity"]["active"] = now - 3600
+    dm.data["current_xp"]["fresh"] = {"timestamp": now - 600}
+    dm.data["activity"]["fresh"] = now - 600
+    dm.data["current_xp"]["dormant"] = {"timestamp": now - 10 * 3600}
+    dm.data["activity"]["dormant"] = now - 60 * 86400
+    dm.data["current_xp"]["dormant_due"] = {"timestamp": now - 80 * 3600}
+    dm.data["activity"]["dormant_due"] = now - 60 * 86400
+
+    plan = [user_id for user_id, _ in dm.plan_refresh(now, limit=10)]
+    assert plan == ["new", "dormant_due", "active"]
+    assert [user_id for user_id, _ in dm.plan_refresh(now, limit=2)] == ["new", "dormant_due"]
+
+def test_plan_refresh_pulls_active_users_before_reset(mocker):
+    dm = DailyManager()
+    now = 1_000_000
+    mocker.patch.object(dm, "get_reset_timestamps", return_value=(now + 1800, now + 20 * 86400))
+    dm.data["users"]["active"] = {"ign": "active", "uuid": "a" * 32}
+    dm.data["current_xp"]["active"] = {"timestamp": now - 3 * 3600 + 1}
+    dm.data["activity"]["active"] = now - 3600
+    dm.data["users"]["idle"] = {"ign": "idle", "uuid": "b" * 32}
+    dm.data["current_xp"]["idle"] = {"timestamp": now - 3 * 3600}
+    dm.data["activity"]["idle"] = now - 10 * 86400
+
+    assert [user_id for user_id, _ in dm.plan_refresh(now, limit=10)] == ["active"]
+
+    dm.data["current_xp"]["active"]["timestamp"] = now - 600
+    assert dm.plan_refresh(now, limit=10) == []
+
+@pytest.mark.asyncio
+async def test_update_user_data_tracks_activity(mock_aiofiles, mocker):
+    dm = DailyManager()
+    mocker.patch("services.daily_manager.time.time", return_value=1000)
+    await dm.update_user_data("1", {"catacombs": 10.0, "classes": {}}, save=False)
+    assert dm.data["activity"]["1"] == 1000
+
+    mocker.patch("services.daily_manager.time.time", return_value=2000)
+    await dm.update_user_data("1", {"catacombs": 10.0, "classes": {}}, save=False)
+    assert dm.data["activity"]["1"] == 1000
+
+    mocker.patch("services.daily_manager.time.time", return_value=3000)
+    await dm.update_user_data("1", {"catacombs": 12.0, "classes": {}}, save=False)
+    assert dm.data["activity"]["1"] == 3000
+
+@pytest.mark.asyncio
+async def test_refresh_incremental_updates_only_due_slice(mock_aiofiles, mocker):
+    mocker.patch("os.replace")
+    dm = DailyManager()
+    mocker.patch.object(dm, "plan_refresh", return_value=[("1", "a" * 32)])
+    mock_xp = mocker.patch("services.daily_manager.get_dungeon_xp", return_value={"catacombs": 5.0, "classes": {}})
+
+    assert await dm.refresh_incremental(slice_size=5) == (1, 0, 1)
+    mock_xp.assert_called_once_with("a" * 32, profile_name=None, provider=mocker.ANY)
+    assert mock_xp.call_args.kwargs["provider"] in config.api_priority
+    assert dm.plan_refresh.call_args.args[1] == 5
+
+@pytest.mark.asyncio
+async def test_leaderboard_index_follows_updates_and_resets(mock_aiofiles, mocker):
+    mocker.patch("os.path.exists", return_value=False)
+    dm = DailyManager()
+    for user_id, xp in [("1", 2000), ("2", 1500)]:
+        dm.data["users"][user_id] = {"ign": f"User{user_id}", "uuid": f"u{user_id}"}
+        dm.data["daily_snapshots"][user_id] = {"cata_xp": 1000, "classes": {}, "runs": {"normal": {"7": 1}, "master": {}}}
+        dm.data["current_xp"][user_id] = {"cata_xp": xp, "classes": {}, "runs": {"normal": {"7": 1}, "master": {}}}
+
+    assert [e["ign"] for e in dm.get_leaderboard("daily")] == ["User1", "User2"]
+    assert dm.get_leaderboard_size("daily", "runs_normal_7") == 2
+
+    await dm.update_user_data("2", {"catacombs": 5000, "classes": {}, "runs": {"normal": {"7": 4}, "master": {}}}, save=False)
+
+    assert dm.find_leaderboard_rank("daily", "xp", "user2") == 0
+    assert dm.get_leaderboard_page("daily", "runs_normal_7", 0, 1) == [{"ign": "User2", "gained": 3, "user_id": "2"}]
+    assert dm.get_leaderboard_page("daily", "runs", 0, 5)[0]["gained"] == 3
+
+    dm.data["last_daily_reset"] = 0
+    await dm.check_resets()
+    assert [e["gained"] for e in dm.get_leaderboard("daily")] == [0, 0]
+
+
+@pytest.mark.asyncio
+async def test_daily_update_records_xp_history(mock_aiofiles, mocker):
+    mocker.patch("os.path.exists", return_value=False)
+    dm = DailyManager()
+    dm.data["users"]["123"] = {"ign": "TestUser", "uuid": "u1"}
+
+    mocker.patch("time.time", return_value=1_700_000_000)
+    await dm.update_user_data("123", {"catacombs": 1000, "classes": {"mage": 500}}, save=False)
+    mocker.patch("time.time", return_value=1_700_003_600)
+    await dm.update_user_data("123", {"catacombs": 1500.5, "classes": {"mage": 650}}, save=False)
+
+    stats = await dm.get_window_stats("123", 1_699_999_000)
+    assert stats["cata_xp"] == 500.5
+    assert stats["classes"]["mage"] == 150
+
+
+@pytest.mark.asyncio
+async def test_load_data_migrates_legacy_file_to_shards(tmp_path, mocker):
+    legacy = tmp_path / "daily_data.json"
+    legacy.write_bytes(json_utils.dumps({
+        "users": {"1": {"ign": "User1", "uuid": "a" * 32, "forced_profile": None}},
+        "current_xp": {"1": {"timestamp": 1, "cata_xp": 100, "classes": {}}},
+        "last_daily_reset": 42,
+    }))
+    mocker.patch("services.daily_manager.DAILY_DATA_FILE", str(legacy))
+
+    dm = DailyManager()
+    await dm.load_data()
+    assert (tmp_path / "daily" / "meta.json").exists()
+    assert not legacy.exists()
+    assert (tmp_path / "daily_data.json.migrated").exists()
+
+    reloaded = DailyManager()
+    await reloaded.load_data()
+    assert reloaded.data["users"]["1"]["ign"] == "User1"
+    assert reloaded.data["current_xp"]["1"]["cata_xp"] == 100
+    assert reloaded.data["last_daily_reset"] == 42
+
+@pytest.mark.asyncio
+async def test_register_user_coalesces_writes(tmp_path, mocker):
+    mocker.patch("services.daily_manager.DAILY_DATA_FILE", str(tmp_path / "missing.json"))
+    dm = DailyManager()
+    await dm.load_data()
+    writes = dm.store.shard_writes
+
+    for i in range(20):
+        await dm.register_user(str(i), f"User{i}", f"{i:032d}")
+    assert dm.store.shard_writes == writes
+
+    await dm.close()
+    assert writes < dm.store.shard_writes <= writes + 20
+
+    reloaded = DailyManager()
+    await reloaded.load_data()
+    assert len(reloaded.get_tracked_users()) == 20
@@ -0,0 +1,90 @@
+import pytest
+from aiohttp.test_utils import TestClient, TestServer, make_mocked_request
+from core.config import config
+from services import rate_limiter as rate_limiter_module
+from services import json_utils
+from services.http_cache import etag_matches, hashed_json, make_etag
+from services.solo_manager import SoloManager
+
+
+def test_etag_matching_handles_lists_and_weak_tags():
+    etag = make_etag("names", 3)
+    assert etag.startswith('W/"')
+    assert etag == make_etag("names", 3)
+    assert etag != make_etag("names", 4)
+
+    opaque = etag[2:]
+    assert etag_matches(make_mocked_request("GET", "/", headers={"If-None-Match": f'"x", {opaque}'}), etag)
+    assert etag_matches(make_mocked_request("GET", "/", headers={"If-None-Match": "*"}), etag)
+    assert not etag_matches(make_mocked_request("GET", "/", headers={"If-None-Match": '"x"'}), etag)
+    assert not etag_matches(make_mocked_request("GET", "/"), etag)
+
+
+def test_version_etags_change_across_restarts(monkeypatch):
+    from services import http_cache
+    from services.party_manager import PartyManager
+
+    before = PartyManager()
+    before.add_party("A", "uuid-a", "F7", "", {})
+    old_etag = make_etag("party_list", before.version, "")
+
+    monkeypatch.setattr(http_cache, "BOOT_ID", "restarted")
+    after = PartyManager()
+    after.add_party("B", "uuid-b", "F7", "", {})
+    assert after.version == before.version
+    new_etag = make_etag("party_list", after.version, "")
+
+    assert new_etag != old_etag
+    assert not etag_matches(make_mocked_request("GET", "/", headers={"If-None-Match": old_etag}), new_etag)
+
+
+def test_hashed_json_returns_304_for_same_body():
+    first = hashed_json(make_mocked_request("GET", "/"), {"a": 1}, 30, scope="private")
+    assert first.status == 200
+    assert first.headers["Cache-Control"] == "private, max-age=30"
+    assert first.body == json_utils.dumps({"a": 1})
+
+    etag = first.headers["ETag"]
+    second = hashed_json(make_mocked_request("GET", "/", headers={"If-None-Match": etag}), {"a": 1}, 30)
+    assert second.status == 304
+    assert second.body is None
+    changed = hashed_json(make_mocked_request("GET", "/", headers={"If-None-Match": etag}), {"a": 2}, 30)
+    assert changed.status == 200
+
+
+class _Bot:
+    def __init__(self):
+        self.solo_manager = SoloManager()
+
+
+@pytest.mark.asyncio
+async def test_solo_leaderboard_revalidates_against_manager_version(monkeypatch):
+    from modules.api import API
+
+    monkeypatch.setattr(rate_limiter_module.request_log, "add", lambda *args, **kwargs: None)
+    monkeypatch.setattr(config, "rate_limits", {})
+    bot = _Bot()
+    saves = []
+
+    async def fake_save():
+        bot.solo_manager.version += 1
+        saves.append(True)
+
+    monkeypatch.setattr(bot.solo_manager, "_save_data", fake_save)
+    cog = API(bot)
+
+    async with TestClient(TestServer(cog.app)) as client:
+        first = await client.get("/v1/solo_leaderboard?floor=F7")
+        assert first.status == 200
+        etag = first.headers["ETag"]
+        assert "max-age=" in first.headers["Cache-Control"]
+
+        again = await client.get("/v1/solo_leaderboard?floor=F7", headers={"If-None-Match": etag})
+        assert again.status == 304
+        assert await again.read() == b""
+
+        await bot.solo_manager.submit_run("F7", "Someone", "u" * 32, 300000, "", 1, auto_verify=True)
+        changed = await client.get("/v1/solo_leaderboard?floor=F7", headers={"If-None-Match": etag})
+        assert changed.status == 200
+        assert changed.headers["ETag"] != etag
+        assert (await changed.json())["runs"][0]["ign"] == "Someone"
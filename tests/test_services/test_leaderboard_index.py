@@ -0,0 +1,46 @@
+from services.leaderboard_index import LeaderboardIndex
+
+
+def _index(values):
+    index = LeaderboardIndex(lambda user_id: values.get(user_id))
+    return index
+
+
+def test_index_orders_and_pages():
+    values = {"1": 100, "2": 300, "3": 200, "4": None}
+    index = _index(values)
+    index.build([("1", "A"), ("2", "B"), ("3", "C"), ("4", "D")])
+
+    assert len(index) == 3
+    assert [e["ign"] for e in index.entries()] == ["B", "C", "A"]
+    assert index.page(1, 2) == [{"ign": "C", "gained": 200, "user_id": "3"}]
+    assert index.rank("a") == 2
+    assert index.rank("D") is None
+
+
+def test_index_updates_incrementally():
+    values = {"1": 100, "2": 300}
+    index = _index(values)
+    index.build([("1", "A"), ("2", "B")])
+
+    values["1"] = 500
+    index.update_user("1", "A")
+    assert [e["ign"] for e in index.entries()] == ["A", "B"]
+
+    index.update_user("1", "Renamed")
+    assert index.rank("A") is None
+    assert index.rank("renamed") == 0
+
+    index.remove_user("2")
+    assert len(index) == 1
+
+
+def test_index_keeps_best_user_per_ign_and_stable_ties():
+    values = {"1": 50, "2": 80, "3": 80}
+    index = _index(values)
+    index.build([("1", "Same"), ("2", "Same"), ("3", "Other")])
+
+    assert index.entries() == [
+        {"ign": "Same", "gained": 80, "user_id": "2"},
+        {"ign": "Other", "gained": 80, "user_id": "3"},
+    ]
@@ -0,0 +1,133 @@
+import json
+import pytest
+from services import api
+from services.profile_projection import DungeonSnapshot, project_profile_data, snapshot_for
+
+UUID = "a" * 32
+COOP_UUID = "b" * 32
+
+
+def _hypixel_profiles():
+    member = {
+        "dungeons": {
+            "secrets": 321,
+            "dungeon_types": {
+                "catacombs": {
+                    "experience": 5000.5,
+                    "tier_completions": {"0": 2, "1": 10, "7": 4, "total": 16},
+                    "fastest_time_s_plus": {"7": 250000},
+                    "best_score": {"7": 317},
+                },
+                "master_catacombs": {
+                    "tier_completions": {"7": 3, "total": 3},
+                },
+            },
+            "player_classes": {
+                "archer": {"experience": 100},
+                "mage": {"experience": 900},
+            },
+            "treasures": {"runs": [{"run_id": "r1"}]},
+        },
+        "player_stats": {"kills": {"watcher_summon_undead": 42}, "deaths": {"void": 9}},
+        "accessory_bag_storage": {"highest_magical_power": 777},
+        "inventory": {"inv_contents": {"data": "x" * 5000}},
+        "collection": {"WHEAT": 100000},
+    }
+    return {
+        "success": True,
+        "_source": "hypixel",
+        "profiles": [
+            {
+                "profile_id": "p1",
+                "cute_name": "Apple",
+                "selected": True,
+                "banking": {"balance": 12.5, "transactions": [{"amount": 1}] * 50},
+                "members": {UUID: member, COOP_UUID: {"inventory": {"data": "y" * 5000}}},
+            },
+            {
+                "profile_id": "p2",
+                "cute_name": "Banana",
+                "selected": False,
+                "members": {COOP_UUID: {}},
+            },
+        ],
+    }
+
+
+def test_projection_drops_coop_members_and_bulky_fields():
+    raw = _hypixel_profiles()
+    projected = project_profile_data(raw, UUID)
+
+    apple = projected["profiles"][0]
+    assert list(apple["members"]) == [UUID]
+    member = apple["members"][UUID]
+    assert "inventory" not in member
+    assert "collection" not in member
+    assert "treasures" not in member["dungeons"]
+    assert member["player_stats"] == {"kills": {"watcher_summon_undead": 42}}
+    assert apple["banking"] == {"balance": 12.5}
+    assert projected["profiles"][1]["members"] == {}
+    assert "dungeon_snapshot" not in projected["profiles"][1]
+    assert len(json.dumps(projected)) * 5 < len(json.dumps(raw))
+
+
+def test_snapshot_round_trips_through_json():
+    member = _hypixel_profiles()["profiles"][0]["members"][UUID]
+    snapshot = DungeonSnapshot.from_member(member)
+    restored = DungeonSnapshot.from_dict(json.loads(json.dumps(snapshot.to_dict())))
+
+    assert restored == snapshot
+    assert restored.floors["Entrance"]["runs"] == 2
+    assert restored.floors["F7"]["best_score"] == 317
+    assert "Ftotal" not in restored.floors
+    assert restored.recent_runs == [{"run_id": "r1"}]
+
+
+@pytest.mark.asyncio
+async def test_accessors_match_between_raw_and_projected(mocker):
+    mocker.patch("services.api.get_soopy_player_data", return_value=None)
+    raw = _hypixel_profiles()
+    projected = json.loads(json.dumps(project_profile_data(_hypixel_profiles(), UUID)))
+
+    results = []
+    for profile_data in (raw, projected):
+        mocker.patch("services.api.get_profile_data", return_value=profile_data)
+        results.append((
+            await api.get_dungeon_xp(UUID),
+            await api.get_dungeon_runs(UUID),
+            await api.get_dungeon_stats(UUID),
+            await api.get_recent_runs(UUID),
+        ))
+
+    assert results[0] == results[1]
+    xp, runs, stats, recent = results[1]
+    assert xp["catacombs"] == 5000.5
+    assert xp["classes"]["mage"] == 900.0
+    assert runs["Floor 7 (Necron)"] == {"normal": 4, "master": 3}
+    assert stats["secrets"] == 321
+    assert stats["blood_mob_kills"] == 42
+    assert stats["magical_power"] == 777
+    assert recent == [{"run_id": "r1"}]
+
+
+@pytest.mark.asyncio
+async def test_accessors_return_empty_for_missing_member(mocker):
+    projected = project_profile_data(_hypixel_profiles(), UUID)
+    mocker.patch("services.api.get_profile_data", return_value=projected)
+
+    assert await api.get_dungeon_xp(UUID, profile_name="Banana") is None
+    assert await api.get_dungeon_runs(UUID, profile_name="Banana") == {}
+    assert await api.get_recent_runs(UUID, profile_name="Banana") == []
+
+
+def test_snapshot_is_decoded_once_per_cached_profile(mocker):
+    profile = project_profile_data(_hypixel_profiles(), UUID)["profiles"][0]
+    from_dict = mocker.spy(DungeonSnapshot, "from_dict")
+
+    first = snapshot_for(profile, UUID)
+    assert snapshot_for(profile, UUID) is first
+    assert from_dict.call_count == 1
+
+    copy = json.loads(json.dumps(profile))
+    assert snapshot_for(copy, UUID) == first
+    assert from_dict.call_count == 2
@@ -0,0 +1,152 @@
+import pytest
+from core.config import config
+from services import rate_limiter as rate_limiter_module
+from services.rate_limiter import EndpointRateLimiter, MemoryRateLimitBackend, RateLimiter, acquire
+
+
+@pytest.fixture(autouse=True)
+def fresh_backend(monkeypatch):
+    backend = MemoryRateLimitBackend()
+    monkeypatch.setattr(rate_limiter_module, "_backend", backend)
+    monkeypatch.setattr(config, "rate_limits", {})
+    return backend
+
+
+@pytest.mark.asyncio
+async def test_gcra_allows_burst_then_spaces_requests(fresh_backend):
+    now = 1000.0
+    for _ in range(5):
+        assert await fresh_backend.acquire("k", 12.0, 60.0, now) == 0
+    assert await fresh_backend.acquire("k", 12.0, 60.0, now) == pytest.approx(12.0)
+    assert await fresh_backend.acquire("k", 12.0, 60.0, now + 12.0) == 0
+    assert await fresh_backend.acquire("k", 12.0, 60.0, now + 12.0) > 0
+
+
+@pytest.mark.asyncio
+async def test_rejections_do_not_grow_state(fresh_backend):
+    now = 1000.0
+    assert await fresh_backend.acquire("k", 60.0, 60.0, now) == 0
+    for _ in range(1000):
+        assert await fresh_backend.acquire("k", 60.0, 60.0, now) == pytest.approx(60.0)
+    assert fresh_backend.stats()["keys"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sweep_drops_idle_keys(fresh_backend):
+    for i in range(100):
+        await fresh_backend.acquire(f"ip{i}", 1.0, 10.0, 1000.0)
+    assert await fresh_backend.sweep(1000.5) == 0
+    assert await fresh_backend.sweep(1002.0) == 100
+    assert fresh_backend.stats()["keys"] == 0
+
+
+@pytest.mark.asyncio
+async def test_max_keys_bounds_memory():
+    backend = MemoryRateLimitBackend(sweep_interval=3600, max_keys=50)
+    for i in range(500):
+        await backend.acquire(f"ip{i}", 60.0, 60.0, 1000.0)
+    assert backend.stats()["keys"] <= 51
+
+
+@pytest.mark.asyncio
+async def test_endpoint_limiter_one_per_minute():
+    limiter = EndpointRateLimiter(requests_per_window=1, window_seconds=60, name="solo_test")
+    assert await limiter.check("1.2.3.4") == (True, 0)
+    allowed, retry_after = await limiter.check("1.2.3.4")
+    assert not allowed
+    assert 59 <= retry_after <= 60
+    assert (await limiter.check("5.6.7.8"))[0]
+
+
+@pytest.mark.asyncio
+async def test_route_limits_come_from_config(monkeypatch):
+    monkeypatch.setattr(config, "rate_limits", {"/v1/profile": {"requests": 2, "window": 60}})
+    limiter = RateLimiter(requests_per_minute=60)
+
+    assert await limiter.check("1.1.1.1", "/v1/profile") == 0
+    assert await limiter.check("1.1.1.1", "/v1/profile") == 0
+    assert await limiter.check("1.1.1.1", "/v1/profile") > 0
+    assert await limiter.check("1.1.1.1", "/v1/rng") == 0
+
+
+@pytest.mark.asyncio
+async def test_custom_backend_is_used():
+    class Recorder(rate_limiter_module.RateLimitBackend):
+        def __init__(self):
+            self.keys = []
+
+        async def acquire(self, key, emission, tolerance, now):
+            self.keys.append(key)
+            return 0.0
+
+    backend = Recorder()
+    rate_limiter_module.set_backend(backend)
+    assert await acquire("solo_clear_uuid", "abc", 1, 60) == 0
+    assert backend.keys == ["solo_clear_uuid:abc"]
+
+
+def test_backend_must_implement_acquire():
+    class Incomplete(rate_limiter_module.RateLimitBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+class _RecordingLog:
+    def __init__(self):
+        self.entries = []
+
+    def add(self, ip, method, path, query, status, body_preview="", details=None):
+        self.entries.append({"path": path, "status": status, "body": body_preview, "details": details})
+
+
+async def _request_entries(monkeypatch, requests, mode="tiered", sampling=None):
+    from aiohttp import web
+    from aiohttp.test_utils import TestClient, TestServer
+
+    log = _RecordingLog()
+    monkeypatch.setattr(rate_limiter_module, "request_log", log)
+    monkeypatch.setattr(config, "request_log_mode", mode)
+    monkeypatch.setattr(config, "request_log_sampling", sampling or {})
+
+    async def ok(request):
+        await request.json()
+        return web.json_response({"ok": True})
+
+    async def bad(request):
+        await request.json()
+        return web.json_response({"error": "bad"}, status=400)
+
+    app = web.Application(middlewares=[RateLimiter(requests_per_minute=100).middleware])
+    app.router.add_post("/ok", ok)
+    app.router.add_post("/bad", bad)
+    async with TestClient(TestServer(app)) as client:
+        for path in requests:
+            await client.post(path, json={"player": "Someone"})
+    return log.entries
+
+
+@pytest.mark.asyncio
+async def test_successful_requests_only_capture_metadata(monkeypatch):
+    entries = await _request_entries(monkeypatch, ["/ok", "/bad"])
+
+    assert entries[0]["details"]["capture"] == "metadata"
+    assert "headers" not in entries[0]["details"]
+    assert entries[0]["body"] == ""
+
+    assert entries[1]["status"] == 400
+    assert entries[1]["details"]["capture"] == "full"
+    assert "headers" in entries[1]["details"]
+    assert "Someone" in entries[1]["body"]
+
+
+@pytest.mark.asyncio
+async def test_sampled_and_full_modes_capture_everything(monkeypatch):
+    sampled = await _request_entries(monkeypatch, ["/ok"], sampling={"/ok": 1.0})
+    assert sampled[0]["details"]["capture"] == "full"
+    assert "Someone" in sampled[0]["body"]
+
+    full = await _request_entries(monkeypatch, ["/ok"], mode="full")
+    assert full[0]["details"]["capture"] == "full"
+    assert "Someone" in full[0]["body"]
@@ -0,0 +1,100 @@
+import asyncio
+import pytest
+from services import json_utils as json
+from services.request_log import RequestLog
+
+
+def read_lines(path):
+    with open(path, "rb") as f:
+        return [json.loads(line) for line in f.read().splitlines()]
+
+
+@pytest.mark.asyncio
+async def test_add_is_buffered_until_flush(tmp_path):
+    path = tmp_path / "request_log.ndjson"
+    log = RequestLog(path=str(path), flush_interval=60)
+    for i in range(5):
+        log.add(f"1.2.3.{i}", "GET", "/api/test", "a=1", 200)
+
+    assert not path.exists()
+    assert log.pending() == 5
+
+    await log.close()
+    lines = read_lines(path)
+    assert [entry["ip"] for entry in lines] == [f"1.2.3.{i}" for i in range(5)]
+    assert log.writes == 1
+    assert log.pending() == 0
+    assert len({entry["id"] for entry in lines}) == 5
+
+
+@pytest.mark.asyncio
+async def test_timer_flushes_in_background(tmp_path):
+    path = tmp_path / "request_log.ndjson"
+    log = RequestLog(path=str(path), flush_interval=0.01)
+    log.add("1.1.1.1", "GET", "/", "", 429)
+    log.add("1.1.1.1", "GET", "/", "", 429)
+    await asyncio.sleep(0.05)
+
+    assert len(read_lines(path)) == 2
+    assert log.writes == 1
+
+
+@pytest.mark.asyncio
+async def test_reload_keeps_ring_buffer_tail(tmp_path):
+    path = tmp_path / "request_log.ndjson"
+    log = RequestLog(max_entries=10, path=str(path), flush_interval=60)
+    for i in range(25):
+        log.add("9.9.9.9", "POST", f"/p/{i}", "", 200)
+    await log.close()
+
+    reloaded = RequestLog(max_entries=10, path=str(path), flush_interval=60)
+    recent = reloaded.get_recent()
+    assert len(recent) == 10
+    assert recent[0]["path"] == "/p/24"
+    assert recent[-1]["path"] == "/p/15"
+
+
+@pytest.mark.asyncio
+async def test_rotates_by_size(tmp_path):
+    path = tmp_path / "request_log.ndjson"
+    log = RequestLog(path=str(path), flush_interval=60, max_bytes=600, backup_count=2)
+    for _ in range(6):
+        for _ in range(3):
+            log.add("5.5.5.5", "GET", "/rotate", "", 200)
+        await log.flush()
+
+    assert path.exists()
+    assert (tmp_path / "request_log.ndjson.1").exists()
+    assert (tmp_path / "request_log.ndjson.2").exists()
+    assert not (tmp_path / "request_log.ndjson.3").exists()
+    assert path.stat().st_size <= 600
+
+
+@pytest.mark.asyncio
+async def test_clear_removes_active_and_rotated_files(tmp_path):
+    path = tmp_path / "request_log.ndjson"
+    log = RequestLog(path=str(path), flush_interval=60, max_bytes=300, backup_count=2)
+    for i in range(6):
+        log.add("1.1.1.1", "GET", f"/{i}", "", 200)
+        await log.flush()
+    assert (tmp_path / "request_log.ndjson.1").exists()
+
+    log.add("1.1.1.1", "GET", "/", "", 200)
+    log.clear()
+    await log.flush()
+
+    assert log.get_recent() == []
+    assert list(tmp_path.iterdir()) == []
+    assert RequestLog(path=str(path), flush_interval=60).get_recent() == []
+
+
+@pytest.mark.asyncio
+async def test_unserializable_details_are_stringified(tmp_path):
+    path = tmp_path / "request_log.ndjson"
+    log = RequestLog(path=str(path), flush_interval=60)
+    log.add("1.2.3.4", "GET", "/api/test", "", 500, details={"error": ValueError("boom")})
+    await log.close()
+
+    lines = read_lines(path)
+    assert len(lines) == 1
+    assert lines[0]["details"]["error"] == "boom"
@@ -0,0 +1,75 @@
+import asyncio
+import pytest
+from services.sharded_store import ShardedStore, shard_of
+
+USER_KEYS = ("users", "current_xp")
+META_KEYS = ("last_updated",)
+
+
+def make_data():
+    return {"users": {}, "current_xp": {}, "last_updated": 0}
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_only_dirty_shards(tmp_path):
+    data = make_data()
+    store = ShardedStore(str(tmp_path), data, USER_KEYS, META_KEYS, shard_count=8)
+    for i in range(16):
+        data["users"][str(i)] = {"ign": f"User{i}"}
+    store.mark_all()
+    await store.flush()
+    assert store.shard_writes == 8
+
+    data["current_xp"]["3"] = {"cata_xp": 10}
+    store.mark_user("3")
+    await store.flush()
+    assert store.shard_writes == 9
+    assert store.pending() == 0
+
+    loaded = make_data()
+    assert await ShardedStore(str(tmp_path), loaded, USER_KEYS, META_KEYS, shard_count=8).load()
+    assert len(loaded["users"]) == 16
+    assert loaded["current_xp"] == {"3": {"cata_xp": 10}}
+
+
+@pytest.mark.asyncio
+async def test_marks_are_coalesced_by_timer(tmp_path):
+    data = make_data()
+    store = ShardedStore(str(tmp_path), data, USER_KEYS, META_KEYS, shard_count=4, flush_delay=0.01)
+    for i in range(10):
+        data["users"][str(i)] = {"ign": f"User{i}"}
+        store.mark_user(str(i))
+    data["last_updated"] = 123
+    store.mark_meta()
+
+    assert store.shard_writes == 0
+    await asyncio.sleep(0.05)
+    assert store.shard_writes == len({shard_of(str(i), 4) for i in range(10)})
+
+    loaded = make_data()
+    await ShardedStore(str(tmp_path), loaded, USER_KEYS, META_KEYS, shard_count=4).load()
+    assert loaded["last_updated"] == 123
+    assert len(loaded["users"]) == 10
+
+
+@pytest.mark.asyncio
+async def test_removed_user_is_dropped_from_shard(tmp_path):
+    data = make_data()
+    store = ShardedStore(str(tmp_path), data, USER_KEYS, META_KEYS, shard_count=2)
+    data["users"]["1"] = {"ign": "User1"}
+    store.mark_user("1")
+    await store.flush()
+
+    del data["users"]["1"]
+    store.mark_user("1")
+    await store.flush()
+
+    loaded = make_data()
+    await ShardedStore(str(tmp_path), loaded, USER_KEYS, META_KEYS, shard_count=2).load()
+    assert loaded["users"] == {}
+
+
+@pytest.mark.asyncio
+async def test_load_without_meta_returns_false(tmp_path):
+    store = ShardedStore(str(tmp_path / "missing"), make_data(), USER_KEYS, META_KEYS)
+    assert not await store.load()
@@ -1,4 +1,5 @@
 import pytest
+from services import simulation_logic
 from services.simulation_logic import simulate_to_level_all50
 from services.xp_calculations import get_total_xp_for_level
 from core.game_data import DUNGEON_XP
@@ -39,3 +40,71 @@ def test_simulate_stops_at_max_runs():
     runs_total, results = simulate_to_level_all50(classes, 1.0, {"global": 1.0}, max_runs=max_runs)
     
     assert runs_total == max_runs
+
+def _reference_runs_done(classes, floor_xp, max_runs, target_level=50, boosts=None):
+    boosts = boosts or {}
+    base = {c: floor_xp * (1.0 + 0.04 + boosts.get(c, 0.0) + 0.06 + 0.2) for c in classes}
+    target_xp = get_total_xp_for_level(target_level)
+    left = {c: max(target_xp - float(xp), 0) for c, xp in classes.items()}
+    runs_done = {c: 0 for c in classes}
+    runs = 0
+    while runs < max_runs and any(v > 0 for v in left.values()):
+        runs += 1
+        chosen = max(left, key=lambda c: left[c])
+        for c in left:
+            left[c] -= base[c] if c == chosen else base[c] * 0.25
+        runs_done[chosen] += 1
+    return runs, runs_done
+
+@pytest.mark.parametrize("numpy_enabled", [True, False])
+@pytest.mark.parametrize("classes, floor_xp, boosts, max_runs", [
+    ({c: 0 for c in ["archer", "berserk", "healer", "mage", "tank"]}, 300000, {}, 200000),
+    ({"archer": 4.3e6, "berserk": 0, "healer": 1.6e6, "mage": 1.2e8, "tank": 3.9e7}, 300000,
+     {"mage": 0.1, "tank": 0.02}, 200000),
+    ({"archer": 5e7, "berserk": 5e7, "healer": 0, "mage": 2e8, "tank": 1e6}, 28000, {"healer": 0.02}, 1500),
+])
+def test_simulate_matches_per_run_loop(mocker, numpy_enabled, classes, floor_xp, boosts, max_runs):
+    mocker.patch("services.simulation_logic.NUMPY_AVAILABLE", numpy_enabled and simulation_logic.NUMPY_AVAILABLE)
+
+    runs_total, results = simulate_to_level_all50(
+        classes, floor_xp, {"class_boosts": boosts}, target_level=50, max_runs=max_runs
+    )
+
+    expected_runs, expected_done = _reference_runs_done(classes, floor_xp, max_runs, boosts=boosts)
+    assert runs_total == expected_runs
+    assert {c: r["runs_done"] for c, r in results.items()} == expected_done
+
+@pytest.mark.parametrize("numpy_enabled", [True, False])
+def test_simulate_empty_classes(mocker, numpy_enabled):
+    mocker.patch("services.simulation_logic.NUMPY_AVAILABLE", numpy_enabled and simulation_logic.NUMPY_AVAILABLE)
+    assert simulate_to_level_all50({}, 300000, {}) == (0, {})
+
+@pytest.mark.asyncio
+async def test_simulate_async_memoizes_by_quantized_key(mocker):
+    simulation_logic.clear_simulation_memo()
+    spy = mocker.spy(simulation_logic, "simulate_to_level_all50")
+    classes = {"archer": 1000.2, "mage": 5000}
+    bonuses = {"global": 1.0, "class_boosts": {"mage": 0.02}}
+
+    first = await simulation_logic.simulate_async(classes, 300000, bonuses)
+    first[1]["mage"]["runs_done"] = -1
+    second = await simulation_logic.simulate_async({"archer": 1000.4, "mage": 5000.0}, 300000.0, dict(bonuses))
+    await simulation_logic.simulate_async(classes, 300000, {"global": 1.0, "class_boosts": {"mage": 0.1}})
+
+    assert spy.call_count == 2
+    assert second[1]["mage"]["runs_done"] >= 0
+    stats = simulation_logic.get_simulation_memo_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 2)
+
+@pytest.mark.asyncio
+async def test_simulate_async_memo_is_bounded(mocker):
+    simulation_logic.clear_simulation_memo()
+    mocker.patch.object(simulation_logic, "SIM_MEMO_SIZE", 2)
+
+    for xp in (0, 1000, 2000):
+        await simulation_logic.simulate_async({"mage": xp}, 300000, {})
+    await simulation_logic.simulate_async({"mage": 0}, 300000, {})
+
+    stats = simulation_logic.get_simulation_memo_stats()
+    assert stats["entries"] == 2
+    assert stats["misses"] == 4
@@ -0,0 +1,33 @@
+import pytest
+from services.update_scheduler import TokenBucket, ProviderBudget
+
+
+def test_token_bucket_refills_at_rate():
+    bucket = TokenBucket(rate=2.0, capacity=2)
+    now = bucket.updated
+    assert bucket.try_acquire(now)
+    assert bucket.try_acquire(now)
+    assert not bucket.try_acquire(now)
+    assert bucket.wait_time(now) == pytest.approx(0.5)
+    assert bucket.try_acquire(now + 0.5)
+    assert not bucket.try_acquire(now + 0.5)
+
+
+@pytest.mark.asyncio
+async def test_provider_budget_spills_over_in_priority_order():
+    budget = ProviderBudget(["soterm", "soopy"], {"soterm": 0.5, "soopy": 0.5})
+    picked = [await budget.acquire() for _ in range(2)]
+    assert picked == ["soterm", "soopy"]
+    assert budget.spent == {"soterm": 1, "soopy": 1}
+
+
+@pytest.mark.asyncio
+async def test_provider_budget_skips_open_circuits():
+    budget = ProviderBudget(["soterm", "soopy"], {"soterm": 100.0, "soopy": 100.0}, is_open=lambda name: name == "soterm")
+    assert await budget.acquire() == "soopy"
+    assert budget.spent["soterm"] == 0
+
+
+@pytest.mark.asyncio
+async def test_provider_budget_without_providers_does_not_block():
+    assert await ProviderBudget([]).acquire() is None
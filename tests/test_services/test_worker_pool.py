@@ -0,0 +1,74 @@
+import asyncio
+import pytest
+from services import worker_pool as worker_pool_module
+from services.worker_pool import WorkerPool, WorkerPoolBusy
+
+
+def _square(value):
+    return value * value
+
+
+def _fail():
+    raise ValueError("boom")
+
+
+@pytest.mark.asyncio
+async def test_thread_fallback_records_latency():
+    pool = WorkerPool()
+    await pool.start(workers=0, max_pending=4)
+
+    assert await pool.run("square", _square, 7) == 49
+    with pytest.raises(ValueError):
+        await pool.run("square", _fail)
+
+    stats = pool.stats()
+    assert stats["mode"] == "thread"
+    assert stats["tasks"]["square"]["completed"] == 1
+    assert stats["tasks"]["square"]["errors"] == 1
+    assert stats["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_backpressure_rejects_when_queue_is_full(mocker):
+    mocker.patch.object(worker_pool_module, "QUEUE_WAIT_TIMEOUT", 0.01)
+    pool = WorkerPool()
+    await pool.start(workers=0, max_pending=1)
+
+    release = asyncio.Event()
+
+    async def hold():
+        await pool._slots.acquire()
+        await release.wait()
+        pool._slots.release()
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    with pytest.raises(WorkerPoolBusy):
+        await pool.run("square", _square, 2)
+    release.set()
+    await holder
+
+    assert pool.stats()["tasks"]["square"]["rejected"] == 1
+    assert await pool.run("square", _square, 3) == 9
+
+
+@pytest.mark.asyncio
+async def test_process_pool_runs_tasks():
+    pool = WorkerPool()
+    try:
+        await pool.start(workers=1, max_pending=2)
+        assert pool.stats()["mode"] == "process"
+        assert await pool.run("square", _square, 5) == 25
+    finally:
+        await pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_warmup_reaches_every_worker():
+    pool = WorkerPool()
+    try:
+        await pool.start(workers=3, max_pending=4)
+        assert pool.stats()["warmed"] == 3
+        assert len(pool._executor._processes) == 3
+    finally:
+        await pool.shutdown()
@@ -52,3 +52,21 @@ def test_calculate_dungeon_xp_per_run_full():
     
     xp = calculate_dungeon_xp_per_run(28000.0, 0.1, 0.02, 1.0, 1.0)
     assert xp == 47041.0
+
+def test_levels_for_matches_scalar_conversion():
+    from services.xp_calculations import levels_for, CUMULATIVE_XP
+
+    xps = [0, 49, 50, 125.5, -10] + CUMULATIVE_XP + [x - 0.5 for x in CUMULATIVE_XP] + [CUMULATIVE_XP[-1] * 3]
+    assert levels_for(xps) == [get_dungeon_level(xp) for xp in xps]
+    assert levels_for(xps[:3]) == [0, 0.98, 1]
+
+def test_get_dungeon_level_overflow():
+    assert get_dungeon_level(sum(DUNGEON_XP[1:]) + DUNGEON_XP[-1] * 2.5) == len(DUNGEON_XP) - 1 + 2.5
+
+def test_get_total_xp_for_level_uses_cumulative_table():
+    from services.xp_calculations import get_total_xp_for_level
+
+    assert get_total_xp_for_level(10) == sum(DUNGEON_XP[1:11])
+    assert get_total_xp_for_level(10.5) == sum(DUNGEON_XP[1:11]) + DUNGEON_XP[11] * 0.5
+    assert get_total_xp_for_level(len(DUNGEON_XP) + 1) == sum(DUNGEON_XP[1:]) + 2 * DUNGEON_XP[-1]
+    assert get_dungeon_level(get_total_xp_for_level(37.25)) == 37.25
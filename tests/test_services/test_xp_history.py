@@ -0,0 +1,109 @@
+import asyncio
+import pytest
+from services import xp_history
+from datetime import datetime, timezone
+from services.xp_history import XpHistory
+
+OCT_1 = int(datetime(2026, 10, 1, tzinfo=timezone.utc).timestamp())
+DAY = 86400
+
+
+def sample(cata, mage=0, f7=0, m7=0):
+    return {
+        "cata_xp": cata,
+        "classes": {"mage": mage},
+        "runs": {"normal": {"7": f7}, "master": {"7": m7}},
+    }
+
+
+@pytest.mark.asyncio
+async def test_record_and_query_samples(tmp_path):
+    history = XpHistory(str(tmp_path))
+    await history.record("123", OCT_1, sample(1000.25, mage=50))
+    await history.record("123", OCT_1 + DAY, sample(1500.5, mage=75, f7=3))
+    await history.record("456", OCT_1 + DAY, sample(10))
+
+    samples = await history.samples("123", OCT_1, OCT_1 + DAY)
+    assert [s["timestamp"] for s in samples] == [OCT_1, OCT_1 + DAY]
+    assert samples[1]["cata_xp"] == 1500.5
+    assert samples[1]["classes"]["mage"] == 75
+    assert samples[1]["runs"]["normal"]["7"] == 3
+
+
+@pytest.mark.asyncio
+async def test_gained_uses_last_sample_before_window(tmp_path):
+    history = XpHistory(str(tmp_path))
+    for day in range(10):
+        await history.record("123", OCT_1 + day * DAY, sample(1000 + day * 100, m7=day))
+
+    gained = await history.gained("123", OCT_1 + 3 * DAY + 5, OCT_1 + 9 * DAY)
+    assert gained["cata_xp"] == 600
+    assert gained["runs"]["master"]["7"] == 6
+    assert gained["start"] == OCT_1 + 3 * DAY
+
+    assert await history.gained("999", OCT_1, OCT_1 + DAY) is None
+
+
+@pytest.mark.asyncio
+async def test_gained_by_bucket_weekly(tmp_path):
+    history = XpHistory(str(tmp_path))
+    for day in range(15):
+        await history.record("123", OCT_1 + day * DAY, sample(day * 10))
+
+    buckets = await history.gained_by_bucket("123", OCT_1, OCT_1 + 14 * DAY, 7 * DAY)
+    assert [b["gained"]["cata_xp"] for b in buckets] == [70, 70]
+
+
+@pytest.mark.asyncio
+async def test_flush_appends_month_files_and_reloads(tmp_path):
+    history = XpHistory(str(tmp_path))
+    await history.record("123", OCT_1 - DAY, sample(900))
+    await history.record("123", OCT_1, sample(1000, mage=20))
+    await history.flush()
+    await history.record("123", OCT_1 + DAY, sample(1200, mage=30))
+    await history.flush()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["2026-09.bin", "2026-10.bin"]
+
+    reloaded = XpHistory(str(tmp_path))
+    assert [s["cata_xp"] for s in await reloaded.samples("123", OCT_1 - DAY, OCT_1 + DAY)] == [900, 1000, 1200]
+    gained = await reloaded.gained("123", OCT_1 - DAY, OCT_1 + DAY)
+    assert gained["cata_xp"] == 300
+    assert gained["classes"]["mage"] == 30
+
+
+@pytest.mark.asyncio
+async def test_truncated_tail_is_dropped(tmp_path):
+    history = XpHistory(str(tmp_path))
+    await history.record("123", OCT_1, sample(1000))
+    await history.record("123", OCT_1 + DAY, sample(2000))
+    await history.flush()
+
+    path = tmp_path / "2026-10.bin"
+    data = path.read_bytes()
+    path.write_bytes(data[:-3])
+
+    reloaded = XpHistory(str(tmp_path))
+    assert [s["cata_xp"] for s in await reloaded.samples("123", OCT_1, OCT_1 + DAY)] == [1000]
+    await reloaded.record("123", OCT_1 + 2 * DAY, sample(3000))
+    await reloaded.flush()
+
+    again = XpHistory(str(tmp_path))
+    assert [s["cata_xp"] for s in await again.samples("123", OCT_1, OCT_1 + 2 * DAY)] == [1000, 3000]
+
+
+@pytest.mark.asyncio
+async def test_month_is_decoded_once_off_the_loop(tmp_path, mocker):
+    history = XpHistory(str(tmp_path))
+    for day in range(5):
+        await history.record("123", OCT_1 + day * DAY, sample(1000 + day))
+    await history.flush()
+
+    decode = mocker.spy(xp_history, "_decode_month")
+    to_thread = mocker.spy(xp_history.asyncio, "to_thread")
+    reloaded = XpHistory(str(tmp_path))
+    results = await asyncio.gather(*(reloaded.samples("123", OCT_1, OCT_1 + 4 * DAY) for _ in range(5)))
+
+    assert all(len(samples) == 5 for samples in results)
+    assert decode.call_count == 1
+    assert to_thread.call_count == 1